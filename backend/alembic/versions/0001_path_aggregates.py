@@ -0,0 +1,41 @@
+"""Path distance and speed aggregates
+
+Brings databases created with Base.metadata.create_all up to the path
+aggregates maintained at ingest time. Statements are idempotent so the
+revision can also run on a database created after the model changed.
+
+Revision ID: 0001
+Revises:
+Create Date: 2026-10-17
+"""
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = "0001"
+down_revision = None
+branch_labels = None
+depends_on = None
+
+PATH_AGGREGATE_COLUMNS = {
+    "point_count": "INTEGER",
+    "first_point_time": "TIMESTAMP WITHOUT TIME ZONE",
+    "last_point_time": "TIMESTAMP WITHOUT TIME ZONE",
+    "last_latitude": "DOUBLE PRECISION",
+    "last_longitude": "DOUBLE PRECISION",
+    "min_latitude": "DOUBLE PRECISION",
+    "min_longitude": "DOUBLE PRECISION",
+    "max_latitude": "DOUBLE PRECISION",
+    "max_longitude": "DOUBLE PRECISION",
+    "max_speed_mps": "DOUBLE PRECISION",
+}
+
+
+def upgrade() -> None:
+    # Left NULL on existing paths so they are recomputed once when stopped
+    for column, column_type in PATH_AGGREGATE_COLUMNS.items():
+        op.execute(f"ALTER TABLE paths ADD COLUMN IF NOT EXISTS {column} {column_type}")
+
+
+def downgrade() -> None:
+    for column in PATH_AGGREGATE_COLUMNS:
+        op.execute(f"ALTER TABLE paths DROP COLUMN IF EXISTS {column}")
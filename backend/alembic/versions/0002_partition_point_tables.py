@@ -0,0 +1,197 @@
+"""Partition path_points and location_tracking by month
+
+Each table is renamed aside, recreated as a RANGE (timestamp) partitioned
+table with (id, timestamp) as primary key, given monthly partitions that
+cover the existing rows plus PREMAKE_MONTHS ahead, refilled and the old
+table dropped. The id sequence is carried over. Tables that are already
+partitioned are left alone. The downgrade copies the rows back into plain
+tables with their original indexes.
+
+The partition naming and month arithmetic are inlined rather than imported
+from app.services.partitions so that later application changes cannot alter
+what this revision does.
+
+Revision ID: 0002
+Revises: 0001
+Create Date: 2026-10-17
+"""
+from datetime import datetime
+
+from alembic import op
+from sqlalchemy import text
+
+# revision identifiers, used by Alembic.
+revision = "0002"
+down_revision = "0001"
+branch_labels = None
+depends_on = None
+
+# Monthly partitions created ahead of the current month; the maintenance
+# job keeps PARTITION_PREMAKE_MONTHS ahead from then on
+PREMAKE_MONTHS = 3
+
+TABLES = {
+    "path_points": {
+        "columns": """
+            id BIGINT NOT NULL DEFAULT nextval('path_points_id_seq'),
+            path_id UUID NOT NULL REFERENCES paths (id) ON DELETE CASCADE,
+            location geography(POINT, 4326) NOT NULL,
+            accuracy DOUBLE PRECISION,
+            altitude DOUBLE PRECISION,
+            speed DOUBLE PRECISION,
+            heading DOUBLE PRECISION,
+            timestamp TIMESTAMP WITHOUT TIME ZONE NOT NULL,
+            PRIMARY KEY (id, timestamp)
+        """,
+        "copy_columns": "id, path_id, location, accuracy, altitude, speed, heading, timestamp",
+        "copy_select": "id, path_id, location, accuracy, altitude, speed, heading, timestamp",
+        "indexes": [
+            "CREATE INDEX ix_path_points_path_id_timestamp ON path_points (path_id, timestamp)",
+            "CREATE INDEX idx_path_points_location ON path_points USING gist (location)",
+        ],
+        "plain_columns": """
+            id BIGINT NOT NULL DEFAULT nextval('path_points_id_seq') PRIMARY KEY,
+            path_id UUID NOT NULL REFERENCES paths (id) ON DELETE CASCADE,
+            location geography(POINT, 4326) NOT NULL,
+            accuracy DOUBLE PRECISION,
+            altitude DOUBLE PRECISION,
+            speed DOUBLE PRECISION,
+            heading DOUBLE PRECISION,
+            timestamp TIMESTAMP WITHOUT TIME ZONE NOT NULL
+        """,
+        "plain_indexes": [
+            "CREATE INDEX ix_path_points_path_id ON path_points (path_id)",
+            "CREATE INDEX ix_path_points_timestamp ON path_points (timestamp)",
+            "CREATE INDEX idx_path_points_location ON path_points USING gist (location)",
+        ],
+    },
+    "location_tracking": {
+        "columns": """
+            id BIGINT NOT NULL DEFAULT nextval('location_tracking_id_seq'),
+            event_id UUID NOT NULL REFERENCES anti_theft_events (id) ON DELETE CASCADE,
+            location geography(POINT, 4326) NOT NULL,
+            accuracy DOUBLE PRECISION,
+            altitude DOUBLE PRECISION,
+            speed DOUBLE PRECISION,
+            heading DOUBLE PRECISION,
+            timestamp TIMESTAMP WITHOUT TIME ZONE NOT NULL,
+            battery_level INTEGER,
+            PRIMARY KEY (id, timestamp)
+        """,
+        "copy_columns": "id, event_id, location, accuracy, altitude, speed, heading, timestamp, battery_level",
+        # timestamp was nullable before it became the partition key
+        "copy_select": "id, event_id, location, accuracy, altitude, speed, heading, "
+                       "COALESCE(timestamp, now() AT TIME ZONE 'utc'), battery_level",
+        "indexes": [
+            "CREATE INDEX ix_location_tracking_event_id_timestamp ON location_tracking (event_id, timestamp)",
+            "CREATE INDEX idx_location_tracking_location ON location_tracking USING gist (location)",
+        ],
+        "plain_columns": """
+            id BIGINT NOT NULL DEFAULT nextval('location_tracking_id_seq') PRIMARY KEY,
+            event_id UUID NOT NULL REFERENCES anti_theft_events (id) ON DELETE CASCADE,
+            location geography(POINT, 4326) NOT NULL,
+            accuracy DOUBLE PRECISION,
+            altitude DOUBLE PRECISION,
+            speed DOUBLE PRECISION,
+            heading DOUBLE PRECISION,
+            timestamp TIMESTAMP WITHOUT TIME ZONE,
+            battery_level INTEGER
+        """,
+        "plain_indexes": [
+            "CREATE INDEX ix_location_tracking_event_id ON location_tracking (event_id)",
+            "CREATE INDEX ix_location_tracking_timestamp ON location_tracking (timestamp)",
+            "CREATE INDEX idx_location_tracking_location ON location_tracking USING gist (location)",
+        ],
+    },
+}
+
+
+def _month_start(value: datetime) -> datetime:
+    return datetime(value.year, value.month, 1)
+
+
+def _add_months(value: datetime, months: int) -> datetime:
+    index = value.year * 12 + value.month - 1 + months
+    return datetime(index // 12, index % 12 + 1, 1)
+
+
+def _relkind(bind, table: str):
+    return bind.execute(
+        text("SELECT relkind FROM pg_class WHERE relname = :table AND relnamespace = 'public'::regnamespace"),
+        {"table": table}
+    ).scalar()
+
+
+def _drop_secondary_indexes(table: str) -> None:
+    """Free the index names of a table that was renamed aside"""
+    op.execute(f"""
+        DO $$
+        DECLARE r record;
+        BEGIN
+            FOR r IN SELECT indexname FROM pg_indexes
+                     WHERE tablename = '{table}' AND indexname <> '{table}_pkey'
+            LOOP
+                EXECUTE format('DROP INDEX %I', r.indexname);
+            END LOOP;
+        END $$
+    """)
+
+
+def upgrade() -> None:
+    bind = op.get_bind()
+
+    for table, spec in TABLES.items():
+        if _relkind(bind, table) != "r":
+            continue
+
+        legacy = f"{table}_legacy"
+        op.execute(f"ALTER TABLE {table} RENAME TO {legacy}")
+        op.execute(f"ALTER TABLE {legacy} RENAME CONSTRAINT {table}_pkey TO {legacy}_pkey")
+        op.execute(f"ALTER TABLE {legacy} ALTER COLUMN id DROP DEFAULT")
+        _drop_secondary_indexes(legacy)
+
+        op.execute(f"CREATE TABLE {table} ({spec['columns']}) PARTITION BY RANGE (timestamp)")
+        op.execute(f"ALTER SEQUENCE {table}_id_seq OWNED BY {table}.id")
+        for statement in spec["indexes"]:
+            op.execute(statement)
+
+        op.execute(f"CREATE TABLE {table}_default PARTITION OF {table} DEFAULT")
+
+        oldest = bind.execute(text(f"SELECT min(timestamp) FROM {legacy}")).scalar()
+        current = _month_start(datetime.utcnow())
+        month = _month_start(oldest) if oldest and oldest < current else current
+        last = _add_months(current, PREMAKE_MONTHS)
+
+        while month <= last:
+            op.execute(
+                f"CREATE TABLE {table}_p{month:%Y_%m} PARTITION OF {table} "
+                f"FOR VALUES FROM ('{month:%Y-%m-%d}') TO ('{_add_months(month, 1):%Y-%m-%d}')"
+            )
+            month = _add_months(month, 1)
+
+        op.execute(f"INSERT INTO {table} ({spec['copy_columns']}) SELECT {spec['copy_select']} FROM {legacy}")
+        op.execute(f"DROP TABLE {legacy}")
+
+
+def downgrade() -> None:
+    bind = op.get_bind()
+
+    for table, spec in TABLES.items():
+        if _relkind(bind, table) != "p":
+            continue
+
+        partitioned = f"{table}_partitioned"
+        op.execute(f"ALTER TABLE {table} RENAME TO {partitioned}")
+        op.execute(f"ALTER TABLE {partitioned} RENAME CONSTRAINT {table}_pkey TO {partitioned}_pkey")
+        op.execute(f"ALTER TABLE {partitioned} ALTER COLUMN id DROP DEFAULT")
+        # Keep the sequence when the partitioned table and its partitions go
+        op.execute(f"ALTER SEQUENCE {table}_id_seq OWNED BY NONE")
+        _drop_secondary_indexes(partitioned)
+
+        op.execute(f"CREATE TABLE {table} ({spec['plain_columns']})")
+        op.execute(f"ALTER SEQUENCE {table}_id_seq OWNED BY {table}.id")
+        for statement in spec["plain_indexes"]:
+            op.execute(statement)
+
+        op.execute(f"INSERT INTO {table} ({spec['copy_columns']}) SELECT {spec['copy_columns']} FROM {partitioned}")
+        op.execute(f"DROP TABLE {partitioned}")
@@ -0,0 +1,38 @@
+"""Compressed point segments for completed paths
+
+Statements are idempotent so the revision can also run on a database
+created with Base.metadata.create_all after the models changed.
+
+Revision ID: 0003
+Revises: 0002
+Create Date: 2026-10-17
+"""
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = "0003"
+down_revision = "0002"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.execute("ALTER TABLE paths ADD COLUMN IF NOT EXISTS archived_at TIMESTAMP WITHOUT TIME ZONE")
+
+    op.execute("""
+        CREATE TABLE IF NOT EXISTS path_segments (
+            path_id UUID PRIMARY KEY REFERENCES paths (id) ON DELETE CASCADE,
+            encoding VARCHAR(30) NOT NULL,
+            point_count INTEGER NOT NULL,
+            start_time TIMESTAMP WITHOUT TIME ZONE,
+            end_time TIMESTAMP WITHOUT TIME ZONE,
+            size_bytes INTEGER,
+            data BYTEA NOT NULL,
+            created_at TIMESTAMP WITHOUT TIME ZONE
+        )
+    """)
+
+
+def downgrade() -> None:
+    op.execute("DROP TABLE IF EXISTS path_segments")
+    op.execute("ALTER TABLE paths DROP COLUMN IF EXISTS archived_at")
@@ -0,0 +1,67 @@
+"""Unique (path_id, timestamp) on path_points for idempotent uploads
+
+Duplicate fixes left by retried uploads are removed first, keeping the
+oldest row of each group, and the point counts of the affected paths are
+corrected. The unique constraint replaces the plain (path_id, timestamp)
+index; it contains the partition key, so it is enforced on the partitioned
+table as a whole.
+
+Revision ID: 0004
+Revises: 0003
+Create Date: 2026-10-17
+"""
+from alembic import op
+from sqlalchemy import text
+
+# revision identifiers, used by Alembic.
+revision = "0004"
+down_revision = "0003"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    bind = op.get_bind()
+
+    exists = bind.execute(
+        text("SELECT 1 FROM pg_constraint WHERE conname = 'uq_path_points_path_id_timestamp'")
+    ).scalar()
+    if exists:
+        return
+
+    op.execute("""
+        CREATE TEMPORARY TABLE duplicate_path_points ON COMMIT DROP AS
+        SELECT id, timestamp, path_id
+        FROM (
+            SELECT id, timestamp, path_id,
+                   row_number() OVER (PARTITION BY path_id, timestamp ORDER BY id) AS n
+            FROM path_points
+        ) ranked
+        WHERE n > 1
+    """)
+    op.execute("""
+        DELETE FROM path_points p
+        USING duplicate_path_points d
+        WHERE p.id = d.id AND p.timestamp = d.timestamp
+    """)
+    op.execute("""
+        UPDATE paths
+        SET point_count = point_count - d.removed
+        FROM (
+            SELECT path_id, count(*) AS removed
+            FROM duplicate_path_points
+            GROUP BY path_id
+        ) d
+        WHERE paths.id = d.path_id AND paths.point_count IS NOT NULL
+    """)
+
+    op.execute("DROP INDEX IF EXISTS ix_path_points_path_id_timestamp")
+    op.execute(
+        "ALTER TABLE path_points "
+        "ADD CONSTRAINT uq_path_points_path_id_timestamp UNIQUE (path_id, timestamp)"
+    )
+
+
+def downgrade() -> None:
+    op.execute("ALTER TABLE path_points DROP CONSTRAINT IF EXISTS uq_path_points_path_id_timestamp")
+    op.execute("CREATE INDEX IF NOT EXISTS ix_path_points_path_id_timestamp ON path_points (path_id, timestamp)")
@@ -0,0 +1,84 @@
+"""Path route lines for vector tiles
+
+Adds paths.route with a GiST index. Stopped paths are backfilled: paths
+whose points are still in path_points get their line built in PostGIS,
+archived paths get it from their decoded segment. Backfilled routes are
+full resolution; newly stopped paths store their finest simplification.
+
+The segment decoding is inlined for the delta-msgpack-zlib/1 encoding that
+existed at this revision, so later codec changes cannot alter it.
+
+Revision ID: 0005
+Revises: 0004
+Create Date: 2026-10-17
+"""
+import zlib
+
+from alembic import op
+import msgpack
+from sqlalchemy import text
+
+# revision identifiers, used by Alembic.
+revision = "0005"
+down_revision = "0004"
+branch_labels = None
+depends_on = None
+
+SEGMENT_COORDINATE_SCALE = 10_000_000
+
+
+def _segment_route_wkt(data: bytes):
+    """LINESTRING of a delta-msgpack-zlib/1 segment, or None below two points"""
+    document = msgpack.unpackb(zlib.decompress(data))
+
+    vertices = []
+    latitude = longitude = 0
+    for d_lat, d_lon in zip(document["latitude"], document["longitude"]):
+        latitude += d_lat
+        longitude += d_lon
+        vertices.append(f"{longitude / SEGMENT_COORDINATE_SCALE} {latitude / SEGMENT_COORDINATE_SCALE}")
+
+    if len(vertices) < 2:
+        return None
+    return f"LINESTRING({', '.join(vertices)})"
+
+
+def upgrade() -> None:
+    bind = op.get_bind()
+
+    op.execute("ALTER TABLE paths ADD COLUMN IF NOT EXISTS route geography(LINESTRING, 4326)")
+    op.execute("CREATE INDEX IF NOT EXISTS idx_paths_route ON paths USING gist (route)")
+
+    op.execute("""
+        UPDATE paths p
+        SET route = line.geom::geography
+        FROM (
+            SELECT path_id, ST_MakeLine(location::geometry ORDER BY timestamp) AS geom
+            FROM path_points
+            GROUP BY path_id
+            HAVING count(*) > 1
+        ) line
+        WHERE p.id = line.path_id
+          AND p.route IS NULL
+          AND NOT p.is_active
+    """)
+
+    segments = bind.execute(text("""
+        SELECT s.path_id, s.data
+        FROM path_segments s
+        JOIN paths p ON p.id = s.path_id
+        WHERE p.route IS NULL AND s.encoding = 'delta-msgpack-zlib/1'
+    """))
+    for path_id, data in segments:
+        route = _segment_route_wkt(bytes(data))
+        if route is None:
+            continue
+        bind.execute(
+            text("UPDATE paths SET route = ST_GeogFromText(:route) WHERE id = :path_id"),
+            {"route": f"SRID=4326;{route}", "path_id": path_id}
+        )
+
+
+def downgrade() -> None:
+    op.execute("DROP INDEX IF EXISTS idx_paths_route")
+    op.execute("ALTER TABLE paths DROP COLUMN IF EXISTS route")
@@ -0,0 +1,64 @@
+"""Frequent routes and their geohash cell index
+
+Statements are idempotent so the revision can also run on a database
+created with Base.metadata.create_all after the models changed.
+
+Revision ID: 0006
+Revises: 0005
+Create Date: 2026-10-17
+"""
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = "0006"
+down_revision = "0005"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.execute("""
+        CREATE TABLE IF NOT EXISTS frequent_routes (
+            id UUID PRIMARY KEY,
+            user_id UUID NOT NULL REFERENCES users (id) ON DELETE CASCADE,
+            cells VARCHAR[] NOT NULL,
+            cell_count INTEGER NOT NULL,
+            start_latitude DOUBLE PRECISION NOT NULL,
+            start_longitude DOUBLE PRECISION NOT NULL,
+            end_latitude DOUBLE PRECISION NOT NULL,
+            end_longitude DOUBLE PRECISION NOT NULL,
+            path_count INTEGER NOT NULL,
+            duration_sum_seconds DOUBLE PRECISION NOT NULL,
+            duration_sum_squares DOUBLE PRECISION NOT NULL,
+            min_duration_seconds DOUBLE PRECISION,
+            max_duration_seconds DOUBLE PRECISION,
+            distance_sum_meters DOUBLE PRECISION NOT NULL,
+            last_traveled_at TIMESTAMP WITHOUT TIME ZONE,
+            created_at TIMESTAMP WITHOUT TIME ZONE,
+            updated_at TIMESTAMP WITHOUT TIME ZONE
+        )
+    """)
+    op.execute("CREATE INDEX IF NOT EXISTS ix_frequent_routes_user_id ON frequent_routes (user_id)")
+
+    op.execute("""
+        CREATE TABLE IF NOT EXISTS route_cells (
+            route_id UUID NOT NULL REFERENCES frequent_routes (id) ON DELETE CASCADE,
+            cell VARCHAR(12) NOT NULL,
+            user_id UUID NOT NULL,
+            PRIMARY KEY (route_id, cell)
+        )
+    """)
+    op.execute("CREATE INDEX IF NOT EXISTS ix_route_cells_user_id_cell ON route_cells (user_id, cell)")
+
+    op.execute(
+        "ALTER TABLE paths ADD COLUMN IF NOT EXISTS route_id UUID "
+        "REFERENCES frequent_routes (id) ON DELETE SET NULL"
+    )
+    op.execute("CREATE INDEX IF NOT EXISTS ix_paths_route_id ON paths (route_id)")
+
+
+def downgrade() -> None:
+    op.execute("DROP INDEX IF EXISTS ix_paths_route_id")
+    op.execute("ALTER TABLE paths DROP COLUMN IF EXISTS route_id")
+    op.execute("DROP TABLE IF EXISTS route_cells")
+    op.execute("DROP TABLE IF EXISTS frequent_routes")
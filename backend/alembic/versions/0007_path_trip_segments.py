@@ -0,0 +1,46 @@
+"""Stay points and movement legs detected during ingest
+
+Statements are idempotent so the revision can also run on a database
+created with Base.metadata.create_all after the models changed.
+
+Revision ID: 0007
+Revises: 0006
+Create Date: 2026-10-17
+"""
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = "0007"
+down_revision = "0006"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.execute("ALTER TABLE paths ADD COLUMN IF NOT EXISTS trip_state JSONB")
+
+    op.execute("""
+        CREATE TABLE IF NOT EXISTS path_trip_segments (
+            id BIGSERIAL PRIMARY KEY,
+            path_id UUID NOT NULL REFERENCES paths (id) ON DELETE CASCADE,
+            kind VARCHAR(10) NOT NULL,
+            start_time TIMESTAMP WITHOUT TIME ZONE NOT NULL,
+            end_time TIMESTAMP WITHOUT TIME ZONE NOT NULL,
+            start_latitude DOUBLE PRECISION NOT NULL,
+            start_longitude DOUBLE PRECISION NOT NULL,
+            end_latitude DOUBLE PRECISION NOT NULL,
+            end_longitude DOUBLE PRECISION NOT NULL,
+            distance_meters DOUBLE PRECISION,
+            point_count INTEGER,
+            created_at TIMESTAMP WITHOUT TIME ZONE
+        )
+    """)
+    op.execute(
+        "CREATE INDEX IF NOT EXISTS ix_path_trip_segments_path_id_start_time "
+        "ON path_trip_segments (path_id, start_time)"
+    )
+
+
+def downgrade() -> None:
+    op.execute("DROP TABLE IF EXISTS path_trip_segments")
+    op.execute("ALTER TABLE paths DROP COLUMN IF EXISTS trip_state")
@@ -0,0 +1,44 @@
+"""Safe corridors around frequent routes
+
+Statements are idempotent so the revision can also run on a database
+created with Base.metadata.create_all after the models changed.
+
+Revision ID: 0008
+Revises: 0007
+Create Date: 2026-10-17
+"""
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = "0008"
+down_revision = "0007"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.execute("""
+        CREATE TABLE IF NOT EXISTS safe_corridors (
+            id UUID PRIMARY KEY,
+            user_id UUID NOT NULL REFERENCES users (id) ON DELETE CASCADE,
+            route_id UUID REFERENCES frequent_routes (id) ON DELETE SET NULL,
+            name VARCHAR(200),
+            buffer_meters DOUBLE PRECISION NOT NULL,
+            area geometry(MULTIPOLYGON, 4326) NOT NULL,
+            is_active BOOLEAN,
+            created_at TIMESTAMP WITHOUT TIME ZONE
+        )
+    """)
+    op.execute("CREATE INDEX IF NOT EXISTS ix_safe_corridors_user_id ON safe_corridors (user_id)")
+    op.execute("CREATE INDEX IF NOT EXISTS ix_safe_corridors_route_id ON safe_corridors (route_id)")
+    op.execute("CREATE INDEX IF NOT EXISTS idx_safe_corridors_area ON safe_corridors USING gist (area)")
+
+    op.execute(
+        "ALTER TABLE paths ADD COLUMN IF NOT EXISTS safe_corridor_id UUID "
+        "REFERENCES safe_corridors (id) ON DELETE SET NULL"
+    )
+
+
+def downgrade() -> None:
+    op.execute("ALTER TABLE paths DROP COLUMN IF EXISTS safe_corridor_id")
+    op.execute("DROP TABLE IF EXISTS safe_corridors")
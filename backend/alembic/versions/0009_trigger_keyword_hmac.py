@@ -0,0 +1,26 @@
+"""Keyed HMAC of anti-theft trigger keywords
+
+Revision ID: 0009
+Revises: 0008
+Create Date: 2026-10-17
+"""
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = "0009"
+down_revision = "0008"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.execute("ALTER TABLE anti_theft_config ADD COLUMN IF NOT EXISTS trigger_keyword_hmac VARCHAR(64)")
+    # Existing keywords keep their SHA-256 until they are next used
+    op.alter_column("anti_theft_config", "trigger_keyword_hash", existing_type=sa.String(255), nullable=True)
+
+
+def downgrade() -> None:
+    op.execute("DELETE FROM anti_theft_config WHERE trigger_keyword_hash IS NULL")
+    op.alter_column("anti_theft_config", "trigger_keyword_hash", existing_type=sa.String(255), nullable=False)
+    op.execute("ALTER TABLE anti_theft_config DROP COLUMN IF EXISTS trigger_keyword_hmac")
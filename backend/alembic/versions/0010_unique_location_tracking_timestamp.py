@@ -0,0 +1,58 @@
+"""Unique (event_id, timestamp) on location_tracking for idempotent flushes
+
+The write-behind location buffer delivers at least once: a batch that was
+committed but not yet acknowledged in the Redis stream is inserted again
+after a restart. Duplicate fixes are removed first, keeping the oldest row
+of each group; the unique constraint then replaces the plain
+(event_id, timestamp) index and lets the flusher skip repeats.
+
+Revision ID: 0010
+Revises: 0009
+Create Date: 2026-10-17
+"""
+from alembic import op
+from sqlalchemy import text
+
+# revision identifiers, used by Alembic.
+revision = "0010"
+down_revision = "0009"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    bind = op.get_bind()
+
+    exists = bind.execute(
+        text("SELECT 1 FROM pg_constraint WHERE conname = 'uq_location_tracking_event_id_timestamp'")
+    ).scalar()
+    if exists:
+        return
+
+    op.execute("""
+        DELETE FROM location_tracking l
+        USING (
+            SELECT id, timestamp
+            FROM (
+                SELECT id, timestamp,
+                       row_number() OVER (PARTITION BY event_id, timestamp ORDER BY id) AS n
+                FROM location_tracking
+            ) ranked
+            WHERE n > 1
+        ) d
+        WHERE l.id = d.id AND l.timestamp = d.timestamp
+    """)
+
+    op.execute("DROP INDEX IF EXISTS ix_location_tracking_event_id_timestamp")
+    op.execute(
+        "ALTER TABLE location_tracking "
+        "ADD CONSTRAINT uq_location_tracking_event_id_timestamp UNIQUE (event_id, timestamp)"
+    )
+
+
+def downgrade() -> None:
+    op.execute("ALTER TABLE location_tracking DROP CONSTRAINT IF EXISTS uq_location_tracking_event_id_timestamp")
+    op.execute(
+        "CREATE INDEX IF NOT EXISTS ix_location_tracking_event_id_timestamp "
+        "ON location_tracking (event_id, timestamp)"
+    )
@@ -0,0 +1,32 @@
+"""Precomputed path simplification levels
+
+Revision ID: 0011
+Revises: 0010
+Create Date: 2026-10-17
+"""
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = "0011"
+down_revision = "0010"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.execute("""
+        CREATE TABLE IF NOT EXISTS path_simplifications (
+            id UUID PRIMARY KEY,
+            path_id UUID NOT NULL REFERENCES paths (id) ON DELETE CASCADE,
+            tolerance_meters DOUBLE PRECISION NOT NULL,
+            point_count INTEGER NOT NULL,
+            point_ids BIGINT[] NOT NULL,
+            created_at TIMESTAMP WITHOUT TIME ZONE,
+            CONSTRAINT uq_path_simplifications_path_tolerance UNIQUE (path_id, tolerance_meters)
+        )
+    """)
+    op.execute("CREATE INDEX IF NOT EXISTS ix_path_simplifications_path_id ON path_simplifications (path_id)")
+
+
+def downgrade() -> None:
+    op.execute("DROP TABLE IF EXISTS path_simplifications")
@@ -0,0 +1,21 @@
+"""End of the range thinned for the path point budget
+
+Revision ID: 0012
+Revises: 0011
+Create Date: 2026-10-17
+"""
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = "0012"
+down_revision = "0011"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.execute("ALTER TABLE paths ADD COLUMN IF NOT EXISTS thinned_until TIMESTAMP WITHOUT TIME ZONE")
+
+
+def downgrade() -> None:
+    op.execute("ALTER TABLE paths DROP COLUMN IF EXISTS thinned_until")
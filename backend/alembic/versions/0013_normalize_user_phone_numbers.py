@@ -0,0 +1,48 @@
+"""Store user phone numbers normalized
+
+Inbound SMS senders are normalized before they are looked up, so stored
+numbers are brought to the same form: digits only, keeping a leading +.
+A number whose normalized form is already taken is left as it is.
+
+The downgrade is a no-op: the original formatting is not kept.
+
+Revision ID: 0013
+Revises: 0012
+Create Date: 2026-10-17
+"""
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = "0013"
+down_revision = "0012"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.execute(r"""
+        WITH normalized AS (
+            SELECT id,
+                   CASE WHEN phone_number ~ '^\s*\+' THEN '+' ELSE '' END
+                       || regexp_replace(phone_number, '[^0-9]', '', 'g') AS phone,
+                   phone_number
+            FROM users
+        ),
+        ranked AS (
+            SELECT id, phone,
+                   row_number() OVER (PARTITION BY phone ORDER BY id) AS n
+            FROM normalized
+            WHERE phone <> phone_number
+              AND phone NOT IN ('', '+')
+        )
+        UPDATE users u
+        SET phone_number = r.phone
+        FROM ranked r
+        WHERE u.id = r.id
+          AND r.n = 1
+          AND NOT EXISTS (SELECT 1 FROM users o WHERE o.phone_number = r.phone)
+    """)
+
+
+def downgrade() -> None:
+    pass
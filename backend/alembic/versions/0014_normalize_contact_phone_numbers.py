@@ -0,0 +1,32 @@
+"""Store emergency contact phone numbers normalized
+
+Watchers are matched to emergency contacts by phone number, and user phone
+numbers are stored normalized since 0013, so contact numbers are brought
+to the same form: digits only, keeping a leading +.
+
+The downgrade is a no-op: the original formatting is not kept.
+
+Revision ID: 0014
+Revises: 0013
+Create Date: 2026-10-17
+"""
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = "0014"
+down_revision = "0013"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.execute(r"""
+        UPDATE emergency_contacts
+        SET phone_number = CASE WHEN phone_number ~ '^\s*\+' THEN '+' ELSE '' END
+                           || regexp_replace(phone_number, '[^0-9]', '', 'g')
+        WHERE regexp_replace(phone_number, '[^0-9]', '', 'g') <> ''
+    """)
+
+
+def downgrade() -> None:
+    pass
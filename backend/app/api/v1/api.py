@@ -3,7 +3,7 @@ API v1 router
 """
 from fastapi import APIRouter
 
-from app.api.v1.endpoints import auth, anti_theft, paths, emergency, users
+from app.api.v1.endpoints import auth, anti_theft, paths, emergency, users, tiles, webhooks
 
 api_router = APIRouter()
 
@@ -13,4 +13,6 @@ api_router.include_router(users.router, prefix="/users", tags=["users"])
 api_router.include_router(anti_theft.router, prefix="/anti-theft", tags=["anti-theft"])
 api_router.include_router(paths.router, prefix="/paths", tags=["path-tracking"])
 api_router.include_router(emergency.router, prefix="/emergency", tags=["emergency"])
+api_router.include_router(tiles.router, prefix="/tiles", tags=["tiles"])
+api_router.include_router(webhooks.router, prefix="/webhooks", tags=["webhooks"])
 
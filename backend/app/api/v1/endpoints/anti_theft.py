@@ -1,18 +1,42 @@
 """
 Anti-theft protection endpoints
 """
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, WebSocket, WebSocketDisconnect, status
 from sqlalchemy.orm import Session
+from starlette.concurrency import run_in_threadpool
 from typing import List
 from datetime import datetime
 from geoalchemy2.shape import to_shape
-from geoalchemy2.elements import WKTElement
+import asyncio
+import uuid
 
-from app.core.database import get_db
-from app.core.dependencies import get_current_user
-from app.core.security import hash_keyword, verify_keyword
+from app.core.config import settings
+from app.core.database import SessionLocal, get_db
+from app.core.dependencies import get_current_user, get_user_from_token
+from app.core.pubsub import pubsub_hub
+from app.core.security import keyword_hmac
 from app.models.user import User
 from app.models.anti_theft import AntiTheftConfig, AntiTheftEvent, LocationTracking, MediaRecording
+from app.services.anti_theft_cache import (
+    cache_status,
+    clear_event_locations,
+    fill_location_history,
+    get_cached_status,
+    get_location_history,
+    invalidate_status,
+    location_to_dict,
+    record_location
+)
+from app.services.anti_theft_live import (
+    END_MESSAGE,
+    can_watch_event,
+    event_channel,
+    publish_event_ended,
+    publish_event_location,
+    watchable_events
+)
+from app.services.location_buffer import active_event_owner, buffer_location, forget_active_event, insert_location
+from app.services.sms_trigger import invalidate_phone_index
 from app.schemas.anti_theft import (
     AntiTheftConfigCreate,
     AntiTheftConfigUpdate,
@@ -20,7 +44,8 @@ from app.schemas.anti_theft import (
     AntiTheftEventCreate,
     AntiTheftEventResponse,
     AntiTheftStatusResponse,
-    LocationPoint
+    LocationPoint,
+    MediaRecordingResponse
 )
 
 router = APIRouter()
@@ -48,11 +73,12 @@ async def setup_anti_theft(
         AntiTheftConfig.user_id == current_user.id
     ).first()
     
-    keyword_hash = hash_keyword(config_data.trigger_keyword)
+    keyword_digest = keyword_hmac(config_data.trigger_keyword)
     
     if config:
         # Update existing config
-        config.trigger_keyword_hash = keyword_hash
+        config.trigger_keyword_hmac = keyword_digest
+        config.trigger_keyword_hash = None
         config.is_enabled = config_data.is_enabled
         config.enable_gps_tracking = config_data.enable_gps_tracking
         config.enable_audio_recording = config_data.enable_audio_recording
@@ -63,7 +89,7 @@ async def setup_anti_theft(
         # Create new config
         config = AntiTheftConfig(
             user_id=current_user.id,
-            trigger_keyword_hash=keyword_hash,
+            trigger_keyword_hmac=keyword_digest,
             is_enabled=config_data.is_enabled,
             enable_gps_tracking=config_data.enable_gps_tracking,
             enable_audio_recording=config_data.enable_audio_recording,
@@ -76,6 +102,10 @@ async def setup_anti_theft(
     db.commit()
     db.refresh(config)
     
+    # SMS triggers must see the new keyword
+    invalidate_phone_index(current_user.phone_number)
+    invalidate_status(current_user.id)
+    
     return config
 
 
@@ -158,6 +188,7 @@ async def trigger_anti_theft(
     db.add(event)
     db.commit()
     db.refresh(event)
+    invalidate_status(current_user.id)
     
     # TODO: Send alerts to emergency contacts
     # TODO: Start GPS tracking
@@ -176,6 +207,9 @@ async def add_location_tracking(
     """
     Add location point to anti-theft event
     
+    The point is acknowledged once it is in the write-behind buffer; it is
+    stored by the background flusher within LOCATION_BUFFER_FLUSH_INTERVAL_SECONDS.
+    
     Args:
         event_id: Event ID
         location: Location point
@@ -189,33 +223,22 @@ async def add_location_tracking(
         HTTPException: If event not found or not active
     """
     # Verify event belongs to user and is active
-    event = db.query(AntiTheftEvent).filter(
-        AntiTheftEvent.id == event_id,
-        AntiTheftEvent.user_id == current_user.id,
-        AntiTheftEvent.status == "active"
-    ).first()
-    
-    if not event:
+    if active_event_owner(db, event_id) != str(current_user.id):
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="Active event not found"
         )
     
-    # Create location tracking point
-    point = WKTElement(f'POINT({location.longitude} {location.latitude})', srid=4326)
-    
-    tracking = LocationTracking(
-        event_id=event.id,
-        location=point,
-        accuracy=location.accuracy,
-        altitude=location.altitude,
-        speed=location.speed,
-        heading=location.heading,
-        timestamp=location.timestamp,
-        battery_level=location.battery_level
-    )
+    # Watchers read the latest fixes from the cache and get them pushed live
+    fix = location_to_dict(location)
+    record_location(event_id, fix)
+    publish_event_location(event_id, fix)
     
-    db.add(tracking)
+    if settings.LOCATION_BUFFER_ENABLED and buffer_location(event_id, location):
+        return {"message": "Location accepted"}
+    
+    # Retries of a fix that was already stored are skipped
+    insert_location(db, event_id, location)
     db.commit()
     
     return {"message": "Location added successfully"}
@@ -256,10 +279,43 @@ async def deactivate_anti_theft_event(
     event.deactivated_at = datetime.utcnow()
     
     db.commit()
+    forget_active_event(event.id)
+    clear_event_locations(event.id)
+    invalidate_status(current_user.id)
+    publish_event_ended(event.id)
     
     return {"message": "Anti-theft deactivated successfully"}
 
 
+def _load_location_history(db: Session, event_id) -> List[dict]:
+    """
+    Read the most recent stored fixes of an event and warm its location cache
+    
+    Returns:
+        Fixes, newest first
+    """
+    locations = db.query(LocationTracking).filter(
+        LocationTracking.event_id == event_id
+    ).order_by(LocationTracking.timestamp.desc()).limit(settings.ANTI_THEFT_LOCATION_HISTORY_SIZE).all()
+    
+    location_history = []
+    for loc in locations:
+        point = to_shape(loc.location)
+        location_history.append({
+            "latitude": point.y,
+            "longitude": point.x,
+            "accuracy": loc.accuracy,
+            "altitude": loc.altitude,
+            "speed": loc.speed,
+            "heading": loc.heading,
+            "timestamp": loc.timestamp.isoformat(),
+            "battery_level": loc.battery_level
+        })
+    
+    fill_location_history(event_id, location_history)
+    return location_history
+
+
 @router.get("/status", response_model=AntiTheftStatusResponse)
 async def get_anti_theft_status(
     current_user: User = Depends(get_current_user),
@@ -268,6 +324,10 @@ async def get_anti_theft_status(
     """
     Get current anti-theft status
     
+    Served from Redis: the configuration, active event and media are cached
+    per user, and the latest fixes of the active event are kept current at
+    ingest. The database is only read when a cache is cold.
+    
     Args:
         current_user: Authenticated user
         db: Database session
@@ -275,51 +335,49 @@ async def get_anti_theft_status(
     Returns:
         Anti-theft status
     """
-    # Get configuration
-    config = db.query(AntiTheftConfig).filter(
-        AntiTheftConfig.user_id == current_user.id
-    ).first()
-    
-    is_enabled = config.is_enabled if config else False
+    status_data = get_cached_status(current_user.id)
     
-    # Get active event
-    active_event = db.query(AntiTheftEvent).filter(
-        AntiTheftEvent.user_id == current_user.id,
-        AntiTheftEvent.status == "active"
-    ).first()
+    if status_data is None:
+        # Get configuration
+        config = db.query(AntiTheftConfig).filter(
+            AntiTheftConfig.user_id == current_user.id
+        ).first()
+        
+        # Get active event
+        active_event = db.query(AntiTheftEvent).filter(
+            AntiTheftEvent.user_id == current_user.id,
+            AntiTheftEvent.status == "active"
+        ).first()
+        
+        media_recordings = []
+        if active_event:
+            media_recordings = db.query(MediaRecording).filter(
+                MediaRecording.event_id == active_event.id
+            ).all()
+        
+        status_data = {
+            "is_enabled": config.is_enabled if config else False,
+            "active_event": AntiTheftEventResponse.model_validate(active_event).model_dump(mode="json") if active_event else None,
+            "media_recordings": [
+                MediaRecordingResponse.model_validate(media).model_dump(mode="json")
+                for media in media_recordings
+            ]
+        }
+        cache_status(current_user.id, status_data)
     
     location_history = []
-    media_recordings = []
+    active_event = status_data["active_event"]
     
     if active_event:
-        # Get location history
-        locations = db.query(LocationTracking).filter(
-            LocationTracking.event_id == active_event.id
-        ).order_by(LocationTracking.timestamp.desc()).limit(100).all()
+        location_history = get_location_history(active_event["id"])
         
-        for loc in locations:
-            point = to_shape(loc.location)
-            location_history.append({
-                "latitude": point.y,
-                "longitude": point.x,
-                "accuracy": loc.accuracy,
-                "altitude": loc.altitude,
-                "speed": loc.speed,
-                "heading": loc.heading,
-                "timestamp": loc.timestamp,
-                "battery_level": loc.battery_level
-            })
-        
-        # Get media recordings
-        media_recordings = db.query(MediaRecording).filter(
-            MediaRecording.event_id == active_event.id
-        ).all()
+        if location_history is None:
+            location_history = _load_location_history(db, active_event["id"])
     
     return {
-        "is_enabled": is_enabled,
-        "active_event": active_event,
-        "location_history": location_history,
-        "media_recordings": media_recordings
+        **status_data,
+        "latest_location": location_history[0] if location_history else None,
+        "location_history": location_history
     }
 
 
@@ -346,3 +404,124 @@ async def get_anti_theft_events(
     
     return events
 
+
+@router.get("/watching", response_model=List[AntiTheftEventResponse])
+async def get_watchable_events(
+    current_user: User = Depends(get_current_user),
+    db: Session = Depends(get_db)
+):
+    """
+    Get active events of users who have the current user as an emergency contact
+    
+    Args:
+        current_user: Authenticated user
+        db: Database session
+    
+    Returns:
+        List of active events that can be watched live
+    """
+    return watchable_events(db, current_user)
+
+
+def _authorize_event_watch(token: str, event_id: uuid.UUID) -> bool:
+    """
+    Check a WebSocket token against the event once, at handshake time
+    
+    Returns:
+        True if the event is active and the user is its owner or one of the
+        owner's emergency contacts
+    """
+    with SessionLocal() as db:
+        user = get_user_from_token(db, token)
+        if user is None:
+            return False
+        
+        event = db.query(AntiTheftEvent).filter(
+            AntiTheftEvent.id == event_id,
+            AntiTheftEvent.status == "active"
+        ).first()
+        if event is None:
+            return False
+        
+        return can_watch_event(db, user, event)
+
+
+def _load_watch_snapshot(event_id: uuid.UUID) -> List[dict]:
+    """Recent fixes of an event for a new watcher, from the cache when warm"""
+    location_history = get_location_history(event_id)
+    if location_history is not None:
+        return location_history
+    
+    with SessionLocal() as db:
+        return _load_location_history(db, event_id)
+
+
+async def _wait_for_disconnect(websocket: WebSocket) -> None:
+    """Discard client frames until the connection closes"""
+    try:
+        while True:
+            await websocket.receive_text()
+    except WebSocketDisconnect:
+        pass
+
+
+@router.websocket("/events/{event_id}/ws")
+async def watch_anti_theft_event(websocket: WebSocket, event_id: str, token: str):
+    """
+    Watch the live locations of an active anti-theft event over a WebSocket
+    
+    Open to the event owner and the owner's active emergency contacts; the
+    token is checked once when the connection opens. The first message is a
+    snapshot of the recent fixes, then each received fix is pushed as a
+    location message. Fixes are published once to Redis pub/sub and fanned
+    out to every watcher by each worker. An end message is sent when the
+    event is deactivated; a watcher that falls too far behind is
+    disconnected and reconnects for a fresh snapshot.
+    
+    Args:
+        websocket: WebSocket connection
+        event_id: Event ID
+        token: JWT access token
+    """
+    try:
+        event_uuid = uuid.UUID(event_id)
+    except ValueError:
+        await websocket.close(code=status.WS_1008_POLICY_VIOLATION)
+        return
+    
+    if not await run_in_threadpool(_authorize_event_watch, token, event_uuid):
+        await websocket.close(code=status.WS_1008_POLICY_VIOLATION)
+        return
+    
+    await websocket.accept()
+    
+    # Subscribe before the snapshot so nothing published in between is lost
+    async with pubsub_hub.subscribe(event_channel(event_uuid)) as queue:
+        snapshot = await run_in_threadpool(_load_watch_snapshot, event_uuid)
+        await websocket.send_json({"type": "snapshot", "locations": snapshot})
+        
+        disconnected = asyncio.create_task(_wait_for_disconnect(websocket))
+        try:
+            while True:
+                received = asyncio.create_task(queue.get())
+                done, _ = await asyncio.wait({received, disconnected}, return_when=asyncio.FIRST_COMPLETED)
+                
+                if disconnected in done:
+                    received.cancel()
+                    return
+                
+                item = received.result()
+                if item is None:
+                    await websocket.close(code=status.WS_1013_TRY_AGAIN_LATER, reason="Watcher fell behind")
+                    return
+                
+                # Forward the published text without re-serializing it
+                await websocket.send_text(item[1])
+                
+                if item[1] == END_MESSAGE:
+                    await websocket.close()
+                    return
+        except WebSocketDisconnect:
+            return
+        finally:
+            disconnected.cancel()
@@ -12,6 +12,8 @@ from app.core.database import get_db
 from app.core.dependencies import get_current_user
 from app.models.user import User
 from app.models.emergency import EmergencyReport, EmergencyReportMedia
+from app.services.tiles import invalidate_report_tiles
+from app.services.incident_index import publish_report_change
 from app.schemas.emergency import (
     EmergencyReportCreate,
     EmergencyReportUpdate,
@@ -56,6 +58,16 @@ async def create_emergency_report(
     db.add(report)
     db.commit()
     db.refresh(report)
+    invalidate_report_tiles(report_data.latitude, report_data.longitude)
+    publish_report_change(
+        report.id,
+        report.report_type,
+        report.severity,
+        report.status,
+        report_data.latitude,
+        report_data.longitude,
+        report.reported_at
+    )
     
     # TODO: Send alerts to emergency services
     # TODO: Notify emergency contacts
@@ -198,6 +210,20 @@ async def update_report_status(
     # Convert location for response
     point = to_shape(report.location)
     
+    # Cancelled reports leave the density layer, and closed ones no longer
+    # raise proximity warnings
+    if "status" in update_data:
+        invalidate_report_tiles(point.y, point.x)
+        publish_report_change(
+            report.id,
+            report.report_type,
+            report.severity,
+            report.status,
+            point.y,
+            point.x,
+            report.reported_at
+        )
+    
     return {
         **report.__dict__,
         "latitude": point.y,
@@ -1,19 +1,25 @@
 """
 Path tracking endpoints
 """
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, Header, WebSocket, WebSocketDisconnect, status
+from fastapi.responses import JSONResponse, Response, StreamingResponse
+from pydantic import ValidationError
 from sqlalchemy.orm import Session
-from typing import List
-from datetime import datetime, timedelta
-from geoalchemy2.shape import to_shape
-from geoalchemy2.elements import WKTElement
+from starlette.concurrency import run_in_threadpool
+from typing import List, Optional, Tuple
+from datetime import datetime, timedelta, timezone
 from geoalchemy2.functions import ST_Distance, ST_Length, ST_MakeLine
+import asyncio
+import json
 import secrets
+import uuid
 
-from app.core.database import get_db
-from app.core.dependencies import get_current_user
+from app.core.config import settings
+from app.core.database import SessionLocal, get_db
+from app.core.dependencies import get_current_user, get_user_from_token
+from app.core.pubsub import pubsub_hub
 from app.models.user import User
-from app.models.path import Path, PathPoint, SharedPath
+from app.models.path import Path, SharedPath, PathSimplification, FrequentRoute, SafeCorridor
 from app.schemas.path import (
     PathCreate,
     PathUpdate,
@@ -21,13 +27,210 @@ from app.schemas.path import (
     PathDetailResponse,
     PathPointCreate,
     PathPointResponse,
+    PathPointPage,
+    PathPointBatchResponse,
+    FrequentRouteResponse,
+    PathTripSegmentResponse,
+    SafeCorridorCreate,
+    SafeCorridorResponse,
     PathShareCreate,
     PathShareResponse
 )
+from app.services.path_ingest import store_path_points, recompute_path_statistics
+from app.services import shared_path_cache
+from app.services.path_live import (
+    path_channel,
+    publish_path_points,
+    publish_path_ended,
+    row_to_dict,
+    points_event,
+    format_sse
+)
+from app.services.frequent_routes import route_statistics
+from app.services.trip_segments import close_trip_segments, list_trip_segments
+from app.services.safe_corridors import create_safe_corridor, alert_corridor_deviation
+from app.services.tiles import invalidate_path_tiles, invalidate_user_path_tiles
+from app.services.path_export import EXPORT_FORMATS, EXPORT_WRITERS, iter_encoded, iter_gzip
+from app.services.path_segments import archive_path_points
+from app.services.path_simplify import build_path_simplifications, find_path_simplification
+from app.services.path_points import (
+    POINT_COLUMNS,
+    load_point_rows,
+    load_point_columns,
+    load_point_page,
+    iter_point_chunks
+)
+from app.services.path_encoding import (
+    JSON_MEDIA_TYPE,
+    POLYLINE_MEDIA_TYPE,
+    MSGPACK_MEDIA_TYPE,
+    ARROW_MEDIA_TYPE,
+    NDJSON_MEDIA_TYPE,
+    SUPPORTED_MEDIA_TYPES,
+    negotiate_media_type,
+    build_polyline_payload,
+    encode_msgpack,
+    encode_arrow_ipc,
+    iter_json_document,
+    iter_ndjson
+)
 
 router = APIRouter()
 
 
+def _load_path_points(
+    db: Session,
+    path: Path,
+    simplification: Optional[PathSimplification] = None
+) -> List[dict]:
+    """
+    Load path points in response format
+    
+    Args:
+        db: Database session
+        path: Path
+        simplification: Precomputed level to restrict the points to
+    
+    Returns:
+        List of point dicts ordered by timestamp
+    """
+    point_ids = simplification.point_ids if simplification is not None else None
+    rows = load_point_rows(db, path, point_ids)
+    
+    return [dict(zip(POINT_COLUMNS, row)) for row in rows]
+
+
+def _path_detail_response(
+    db: Session,
+    path: Path,
+    simplification: Optional[PathSimplification],
+    accept: Optional[str],
+    stream: bool = False
+):
+    """
+    Build the path detail body in the format negotiated from the Accept header
+    
+    Args:
+        db: Database session
+        path: Path
+        simplification: Precomputed level to restrict the points to
+        accept: Accept header value
+        stream: Stream the JSON document instead of building it in memory
+    
+    Returns:
+        Path dict for JSON, or a ready Response for streamed and compact formats
+    
+    Raises:
+        HTTPException: If no acceptable format is supported
+    """
+    media_type = negotiate_media_type(accept)
+    
+    if media_type is None:
+        raise HTTPException(
+            status_code=status.HTTP_406_NOT_ACCEPTABLE,
+            detail=f"Supported formats: {', '.join(SUPPORTED_MEDIA_TYPES)}"
+        )
+    
+    if media_type == JSON_MEDIA_TYPE and not stream:
+        return {
+            **path.__dict__,
+            "points": _load_path_points(db, path, simplification)
+        }
+    
+    point_ids = simplification.point_ids if simplification is not None else None
+    path_data = PathResponse.model_validate(path).model_dump(mode="json")
+    headers = {"Vary": "Accept"}
+    
+    # Streamed formats read through a server-side cursor chunk by chunk
+    if media_type == JSON_MEDIA_TYPE:
+        return StreamingResponse(
+            iter_json_document(path_data, iter_point_chunks(db, path, point_ids)),
+            media_type=JSON_MEDIA_TYPE,
+            headers=headers
+        )
+    
+    if media_type == NDJSON_MEDIA_TYPE:
+        return StreamingResponse(
+            iter_ndjson(path_data, iter_point_chunks(db, path, point_ids)),
+            media_type=NDJSON_MEDIA_TYPE,
+            headers=headers
+        )
+    
+    columns = load_point_columns(db, path, point_ids)
+    
+    if media_type == POLYLINE_MEDIA_TYPE:
+        return JSONResponse(
+            content=build_polyline_payload(path_data, columns),
+            media_type=POLYLINE_MEDIA_TYPE,
+            headers=headers
+        )
+    
+    if media_type == MSGPACK_MEDIA_TYPE:
+        return Response(
+            content=encode_msgpack(path_data, columns),
+            media_type=MSGPACK_MEDIA_TYPE,
+            headers=headers
+        )
+    
+    try:
+        content = encode_arrow_ipc(path_data, columns)
+    except ImportError:
+        raise HTTPException(
+            status_code=status.HTTP_406_NOT_ACCEPTABLE,
+            detail="Arrow format is not available on this server"
+        )
+    
+    return Response(content=content, media_type=ARROW_MEDIA_TYPE, headers=headers)
+
+
+def _export_response(db: Session, paths: List[Path], format: str, gzip: bool, filename: str):
+    """
+    Build a streamed export response for a list of paths
+    
+    Args:
+        db: Database session
+        paths: Paths to export
+        format: Export format (gpx, geojson, kml)
+        gzip: Gzip the file while it streams
+        filename: Download file name without extension
+    
+    Returns:
+        Streaming response
+    
+    Raises:
+        HTTPException: If format is not supported
+    """
+    if format not in EXPORT_WRITERS:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Export format must be one of: {', '.join(EXPORT_WRITERS)}"
+        )
+    
+    media_type, extension = EXPORT_FORMATS[format]
+    filename = f"{filename}.{extension}"
+    
+    # Point chunks are only fetched when the writer reaches each path
+    items = [
+        (
+            PathResponse.model_validate(path).model_dump(mode="json"),
+            lambda path=path: iter_point_chunks(db, path)
+        )
+        for path in paths
+    ]
+    body = iter_encoded(EXPORT_WRITERS[format](items))
+    
+    if gzip:
+        body = iter_gzip(body)
+        media_type = "application/gzip"
+        filename = f"{filename}.gz"
+    
+    return StreamingResponse(
+        body,
+        media_type=media_type,
+        headers={"Content-Disposition": f'attachment; filename="{filename}"'}
+    )
+
+
 @router.post("/start", response_model=PathResponse, status_code=status.HTTP_201_CREATED)
 async def start_path_tracking(
     path_data: PathCreate,
@@ -44,6 +247,9 @@ async def start_path_tracking(
     
     Returns:
         Created path
+    
+    Raises:
+        HTTPException: If the safe corridor is not found
     """
     # Deactivate any active paths
     db.query(Path).filter(
@@ -51,6 +257,19 @@ async def start_path_tracking(
         Path.is_active == True
     ).update({"is_active": False})
     
+    if path_data.safe_corridor_id is not None:
+        corridor = db.query(SafeCorridor).filter(
+            SafeCorridor.id == path_data.safe_corridor_id,
+            SafeCorridor.user_id == current_user.id,
+            SafeCorridor.is_active == True
+        ).first()
+        
+        if not corridor:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail="Safe corridor not found"
+            )
+    
     # Create new path
     path = Path(
         user_id=current_user.id,
@@ -58,7 +277,8 @@ async def start_path_tracking(
         description=path_data.description,
         path_type=path_data.path_type,
         start_time=datetime.utcnow(),
-        is_active=True
+        is_active=True,
+        safe_corridor_id=path_data.safe_corridor_id
     )
     
     db.add(path)
@@ -68,6 +288,33 @@ async def start_path_tracking(
     return path
 
 
+def _finish_path(db: Session, path: Path) -> None:
+    """
+    Compute the final statistics, simplifications and archive of a stopped path and commit
+    
+    Args:
+        db: Database session
+        path: Path that was just stopped
+    """
+    # Distance, speed and point count are maintained at ingest time;
+    # only paths recorded before that need a one-off recompute
+    if path.point_count is None:
+        recompute_path_statistics(db, path)
+    
+    # Store the stay or leg that was still open
+    close_trip_segments(db, path)
+    
+    # Simplified levels are computed once here so reads do no geometry work
+    build_path_simplifications(db, path)
+    
+    # Completed paths never change; pack their points into one compressed row
+    if settings.PATH_ARCHIVE_ON_STOP:
+        archive_path_points(db, path, load_point_columns(db, path))
+    
+    db.commit()
+    db.refresh(path)
+
+
 @router.post("/{path_id}/stop", response_model=PathResponse)
 async def stop_path_tracking(
     path_id: str,
@@ -108,29 +355,54 @@ async def stop_path_tracking(
     path.is_active = False
     path.end_time = datetime.utcnow()
     
-    # Calculate total distance
-    # Note: This is a simplified calculation, in production use ST_Length
-    points_count = db.query(PathPoint).filter(PathPoint.path_id == path.id).count()
-    
-    if points_count > 1:
-        # For simplicity, we'll calculate average speed if available
-        first_point = db.query(PathPoint).filter(PathPoint.path_id == path.id).order_by(PathPoint.timestamp).first()
-        last_point = db.query(PathPoint).filter(PathPoint.path_id == path.id).order_by(PathPoint.timestamp.desc()).first()
-        
-        if first_point and last_point:
-            time_diff = (last_point.timestamp - first_point.timestamp).total_seconds()
-            # This is a placeholder - actual distance calculation would use PostGIS functions
-            path.total_distance_meters = 0.0  # Placeholder
-            if time_diff > 0:
-                path.average_speed_mps = path.total_distance_meters / time_diff if path.total_distance_meters else 0
+    # Simplification and archiving walk every point of the path
+    await run_in_threadpool(_finish_path, db, path)
     
-    db.commit()
-    db.refresh(path)
+    shared_path_cache.invalidate_path(path.id)
+    invalidate_user_path_tiles(current_user.id)
+    publish_path_ended(path.id)
     
     return path
 
 
-@router.post("/{path_id}/points", status_code=status.HTTP_201_CREATED)
+def _after_points_stored(
+    path_id: uuid.UUID,
+    user_id: uuid.UUID,
+    inserted: List[PathPointCreate],
+    previous: Tuple[Optional[float], Optional[float]],
+    previous_time: Optional[datetime],
+    summary: dict
+) -> None:
+    """
+    Refresh caches, notify followers and raise alerts once new points are committed
+    
+    Args:
+        path_id: Path ID
+        user_id: Path owner
+        inserted: Points that were stored
+        previous: Last stored (latitude, longitude) before the batch
+        previous_time: Timestamp of that point
+        summary: Batch summary from store_path_points
+    """
+    if not inserted:
+        return
+    
+    shared_path_cache.invalidate_path(path_id)
+    
+    # Late points split segments drawn earlier and thinning redraws the
+    # whole line, neither of which the new segments alone cover
+    ordered = sorted(inserted, key=lambda p: p.timestamp)
+    if summary["downsampled"] or (previous_time is not None and ordered[0].timestamp < previous_time):
+        invalidate_user_path_tiles(user_id)
+    else:
+        invalidate_path_tiles(user_id, [previous] + [(p.latitude, p.longitude) for p in ordered])
+    publish_path_points(path_id, inserted)
+    
+    if summary["corridor_deviation"]:
+        alert_corridor_deviation(path_id, max(inserted, key=lambda p: p.timestamp))
+
+
+@router.post("/{path_id}/points", response_model=PathPointBatchResponse, status_code=status.HTTP_201_CREATED)
 async def add_path_points(
     path_id: str,
     points: List[PathPointCreate],
@@ -147,15 +419,17 @@ async def add_path_points(
         db: Database session
     
     Returns:
-        Success message
+        Number of points received, stored and skipped as duplicates, and how
+        many each filter removed
     
     Raises:
-        HTTPException: If path not found
+        HTTPException: If path not found or archived
     """
+    # Lock the path row so concurrent batches fold into the aggregates in turn
     path = db.query(Path).filter(
         Path.id == path_id,
         Path.user_id == current_user.id
-    ).first()
+    ).with_for_update().first()
     
     if not path:
         raise HTTPException(
@@ -163,24 +437,236 @@ async def add_path_points(
             detail="Path not found"
         )
     
-    # Add points
-    for point_data in points:
-        point_geom = WKTElement(f'POINT({point_data.longitude} {point_data.latitude})', srid=4326)
-        
-        point = PathPoint(
-            path_id=path.id,
-            location=point_geom,
-            accuracy=point_data.accuracy,
-            altitude=point_data.altitude,
-            speed=point_data.speed,
-            heading=point_data.heading,
-            timestamp=point_data.timestamp
+    if path.archived_at is not None:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Path is completed and archived"
         )
-        db.add(point)
+    
+    # Filter, then add points in a single idempotent bulk insert
+    previous = (path.last_latitude, path.last_longitude)
+    previous_time = path.last_point_time
+    inserted, summary = store_path_points(db, path, points)
     
     db.commit()
+    _after_points_stored(path.id, current_user.id, inserted, previous, previous_time, summary)
+    
+    return {
+        "message": f"Added {len(inserted)} points successfully",
+        **summary
+    }
+
+
+def _authorize_path_stream(token: str, path_id: uuid.UUID) -> Optional[uuid.UUID]:
+    """
+    Check a WebSocket token against the path once, at handshake time
+    
+    Returns:
+        Owner user ID, or None if the token is invalid or the path is not
+        an open path of that user
+    """
+    with SessionLocal() as db:
+        user = get_user_from_token(db, token)
+        if user is None:
+            return None
+        
+        path = db.query(Path).filter(Path.id == path_id, Path.user_id == user.id).first()
+        if path is None or path.archived_at is not None:
+            return None
+        
+        return user.id
+
+
+def _flush_path_stream(path_id: uuid.UUID, user_id: uuid.UUID, points: List[PathPointCreate]) -> Optional[dict]:
+    """
+    Store the points buffered by a WebSocket stream in one transaction
+    
+    Returns:
+        Batch summary, or None if the path was deleted or archived meanwhile
+    """
+    with SessionLocal() as db:
+        path = db.query(Path).filter(
+            Path.id == path_id,
+            Path.user_id == user_id
+        ).with_for_update().first()
+        
+        if path is None or path.archived_at is not None:
+            return None
+        
+        previous = (path.last_latitude, path.last_longitude)
+        previous_time = path.last_point_time
+        inserted, summary = store_path_points(db, path, points)
+        db.commit()
+    
+    _after_points_stored(path_id, user_id, inserted, previous, previous_time, summary)
+    
+    return summary
+
+
+@router.websocket("/{path_id}/ws")
+async def stream_path_points(websocket: WebSocket, path_id: str, token: str):
+    """
+    Stream location points into a path over a WebSocket
+    
+    The token is checked once when the connection opens. Each frame is one
+    point object or a list of them, in the same shape as the batch upload.
+    Points are buffered and flushed through the batch ingest pipeline every
+    PATH_WS_FLUSH_INTERVAL_SECONDS, or as soon as PATH_WS_FLUSH_MAX_POINTS
+    are waiting; every flush is acknowledged with the batch summary.
+    
+    Args:
+        websocket: WebSocket connection
+        path_id: Path ID
+        token: JWT access token
+    """
+    try:
+        path_uuid = uuid.UUID(path_id)
+    except ValueError:
+        await websocket.close(code=status.WS_1008_POLICY_VIOLATION)
+        return
+    
+    user_id = await run_in_threadpool(_authorize_path_stream, token, path_uuid)
+    if user_id is None:
+        await websocket.close(code=status.WS_1008_POLICY_VIOLATION)
+        return
+    
+    await websocket.accept()
+    
+    loop = asyncio.get_running_loop()
+    buffer: List[PathPointCreate] = []
+    deadline = None
+    connected = True
+    
+    while connected:
+        timeout = None if deadline is None else max(deadline - loop.time(), 0)
+        
+        try:
+            frame = await asyncio.wait_for(websocket.receive_json(), timeout)
+        except asyncio.TimeoutError:
+            frame = None
+        except WebSocketDisconnect:
+            frame = None
+            connected = False
+        except ValueError:
+            await websocket.send_json({"type": "error", "detail": "Frame is not valid JSON"})
+            continue
+        
+        if frame is not None:
+            items = frame if isinstance(frame, list) else [frame]
+            try:
+                buffer.extend([PathPointCreate.model_validate(item) for item in items])
+            except ValidationError as e:
+                errors = [{"loc": list(error["loc"]), "msg": error["msg"]} for error in e.errors()]
+                await websocket.send_json({"type": "error", "detail": errors})
+                continue
+            
+            if deadline is None and buffer:
+                deadline = loop.time() + settings.PATH_WS_FLUSH_INTERVAL_SECONDS
+        
+        due = deadline is not None and loop.time() >= deadline
+        if buffer and (due or not connected or len(buffer) >= settings.PATH_WS_FLUSH_MAX_POINTS):
+            batch, buffer, deadline = buffer, [], None
+            summary = await run_in_threadpool(_flush_path_stream, path_uuid, user_id, batch)
+            
+            if not connected:
+                break
+            if summary is None:
+                await websocket.close(code=status.WS_1008_POLICY_VIOLATION, reason="Path is completed or deleted")
+                break
+            
+            await websocket.send_json({"type": "ack", **summary})
+
+
+@router.get("/{path_id}/points", response_model=PathPointPage)
+async def get_path_points(
+    path_id: str,
+    current_user: User = Depends(get_current_user),
+    db: Session = Depends(get_db),
+    start: Optional[datetime] = None,
+    end: Optional[datetime] = None,
+    cursor: Optional[str] = None,
+    limit: int = 1000
+):
+    """
+    Get a range of path points with keyset pagination
+    
+    Args:
+        path_id: Path ID
+        current_user: Authenticated user
+        db: Database session
+        start: Only points at or after this time
+        end: Only points before this time
+        cursor: next_cursor from the previous page
+        limit: Maximum number of points to return
+    
+    Returns:
+        Page of points and the cursor for the next page
+    
+    Raises:
+        HTTPException: If path not found or cursor is invalid
+    """
+    path = db.query(Path).filter(
+        Path.id == path_id,
+        Path.user_id == current_user.id
+    ).first()
+    
+    if not path:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Path not found"
+        )
+    
+    limit = max(1, min(limit, settings.PATH_POINTS_PAGE_MAX_SIZE))
+    
+    try:
+        rows, next_cursor = load_point_page(db, path, limit, cursor, start, end)
+    except ValueError:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Invalid cursor"
+        )
+    
+    return {
+        "points": [dict(zip(POINT_COLUMNS, row)) for row in rows],
+        "next_cursor": next_cursor
+    }
+
+
+@router.get("/{path_id}/trip-segments", response_model=List[PathTripSegmentResponse])
+async def get_path_trip_segments(
+    path_id: str,
+    current_user: User = Depends(get_current_user),
+    db: Session = Depends(get_db)
+):
+    """
+    Get the stays and movement legs detected in a path
+    
+    Segments are stored as points are ingested; the stay or leg in
+    progress on an active path is added when the path is stopped.
+    
+    Args:
+        path_id: Path ID
+        current_user: Authenticated user
+        db: Database session
+    
+    Returns:
+        Trip segments in time order
+    
+    Raises:
+        HTTPException: If path not found
+    """
+    path = db.query(Path).filter(
+        Path.id == path_id,
+        Path.user_id == current_user.id
+    ).first()
+    
+    if not path:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Path not found"
+        )
     
-    return {"message": f"Added {len(points)} points successfully"}
+    return list_trip_segments(db, path)
 
 
 @router.get("", response_model=List[PathResponse])
@@ -209,19 +695,213 @@ async def get_paths(
     return paths
 
 
+@router.get("/routes", response_model=List[FrequentRouteResponse])
+async def get_frequent_routes(
+    current_user: User = Depends(get_current_user),
+    db: Session = Depends(get_db),
+    limit: int = 10
+):
+    """
+    Get the user's usual routes with travel-time statistics
+    
+    Routes are clusters of completed paths built by the background
+    indexing job; only routes travelled at least ROUTE_MIN_TRIPS times
+    are returned, most travelled first.
+    
+    Args:
+        current_user: Authenticated user
+        db: Database session
+        limit: Maximum number of routes to return
+    
+    Returns:
+        List of frequent routes
+    """
+    routes = db.query(FrequentRoute).filter(
+        FrequentRoute.user_id == current_user.id,
+        FrequentRoute.path_count >= settings.ROUTE_MIN_TRIPS
+    ).order_by(
+        FrequentRoute.path_count.desc(),
+        FrequentRoute.last_traveled_at.desc()
+    ).limit(limit).all()
+    
+    return [
+        {**route.__dict__, **route_statistics(route)}
+        for route in routes
+    ]
+
+
+@router.post("/routes/{route_id}/corridor", response_model=SafeCorridorResponse, status_code=status.HTTP_201_CREATED)
+async def create_route_corridor(
+    route_id: str,
+    corridor_data: SafeCorridorCreate,
+    current_user: User = Depends(get_current_user),
+    db: Session = Depends(get_db)
+):
+    """
+    Mark a usual route as a safe corridor
+    
+    The corridor is the route's recent trips buffered by buffer_meters.
+    Paths started with its safe_corridor_id alert the emergency contacts
+    when they leave it.
+    
+    Args:
+        route_id: Frequent route ID
+        corridor_data: Corridor name and allowed deviation
+        current_user: Authenticated user
+        db: Database session
+    
+    Returns:
+        Created corridor
+    
+    Raises:
+        HTTPException: If route not found or has no recorded trips
+    """
+    route = db.query(FrequentRoute).filter(
+        FrequentRoute.id == route_id,
+        FrequentRoute.user_id == current_user.id
+    ).first()
+    
+    if not route:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Route not found"
+        )
+    
+    buffer_meters = corridor_data.buffer_meters or settings.SAFE_CORRIDOR_DEFAULT_BUFFER_METERS
+    corridor = create_safe_corridor(db, route, buffer_meters, corridor_data.name)
+    
+    if corridor is None:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Route has no recorded trips"
+        )
+    
+    db.commit()
+    db.refresh(corridor)
+    
+    return corridor
+
+
+@router.get("/corridors", response_model=List[SafeCorridorResponse])
+async def get_safe_corridors(
+    current_user: User = Depends(get_current_user),
+    db: Session = Depends(get_db)
+):
+    """
+    Get the user's safe corridors
+    
+    Args:
+        current_user: Authenticated user
+        db: Database session
+    
+    Returns:
+        List of active corridors
+    """
+    return db.query(SafeCorridor).filter(
+        SafeCorridor.user_id == current_user.id,
+        SafeCorridor.is_active == True
+    ).order_by(SafeCorridor.created_at.desc()).all()
+
+
+@router.delete("/corridors/{corridor_id}", status_code=status.HTTP_204_NO_CONTENT)
+async def delete_safe_corridor(
+    corridor_id: str,
+    current_user: User = Depends(get_current_user),
+    db: Session = Depends(get_db)
+):
+    """
+    Delete a safe corridor
+    
+    Args:
+        corridor_id: Corridor ID
+        current_user: Authenticated user
+        db: Database session
+    
+    Raises:
+        HTTPException: If corridor not found
+    """
+    corridor = db.query(SafeCorridor).filter(
+        SafeCorridor.id == corridor_id,
+        SafeCorridor.user_id == current_user.id
+    ).first()
+    
+    if not corridor:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Safe corridor not found"
+        )
+    
+    db.delete(corridor)
+    db.commit()
+    
+    return None
+
+
+@router.get("/export")
+async def export_paths(
+    current_user: User = Depends(get_current_user),
+    db: Session = Depends(get_db),
+    format: str = "gpx",
+    start: Optional[datetime] = None,
+    end: Optional[datetime] = None,
+    gzip: bool = False
+):
+    """
+    Export the user's paths started within a date range
+    
+    Args:
+        current_user: Authenticated user
+        db: Database session
+        format: Export format (gpx, geojson, kml)
+        start: Only paths started at or after this time
+        end: Only paths started before this time
+        gzip: Gzip the file while it streams
+    
+    Returns:
+        Streamed export file
+    
+    Raises:
+        HTTPException: If format is not supported
+    """
+    query = db.query(Path).filter(Path.user_id == current_user.id)
+    
+    if start is not None:
+        query = query.filter(Path.start_time >= start)
+    if end is not None:
+        query = query.filter(Path.start_time < end)
+    
+    paths = query.order_by(Path.start_time).all()
+    
+    return _export_response(db, paths, format, gzip, f"nuur-paths-{datetime.utcnow():%Y%m%d}")
+
+
 @router.get("/{path_id}", response_model=PathDetailResponse)
 async def get_path_detail(
     path_id: str,
     current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    db: Session = Depends(get_db),
+    tolerance: Optional[float] = None,
+    zoom: Optional[int] = None,
+    stream: bool = False,
+    accept: Optional[str] = Header(None)
 ):
     """
     Get path details with all points
     
+    Completed paths can be returned simplified: pass a tolerance in meters,
+    or the map zoom level, to get the closest precomputed level. Points are
+    returned as JSON objects by default; compact formats are negotiated
+    through the Accept header. Long paths can be streamed with stream=true
+    or as NDJSON, keeping server memory flat.
+    
     Args:
         path_id: Path ID
         current_user: Authenticated user
         db: Database session
+        tolerance: Simplification tolerance in meters
+        zoom: Map zoom level (used when tolerance is not given)
+        stream: Stream JSON points from a server-side cursor
+        accept: Accept header (JSON, NDJSON, encoded polyline, MessagePack or Arrow)
     
     Returns:
         Path with points
@@ -240,30 +920,47 @@ async def get_path_detail(
             detail="Path not found"
         )
     
-    # Get points
-    points_data = db.query(PathPoint).filter(
-        PathPoint.path_id == path.id
-    ).order_by(PathPoint.timestamp).all()
-    
-    # Convert to response format
-    points = []
-    for p in points_data:
-        point = to_shape(p.location)
-        points.append({
-            "id": p.id,
-            "latitude": point.y,
-            "longitude": point.x,
-            "accuracy": p.accuracy,
-            "altitude": p.altitude,
-            "speed": p.speed,
-            "heading": p.heading,
-            "timestamp": p.timestamp
-        })
+    simplification = find_path_simplification(db, path, tolerance, zoom)
     
-    return {
-        **path.__dict__,
-        "points": points
-    }
+    return _path_detail_response(db, path, simplification, accept, stream)
+
+
+@router.get("/{path_id}/export")
+async def export_path(
+    path_id: str,
+    current_user: User = Depends(get_current_user),
+    db: Session = Depends(get_db),
+    format: str = "gpx",
+    gzip: bool = False
+):
+    """
+    Export a single path
+    
+    Args:
+        path_id: Path ID
+        current_user: Authenticated user
+        db: Database session
+        format: Export format (gpx, geojson, kml)
+        gzip: Gzip the file while it streams
+    
+    Returns:
+        Streamed export file
+    
+    Raises:
+        HTTPException: If path not found or format is not supported
+    """
+    path = db.query(Path).filter(
+        Path.id == path_id,
+        Path.user_id == current_user.id
+    ).first()
+    
+    if not path:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Path not found"
+        )
+    
+    return _export_response(db, [path], format, gzip, f"nuur-path-{path.id}")
 
 
 @router.put("/{path_id}", response_model=PathResponse)
@@ -305,6 +1002,7 @@ async def update_path(
     
     db.commit()
     db.refresh(path)
+    shared_path_cache.invalidate_path(path.id)
     
     return path
 
@@ -337,8 +1035,13 @@ async def delete_path(
             detail="Path not found"
         )
     
+    share_tokens = [shared.share_token for shared in path.shared_with]
+    
     db.delete(path)
     db.commit()
+    shared_path_cache.forget_path(path.id, share_tokens)
+    invalidate_user_path_tiles(current_user.id)
+    publish_path_ended(path.id)
     
     return None
 
@@ -397,17 +1100,66 @@ async def share_path(
     return shared_path
 
 
+def _resolve_share(db: Session, share_token: str) -> dict:
+    """
+    Look up a share token, through the Redis cache
+    
+    Returns:
+        Dict with path_id and expires_at
+    
+    Raises:
+        HTTPException: If token is invalid or expired
+    """
+    share = shared_path_cache.get_share(share_token)
+    
+    if share is None:
+        shared = db.query(SharedPath).filter(
+            SharedPath.share_token == share_token
+        ).first()
+        
+        if not shared:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail="Shared path not found"
+            )
+        
+        share = {"path_id": shared.path_id, "expires_at": shared.expires_at}
+        shared_path_cache.set_share(share_token, shared.path_id, shared.expires_at)
+    
+    if share["expires_at"] and share["expires_at"] < datetime.utcnow():
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Share link has expired"
+        )
+    
+    return share
+
+
 @router.get("/shared/{share_token}", response_model=PathDetailResponse)
 async def get_shared_path(
     share_token: str,
-    db: Session = Depends(get_db)
+    db: Session = Depends(get_db),
+    tolerance: Optional[float] = None,
+    zoom: Optional[int] = None,
+    stream: bool = False,
+    accept: Optional[str] = Header(None),
+    if_none_match: Optional[str] = Header(None)
 ):
     """
     Get path using share token (no authentication required)
     
+    Token lookups and JSON payloads are cached in Redis per path version;
+    clients revalidating with If-None-Match get 304 while the path is
+    unchanged.
+    
     Args:
         share_token: Share token
         db: Database session
+        tolerance: Simplification tolerance in meters
+        zoom: Map zoom level (used when tolerance is not given)
+        stream: Stream JSON points from a server-side cursor
+        accept: Accept header (JSON, NDJSON, encoded polyline, MessagePack or Arrow)
+        if_none_match: ETag from a previous response
     
     Returns:
         Shared path with points
@@ -415,23 +1167,27 @@ async def get_shared_path(
     Raises:
         HTTPException: If token is invalid or expired
     """
-    shared = db.query(SharedPath).filter(
-        SharedPath.share_token == share_token
-    ).first()
+    share = _resolve_share(db, share_token)
     
-    if not shared:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail="Shared path not found"
-        )
+    media_type = negotiate_media_type(accept) or "none"
+    variant = f"{media_type}:{tolerance}:{zoom}"
+    version = shared_path_cache.get_path_version(share["path_id"])
+    cacheable = version is not None and media_type == JSON_MEDIA_TYPE and not stream
+    headers = {}
     
-    if shared.expires_at and shared.expires_at < datetime.utcnow():
-        raise HTTPException(
-            status_code=status.HTTP_403_FORBIDDEN,
-            detail="Share link has expired"
-        )
+    if version is not None:
+        etag = shared_path_cache.build_etag(share["path_id"], version, variant)
+        headers = {"ETag": etag, "Vary": "Accept", "Cache-Control": "no-cache"}
+        
+        if if_none_match == etag:
+            return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=headers)
+    
+    if cacheable:
+        payload = shared_path_cache.get_payload(share["path_id"], version, variant)
+        if payload is not None:
+            return Response(content=payload, media_type=JSON_MEDIA_TYPE, headers=headers)
     
-    path = db.query(Path).filter(Path.id == shared.path_id).first()
+    path = db.query(Path).filter(Path.id == share["path_id"]).first()
     
     if not path:
         raise HTTPException(
@@ -439,27 +1195,137 @@ async def get_shared_path(
             detail="Path not found"
         )
     
-    # Get points
-    points_data = db.query(PathPoint).filter(
-        PathPoint.path_id == path.id
-    ).order_by(PathPoint.timestamp).all()
-    
-    points = []
-    for p in points_data:
-        point = to_shape(p.location)
-        points.append({
-            "id": p.id,
-            "latitude": point.y,
-            "longitude": point.x,
-            "accuracy": p.accuracy,
-            "altitude": p.altitude,
-            "speed": p.speed,
-            "heading": p.heading,
-            "timestamp": p.timestamp
-        })
+    simplification = find_path_simplification(db, path, tolerance, zoom)
+    response = _path_detail_response(db, path, simplification, accept, stream)
     
-    return {
-        **path.__dict__,
-        "points": points
-    }
+    if cacheable:
+        payload = PathDetailResponse.model_validate(response).model_dump_json()
+        shared_path_cache.set_payload(share["path_id"], version, variant, payload, share["expires_at"])
+        return Response(content=payload, media_type=JSON_MEDIA_TYPE, headers=headers)
+    
+    if isinstance(response, Response):
+        response.headers.update(headers)
+    
+    return response
 
+
+def _load_points_since(path_id: uuid.UUID, since: Optional[datetime]) -> Tuple[Optional[List[Tuple]], bool]:
+    """
+    Load the points a follower missed, in its own session
+    
+    Returns:
+        Tuple of (rows after since, or None if the path is gone; whether the
+        path is still being recorded)
+    """
+    with SessionLocal() as db:
+        path = db.query(Path).filter(Path.id == path_id).first()
+        if path is None:
+            return None, False
+        
+        rows = []
+        if since is not None:
+            start = since + timedelta(microseconds=1)
+            cursor = None
+            while True:
+                page, cursor = load_point_page(db, path, settings.PATH_POINTS_PAGE_MAX_SIZE, cursor, start)
+                rows.extend(page)
+                if cursor is None:
+                    break
+        
+        return rows, path.is_active
+
+
+@router.get("/shared/{share_token}/follow")
+async def follow_shared_path(
+    share_token: str,
+    db: Session = Depends(get_db),
+    since: Optional[datetime] = None,
+    last_event_id: Optional[str] = Header(None)
+):
+    """
+    Follow a shared path live as server-sent events
+    
+    New points are published once per batch to Redis pub/sub and fanned
+    out to every follower by each worker, so followers cause no database
+    reads after connecting. A points event carries the points appended
+    since the previous one; its ID is the last point timestamp, so a
+    reconnecting client (Last-Event-ID) or one continuing from a snapshot
+    (since) first receives what it missed. An end event is sent when the
+    path is stopped or deleted or the link expires.
+    
+    Args:
+        share_token: Share token
+        db: Database session
+        since: Send stored points after this time first
+        last_event_id: Last-Event-ID header of a reconnecting EventSource
+    
+    Returns:
+        text/event-stream response
+    
+    Raises:
+        HTTPException: If token is invalid or expired
+    """
+    share = _resolve_share(db, share_token)
+    path_id = share["path_id"]
+    expires_at = share["expires_at"]
+    
+    if last_event_id:
+        try:
+            since = datetime.fromisoformat(last_event_id)
+        except ValueError:
+            pass
+    if since is not None and since.tzinfo is not None:
+        since = since.astimezone(timezone.utc).replace(tzinfo=None)
+    
+    # The stream outlives the request; do not hold a pooled connection for it
+    db.close()
+    
+    async def events():
+        last_time = since
+        
+        # Subscribe before catching up so nothing published in between is lost
+        async with pubsub_hub.subscribe(path_channel(path_id)) as queue:
+            rows, active = await run_in_threadpool(_load_points_since, path_id, since)
+            
+            if rows:
+                last_time = rows[-1][7]
+                yield points_event(row_to_dict(row) for row in rows)
+            if not active:
+                yield format_sse("end", "{}")
+                return
+            
+            while expires_at is None or expires_at > datetime.utcnow():
+                try:
+                    item = await asyncio.wait_for(queue.get(), settings.PATH_FOLLOW_KEEPALIVE_SECONDS)
+                except asyncio.TimeoutError:
+                    yield ": keepalive\n\n"
+                    continue
+                
+                # Fell behind; the client reconnects with Last-Event-ID and catches up
+                if item is None:
+                    return
+                
+                message = json.loads(item[1])
+                if message["type"] == "end":
+                    break
+                
+                points = [
+                    point for point in message["points"]
+                    if last_time is None or datetime.fromisoformat(point["timestamp"]) > last_time
+                ]
+                if points:
+                    last_time = datetime.fromisoformat(points[-1]["timestamp"])
+                    yield points_event(points)
+            
+            yield format_sse("end", "{}")
+    
+    return StreamingResponse(
+        events(),
+        media_type="text/event-stream",
+        headers={
+            "Cache-Control": "no-cache",
+            "X-Accel-Buffering": "no",
+            # Keeps GZipMiddleware from buffering events
+            "Content-Encoding": "identity",
+        }
+    )
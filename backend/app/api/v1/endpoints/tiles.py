@@ -0,0 +1,54 @@
+"""
+Vector tile endpoints
+"""
+from fastapi import APIRouter, Depends, HTTPException, Response, status
+from sqlalchemy.orm import Session
+
+from app.core.database import get_db
+from app.core.dependencies import get_current_user
+from app.models.user import User
+from app.services.tiles import MVT_MEDIA_TYPE, is_valid_tile, render_tile
+
+router = APIRouter()
+
+
+@router.get("/{z}/{x}/{y}.mvt")
+async def get_tile(
+    z: int,
+    x: int,
+    y: int,
+    current_user: User = Depends(get_current_user),
+    db: Session = Depends(get_db)
+):
+    """
+    Get a Mapbox Vector Tile of the user's paths and emergency report density
+
+    The tile has two layers: "paths" (lines with id, is_active and
+    start_time) and "reports" (grid cells with a report count).
+
+    Args:
+        z: Zoom level
+        x: Tile column
+        y: Tile row
+        current_user: Authenticated user
+        db: Database session
+
+    Returns:
+        MVT tile, or 204 when the tile has no features
+
+    Raises:
+        HTTPException: If the tile coordinates are out of range
+    """
+    if not is_valid_tile(z, x, y):
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Tile not found"
+        )
+
+    tile = render_tile(db, current_user.id, z, x, y)
+    headers = {"Cache-Control": "private, no-cache"}
+
+    if not tile:
+        return Response(status_code=status.HTTP_204_NO_CONTENT, headers=headers)
+
+    return Response(content=tile, media_type=MVT_MEDIA_TYPE, headers=headers)
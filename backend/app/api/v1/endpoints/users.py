@@ -10,6 +10,7 @@ from app.core.dependencies import get_current_user
 from app.models.user import User
 from app.models.emergency_contact import EmergencyContact
 from app.schemas.user import UserResponse, UserUpdate
+from app.services.sms_trigger import invalidate_phone_index
 from app.schemas.emergency import (
     EmergencyContactCreate,
     EmergencyContactUpdate,
@@ -53,6 +54,7 @@ async def update_user_profile(
         Updated user
     """
     update_data = user_update.dict(exclude_unset=True)
+    previous_phone = current_user.phone_number
     
     for field, value in update_data.items():
         setattr(current_user, field, value)
@@ -60,6 +62,10 @@ async def update_user_profile(
     db.commit()
     db.refresh(current_user)
     
+    # SMS triggers are resolved by phone number
+    if current_user.phone_number != previous_phone:
+        invalidate_phone_index(previous_phone, current_user.phone_number)
+    
     return current_user
 
 
@@ -0,0 +1,95 @@
+"""
+Inbound webhook endpoints for external gateways
+"""
+import logging
+
+from fastapi import APIRouter, Depends, HTTPException, Request, Response, status
+from sqlalchemy.orm import Session
+
+from app.core.database import get_db
+from app.services.anti_theft_cache import invalidate_status
+from app.services.sms_trigger import (
+    allow_sender,
+    claim_message,
+    parse_inbound_sms,
+    release_message,
+    trigger_from_sms,
+    verify_gateway_request,
+)
+
+logger = logging.getLogger(__name__)
+
+router = APIRouter()
+
+# Twilio expects TwiML; an empty response sends no reply SMS
+EMPTY_TWIML = '<?xml version="1.0" encoding="UTF-8"?><Response></Response>'
+
+
+@router.post("/sms")
+async def receive_sms(
+    request: Request,
+    db: Session = Depends(get_db)
+):
+    """
+    Receive an inbound SMS from Africa's Talking or Twilio
+    
+    A message matching the sender's trigger keyword starts anti-theft.
+    The gateway gets the same acknowledgement whether or not the message
+    was a trigger, so the webhook cannot be used to probe keywords, and
+    messages from a sender over SMS_WEBHOOK_SENDER_LIMIT are acknowledged
+    but not checked.
+    
+    Args:
+        request: Form-encoded gateway callback
+        db: Database session
+    
+    Returns:
+        Acknowledgement for the gateway
+    
+    Raises:
+        HTTPException: If the payload is not an inbound SMS or the request
+            is not signed by the gateway
+    """
+    form = dict(await request.form())
+    message = parse_inbound_sms(form)
+    
+    if message is None:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Unrecognized SMS payload"
+        )
+    
+    provider, sender, text, message_id = message
+    
+    if not verify_gateway_request(
+        provider,
+        str(request.url),
+        form,
+        request.headers.get("X-Twilio-Signature"),
+        request.query_params.get("token")
+    ):
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Invalid gateway signature"
+        )
+    
+    if not allow_sender(sender):
+        logger.warning(f"SMS webhook throttled sender {sender}")
+    elif claim_message(provider, message_id):
+        try:
+            event = trigger_from_sms(db, sender, text)
+            if event is not None:
+                db.commit()
+        except Exception:
+            # Let the gateway's retry through
+            release_message(provider, message_id)
+            raise
+        
+        if event is not None:
+            invalidate_status(event.user_id)
+            logger.info(f"Anti-theft event {event.id} triggered by SMS")
+    
+    if provider == "twilio":
+        return Response(content=EMPTY_TWIML, media_type="application/xml")
+    
+    return {"message": "Received"}
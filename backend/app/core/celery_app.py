@@ -0,0 +1,37 @@
+"""
+Celery application for background jobs
+"""
+from celery import Celery
+from celery.schedules import crontab
+
+from app.core.config import settings
+
+celery_app = Celery(
+    "nuur",
+    broker=settings.CELERY_BROKER_URL,
+    backend=settings.CELERY_RESULT_BACKEND,
+    include=[
+        "app.tasks.partitions",
+        "app.tasks.routes",
+        "app.tasks.alerts",
+    ],
+)
+
+celery_app.conf.update(
+    timezone="UTC",
+    enable_utc=True,
+    task_acks_late=True,
+    worker_prefetch_multiplier=1,
+)
+
+# Periodic jobs (run with `celery -A app.core.celery_app beat`)
+celery_app.conf.beat_schedule = {
+    "maintain-point-partitions": {
+        "task": "app.tasks.partitions.maintain_point_partitions",
+        "schedule": crontab(hour=1, minute=0),
+    },
+    "index-frequent-routes": {
+        "task": "app.tasks.routes.index_frequent_routes",
+        "schedule": crontab(minute="*/15"),
+    },
+}
@@ -35,6 +35,7 @@ class Settings(BaseSettings):
     # Redis
     REDIS_URL: str = "redis://localhost:6379/0"
     REDIS_CACHE_TTL: int = 3600
+    PUBSUB_QUEUE_SIZE: int = 256
     
     # JWT
     JWT_SECRET_KEY: str = secrets.token_urlsafe(32)
@@ -71,15 +72,106 @@ class Settings(BaseSettings):
     
     # Encryption
     ENCRYPTION_KEY: str = secrets.token_urlsafe(32)
+    # Required: keyword digests made under one key cannot be checked under
+    # another, so a per-process random default would break every trigger
+    # on restart
+    TRIGGER_KEYWORD_HMAC_KEY: str
+    
+    @validator("TRIGGER_KEYWORD_HMAC_KEY")
+    def validate_trigger_keyword_hmac_key(cls, v):
+        if len(v) < 32:
+            raise ValueError("TRIGGER_KEYWORD_HMAC_KEY must be at least 32 characters")
+        return v
     
     # Anti-Theft Settings
     ANTI_THEFT_DEFAULT_TRACKING_INTERVAL: int = 30
     ANTI_THEFT_DEFAULT_RECORDING_DURATION: int = 5
     ANTI_THEFT_MAX_RECORDING_DURATION: int = 30
+    ANTI_THEFT_ACTIVE_EVENT_CACHE_TTL: int = 300
+    ANTI_THEFT_STATUS_CACHE_TTL: int = 300
+    ANTI_THEFT_LOCATION_HISTORY_SIZE: int = 100
+    ANTI_THEFT_LOCATION_CACHE_TTL: int = 86400
+    
+    # Write-behind buffer for anti-theft locations
+    LOCATION_BUFFER_ENABLED: bool = True
+    LOCATION_BUFFER_BATCH_SIZE: int = 500
+    LOCATION_BUFFER_FLUSH_INTERVAL_SECONDS: float = 1.0
+    LOCATION_BUFFER_CLAIM_IDLE_SECONDS: int = 30
+    LOCATION_BUFFER_DEAD_LETTER_MAXLEN: int = 10000
+    
+    # Inbound SMS triggers
+    SMS_TRIGGER_INDEX_TTL: int = 3600
+    SMS_TRIGGER_UNKNOWN_PHONE_TTL: int = 60
+    SMS_WEBHOOK_DEDUPE_TTL: int = 86400
+    # Africa's Talking does not sign callbacks: its callback URL carries
+    # this secret as ?token=. Twilio callbacks are checked against
+    # TWILIO_AUTH_TOKEN. Webhooks are refused while neither is configured.
+    SMS_WEBHOOK_SECRET: str = ""
+    # Public URL Twilio posts to, if it differs from the URL the app sees
+    # (e.g. behind a TLS-terminating proxy)
+    SMS_WEBHOOK_PUBLIC_URL: str = ""
+    SMS_WEBHOOK_SENDER_LIMIT: int = 5
+    SMS_WEBHOOK_SENDER_WINDOW_SECONDS: int = 300
     
     # Path Tracking
     PATH_TRACKING_BATCH_SIZE: int = 100
     PATH_TRACKING_MAX_POINTS: int = 50000
+    PATH_TRACKING_RECENT_POINTS: int = 10000
+    PATH_TRACKING_DOWNSAMPLE_TARGET: float = 0.8
+    PATH_SIMPLIFICATION_TOLERANCES: List[float] = [5.0, 20.0, 80.0, 320.0]
+    PATH_STREAM_CHUNK_SIZE: int = 1000
+    PATH_POINTS_PAGE_MAX_SIZE: int = 5000
+    PATH_ARCHIVE_ON_STOP: bool = True
+    PATH_STAY_RADIUS_METERS: float = 100.0
+    PATH_STAY_MIN_DURATION_SECONDS: int = 300
+    
+    # Path ingest noise filtering
+    PATH_FILTER_ENABLED: bool = True
+    PATH_FILTER_MAX_ACCURACY_METERS: float = 100.0
+    PATH_FILTER_MIN_DISTANCE_METERS: float = 2.0
+    PATH_FILTER_MAX_SPEED_MPS: float = 70.0
+    PATH_FILTER_KALMAN_ENABLED: bool = False
+    PATH_FILTER_KALMAN_PROCESS_NOISE_MPS: float = 3.0
+    
+    # Path WebSocket ingest (buffered frames are flushed in one batch)
+    PATH_WS_FLUSH_INTERVAL_SECONDS: float = 5.0
+    PATH_WS_FLUSH_MAX_POINTS: int = 500
+    PATH_FOLLOW_KEEPALIVE_SECONDS: float = 15.0
+    
+    # Frequent Routes
+    ROUTE_GEOHASH_PRECISION: int = 7
+    ROUTE_SAMPLE_SPACING_METERS: float = 50.0
+    ROUTE_MATCH_MIN_SIMILARITY: float = 0.6
+    ROUTE_MATCH_MAX_CANDIDATES: int = 20
+    ROUTE_ENDPOINT_RADIUS_METERS: float = 300.0
+    ROUTE_MIN_TRIPS: int = 3
+    ROUTE_INDEX_BATCH_SIZE: int = 500
+    
+    # Safe Corridors
+    SAFE_CORRIDOR_DEFAULT_BUFFER_METERS: float = 200.0
+    SAFE_CORRIDOR_MAX_PATHS: int = 5
+    SAFE_CORRIDOR_MIN_OUTSIDE_POINTS: int = 3
+    SAFE_CORRIDOR_ALERT_COOLDOWN_SECONDS: int = 900
+    
+    # Proximity Warnings (active emergency reports near live paths)
+    PROXIMITY_WARNING_RADIUS_METERS: float = 500.0
+    PROXIMITY_REPORT_MAX_AGE_HOURS: int = 12
+    PROXIMITY_INDEX_REFRESH_SECONDS: float = 300.0
+    
+    # Vector Tiles
+    TILE_MAX_ZOOM: int = 22
+    TILE_CACHE_MAX_ZOOM: int = 16
+    TILE_CACHE_TTL: int = 3600
+    # Above this many tiles per batch, all of the user's path tiles are dropped
+    TILE_INVALIDATE_MAX_TILES: int = 4096
+    TILE_REPORT_GRID_SIZE: int = 64
+    TILE_REPORT_WINDOW_DAYS: int = 90
+    
+    # Partitioning & Retention (months, 0 keeps partitions forever)
+    PARTITION_PREMAKE_MONTHS: int = 3
+    PATH_POINTS_RETENTION_MONTHS: int = 0
+    LOCATION_TRACKING_RETENTION_MONTHS: int = 12
+    PARTITION_ARCHIVE_SCHEMA: str = "archive"
     
     # Emergency
     EMERGENCY_SERVICES_PHONE: str = "991,907,939"
@@ -15,6 +15,36 @@ from app.models.user import User
 security = HTTPBearer()
 
 
+def get_user_from_token(db: Session, token: str) -> Optional[User]:
+    """
+    Resolve an access token to an active user
+
+    Used where no Authorization header is available, e.g. WebSocket
+    handshakes that pass the token as a query parameter.
+
+    Args:
+        db: Database session
+        token: JWT access token
+
+    Returns:
+        Active user, or None if the token or user is not valid
+    """
+    user_id = verify_token(token)
+    if user_id is None:
+        return None
+
+    try:
+        user_uuid = uuid.UUID(user_id)
+    except ValueError:
+        return None
+
+    user = db.query(User).filter(User.id == user_uuid).first()
+    if user is None or not user.is_active:
+        return None
+
+    return user
+
+
 async def get_current_user(
     credentials: HTTPAuthorizationCredentials = Depends(security),
     db: Session = Depends(get_db)
@@ -0,0 +1,125 @@
+"""
+Redis pub/sub fan-out for live updates
+
+Each worker process keeps a single Redis pub/sub connection and hands
+messages to local asyncio subscribers, so any number of connected clients
+watching the same channel costs one Redis subscription per worker.
+Publishers write to Redis once (see RedisClient.publish); every worker
+subscribed to the channel receives the message.
+"""
+import asyncio
+import logging
+from contextlib import asynccontextmanager
+from typing import AsyncIterator, Dict, Optional, Set
+
+import redis
+import redis.asyncio
+
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+
+class PubSubHub:
+    """Per-worker Redis pub/sub connection shared by asyncio subscribers"""
+
+    def __init__(self, url: str, queue_size: int):
+        self.url = url
+        self.queue_size = queue_size
+        self._client: Optional[redis.asyncio.Redis] = None
+        self._pubsub = None
+        self._reader: Optional[asyncio.Task] = None
+        self._subscribers: Dict[str, Set[asyncio.Queue]] = {}
+        self._lock = asyncio.Lock()
+
+    @asynccontextmanager
+    async def subscribe(self, *channels: str) -> AsyncIterator[asyncio.Queue]:
+        """
+        Subscribe to channels for the lifetime of the context
+
+        The queue yields (channel, data) tuples. A None item means the
+        subscriber fell more than queue_size messages behind and missed
+        some; it should resynchronize from the database.
+
+        Args:
+            channels: Channel names
+
+        Yields:
+            Queue of received messages
+        """
+        queue: asyncio.Queue = asyncio.Queue(maxsize=self.queue_size)
+
+        async with self._lock:
+            if self._pubsub is None:
+                self._client = redis.asyncio.from_url(self.url, decode_responses=True, encoding="utf-8")
+                self._pubsub = self._client.pubsub(ignore_subscribe_messages=True)
+
+            new_channels = [channel for channel in channels if channel not in self._subscribers]
+            for channel in channels:
+                self._subscribers.setdefault(channel, set()).add(queue)
+            if new_channels:
+                await self._pubsub.subscribe(*new_channels)
+
+            if self._reader is None or self._reader.done():
+                self._reader = asyncio.create_task(self._read())
+
+        try:
+            yield queue
+        finally:
+            async with self._lock:
+                idle_channels = []
+                for channel in channels:
+                    queues = self._subscribers.get(channel)
+                    if queues is None:
+                        continue
+                    queues.discard(queue)
+                    if not queues:
+                        del self._subscribers[channel]
+                        idle_channels.append(channel)
+
+                if idle_channels:
+                    try:
+                        await self._pubsub.unsubscribe(*idle_channels)
+                    except redis.RedisError as e:
+                        logger.warning(f"Pub/sub unsubscribe failed: {e}")
+
+    async def _read(self) -> None:
+        """Dispatch messages to local subscribers while any are left"""
+        while self._subscribers:
+            try:
+                message = await self._pubsub.get_message(timeout=1.0)
+            except redis.RedisError as e:
+                logger.warning(f"Pub/sub connection error: {e}")
+                await asyncio.sleep(1.0)
+                continue
+
+            if message is None or message["type"] != "message":
+                continue
+
+            channel = message["channel"]
+            for queue in list(self._subscribers.get(channel, ())):
+                self._deliver(queue, (channel, message["data"]))
+
+    @staticmethod
+    def _deliver(queue: asyncio.Queue, item) -> None:
+        """Queue a message, replacing the backlog with a lag marker when full"""
+        if queue.full():
+            while not queue.empty():
+                queue.get_nowait()
+            queue.put_nowait(None)
+            return
+        queue.put_nowait(item)
+
+    async def close(self) -> None:
+        """Stop the reader and close the Redis connection"""
+        if self._reader is not None:
+            self._reader.cancel()
+        if self._pubsub is not None:
+            await self._pubsub.aclose()
+        if self._client is not None:
+            await self._client.aclose()
+        self._reader = self._pubsub = self._client = None
+
+
+# Per-worker hub instance
+pubsub_hub = PubSubHub(settings.REDIS_URL, settings.PUBSUB_QUEUE_SIZE)
@@ -16,6 +16,8 @@ class RedisClient:
             decode_responses=True,
             encoding="utf-8",
         )
+        # Separate client for binary payloads such as vector tiles
+        self.binary_client = redis.from_url(settings.REDIS_URL)
     
     def get(self, key: str) -> Optional[Any]:
         """Get value from Redis"""
@@ -27,6 +29,21 @@ class RedisClient:
                 return value
         return None
     
+    def get_raw(self, key: str) -> Optional[str]:
+        """Get value from Redis without JSON decoding"""
+        return self.client.get(key)
+    
+    def get_bytes(self, key: str) -> Optional[bytes]:
+        """Get binary value from Redis"""
+        return self.binary_client.get(key)
+    
+    def set_bytes(self, key: str, value: bytes, ttl: Optional[int] = None) -> bool:
+        """Set binary value in Redis"""
+        if ttl is None:
+            ttl = settings.REDIS_CACHE_TTL
+        
+        return self.binary_client.setex(key, ttl, value)
+    
     def set(self, key: str, value: Any, ttl: Optional[int] = None) -> bool:
         """Set value in Redis"""
         if ttl is None:
@@ -52,6 +69,13 @@ class RedisClient:
     def expire(self, key: str, ttl: int) -> bool:
         """Set expiration on key"""
         return self.client.expire(key, ttl)
+    
+    def publish(self, channel: str, message: Any) -> int:
+        """Publish message to a pub/sub channel"""
+        if isinstance(message, (dict, list)):
+            message = json.dumps(message)
+        
+        return self.client.publish(channel, message)
 
 
 # Global Redis client instance
@@ -6,6 +6,7 @@ from typing import Optional, Any
 from jose import jwt, JWTError
 from passlib.context import CryptContext
 import hashlib
+import hmac
 import secrets
 from cryptography.fernet import Fernet
 import base64
@@ -121,7 +122,38 @@ def verify_keyword(plain_keyword: str, hashed_keyword: str) -> bool:
     Returns:
         True if keyword matches, False otherwise
     """
-    return hash_keyword(plain_keyword) == hashed_keyword
+    return hmac.compare_digest(hash_keyword(plain_keyword), hashed_keyword)
+
+
+def keyword_hmac(keyword: str) -> str:
+    """
+    Keyed HMAC-SHA256 of a trigger keyword
+    
+    Whitespace is normalized so a keyword typed into an SMS matches the
+    one set up in the app.
+    
+    Args:
+        keyword: Plain text keyword
+    
+    Returns:
+        Hex digest
+    """
+    normalized = " ".join(keyword.split())
+    return hmac.new(settings.TRIGGER_KEYWORD_HMAC_KEY.encode(), normalized.encode(), hashlib.sha256).hexdigest()
+
+
+def verify_keyword_hmac(plain_keyword: str, keyword_digest: str) -> bool:
+    """
+    Verify keyword against its HMAC in constant time
+    
+    Args:
+        plain_keyword: Plain text keyword
+        keyword_digest: Stored HMAC digest
+    
+    Returns:
+        True if keyword matches, False otherwise
+    """
+    return hmac.compare_digest(keyword_hmac(plain_keyword), keyword_digest)
 
 
 def generate_share_token() -> str:
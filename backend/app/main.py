@@ -13,7 +13,11 @@ import logging
 from app.core.config import settings
 from app.core.logger import setup_logging
 from app.api.v1.api import api_router
-from app.core.database import engine, Base
+from app.core.database import engine, Base, SessionLocal
+from app.core.pubsub import pubsub_hub
+from app.services.incident_index import incident_index
+from app.services.location_buffer import location_flusher
+from app.services.partitions import ensure_partitions
 
 # Setup logging
 setup_logging()
@@ -112,6 +116,17 @@ async def startup_event():
     if settings.DEBUG:
         logger.info("Creating database tables...")
         Base.metadata.create_all(bind=engine)
+        
+        # Point tables are partitioned by month; beat keeps this current
+        with SessionLocal() as db:
+            ensure_partitions(db)
+            db.commit()
+    
+    # Active emergency reports for proximity warnings at path ingest
+    incident_index.start()
+    
+    # Write-behind anti-theft locations; each worker is one stream consumer
+    location_flusher.start()
     
     logger.info("Application started successfully")
 
@@ -121,6 +136,9 @@ async def startup_event():
 async def shutdown_event():
     """Cleanup on shutdown"""
     logger.info("Shutting down application...")
+    await incident_index.stop()
+    await location_flusher.stop()
+    await pubsub_hub.close()
 
 
 # Health check endpoints
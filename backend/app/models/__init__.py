@@ -4,7 +4,7 @@ Database models
 from app.models.user import User
 from app.models.emergency_contact import EmergencyContact
 from app.models.anti_theft import AntiTheftConfig, AntiTheftEvent, LocationTracking, MediaRecording
-from app.models.path import Path, PathPoint, SharedPath
+from app.models.path import Path, PathPoint, SharedPath, PathSimplification, PathSegment, PathTripSegment, FrequentRoute, RouteCell, SafeCorridor
 from app.models.emergency import EmergencyReport, EmergencyReportMedia
 
 __all__ = [
@@ -17,6 +17,12 @@ __all__ = [
     "Path",
     "PathPoint",
     "SharedPath",
+    "PathSimplification",
+    "PathSegment",
+    "PathTripSegment",
+    "FrequentRoute",
+    "RouteCell",
+    "SafeCorridor",
     "EmergencyReport",
     "EmergencyReportMedia",
 ]
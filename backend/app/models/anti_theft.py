@@ -1,7 +1,7 @@
 """
 Anti-theft related models
 """
-from sqlalchemy import Column, String, Integer, Boolean, DateTime, Float, ForeignKey, BigInteger
+from sqlalchemy import Column, String, Integer, Boolean, DateTime, Float, ForeignKey, BigInteger, UniqueConstraint
 from sqlalchemy.dialects.postgresql import UUID
 from sqlalchemy.orm import relationship
 from geoalchemy2 import Geography
@@ -18,7 +18,9 @@ class AntiTheftConfig(Base):
     
     id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
     user_id = Column(UUID(as_uuid=True), ForeignKey("users.id", ondelete="CASCADE"), unique=True, nullable=False)
-    trigger_keyword_hash = Column(String(255), nullable=False)
+    # Legacy unkeyed SHA-256, replaced by the HMAC on first use
+    trigger_keyword_hash = Column(String(255))
+    trigger_keyword_hmac = Column(String(64))
     is_enabled = Column(Boolean, default=True)
     enable_gps_tracking = Column(Boolean, default=True)
     enable_audio_recording = Column(Boolean, default=True)
@@ -62,15 +64,23 @@ class LocationTracking(Base):
     """Location tracking model for anti-theft events"""
     
     __tablename__ = "location_tracking"
-    
+    __table_args__ = (
+        # One fix per event and instant lets the write-behind flusher
+        # replay a batch safely (see app.services.location_buffer)
+        UniqueConstraint("event_id", "timestamp", name="uq_location_tracking_event_id_timestamp"),
+        # Monthly partitions, see app.services.partitions
+        {"postgresql_partition_by": "RANGE (timestamp)"},
+    )
+    
+    # The partition key has to be part of the primary key
     id = Column(BigInteger, primary_key=True, autoincrement=True)
-    event_id = Column(UUID(as_uuid=True), ForeignKey("anti_theft_events.id", ondelete="CASCADE"), nullable=False, index=True)
+    event_id = Column(UUID(as_uuid=True), ForeignKey("anti_theft_events.id", ondelete="CASCADE"), nullable=False)
     location = Column(Geography(geometry_type="POINT", srid=4326), nullable=False)
     accuracy = Column(Float)
     altitude = Column(Float)
     speed = Column(Float)
     heading = Column(Float)
-    timestamp = Column(DateTime, default=datetime.utcnow, index=True)
+    timestamp = Column(DateTime, primary_key=True, default=datetime.utcnow)
     battery_level = Column(Integer)
     
     # Relationships
@@ -1,10 +1,10 @@
 """
 Path tracking models
 """
-from sqlalchemy import Column, String, Boolean, DateTime, Float, ForeignKey, BigInteger
-from sqlalchemy.dialects.postgresql import UUID
+from sqlalchemy import Column, String, Boolean, DateTime, Float, ForeignKey, BigInteger, Integer, UniqueConstraint, Index, LargeBinary
+from sqlalchemy.dialects.postgresql import UUID, ARRAY, JSONB
 from sqlalchemy.orm import relationship
-from geoalchemy2 import Geography
+from geoalchemy2 import Geography, Geometry
 from datetime import datetime
 import uuid
 
@@ -26,12 +26,49 @@ class Path(Base):
     is_active = Column(Boolean, default=False)
     total_distance_meters = Column(Float)
     average_speed_mps = Column(Float)
+    
+    # Running aggregates maintained at ingest time
+    point_count = Column(Integer, default=0)
+    first_point_time = Column(DateTime)
+    last_point_time = Column(DateTime)
+    last_latitude = Column(Float)
+    last_longitude = Column(Float)
+    min_latitude = Column(Float)
+    min_longitude = Column(Float)
+    max_latitude = Column(Float)
+    max_longitude = Column(Float)
+    max_speed_mps = Column(Float)
+    
+    # Points before this were thinned to keep the path under its point
+    # budget (see app.services.path_limits); later uploads there are refused
+    thinned_until = Column(DateTime)
+    
+    # Finest simplification of a stopped path, drawn in map tiles
+    route = Column(Geography(geometry_type="LINESTRING", srid=4326))
+    
+    # Set once the points have been moved into a compressed PathSegment
+    archived_at = Column(DateTime)
+    
+    # Open stay/leg of the incremental trip segmentation (see
+    # app.services.trip_segments); cleared when the path is stopped
+    trip_state = Column(JSONB)
+    
+    # Corridor the path is expected to stay within (deviation alerts)
+    safe_corridor_id = Column(UUID(as_uuid=True), ForeignKey("safe_corridors.id", ondelete="SET NULL"))
+    
+    # Set by the frequent-route indexing job
+    route_id = Column(UUID(as_uuid=True), ForeignKey("frequent_routes.id", ondelete="SET NULL"), index=True)
     created_at = Column(DateTime, default=datetime.utcnow)
     
     # Relationships
     user = relationship("User", back_populates="paths")
     points = relationship("PathPoint", back_populates="path", cascade="all, delete-orphan", order_by="PathPoint.timestamp")
     shared_with = relationship("SharedPath", back_populates="path", cascade="all, delete-orphan")
+    simplifications = relationship("PathSimplification", back_populates="path", cascade="all, delete-orphan")
+    segment = relationship("PathSegment", back_populates="path", uselist=False, cascade="all, delete-orphan")
+    frequent_route = relationship("FrequentRoute", back_populates="paths")
+    safe_corridor = relationship("SafeCorridor")
+    trip_segments = relationship("PathTripSegment", back_populates="path", cascade="all, delete-orphan", order_by="PathTripSegment.start_time")
     
     def __repr__(self):
         return f"<Path id={self.id} name={self.name}>"
@@ -41,15 +78,24 @@ class PathPoint(Base):
     """Path point model"""
     
     __tablename__ = "path_points"
+    __table_args__ = (
+        # One fix per path and instant makes retried uploads idempotent; the
+        # backing index serves per-path ordered scans, time windows and
+        # keyset pagination
+        UniqueConstraint("path_id", "timestamp", name="uq_path_points_path_id_timestamp"),
+        # Monthly partitions, see app.services.partitions
+        {"postgresql_partition_by": "RANGE (timestamp)"},
+    )
     
+    # The partition key has to be part of the primary key
     id = Column(BigInteger, primary_key=True, autoincrement=True)
-    path_id = Column(UUID(as_uuid=True), ForeignKey("paths.id", ondelete="CASCADE"), nullable=False, index=True)
+    path_id = Column(UUID(as_uuid=True), ForeignKey("paths.id", ondelete="CASCADE"), nullable=False)
     location = Column(Geography(geometry_type="POINT", srid=4326), nullable=False)
     accuracy = Column(Float)
     altitude = Column(Float)
     speed = Column(Float)
     heading = Column(Float)
-    timestamp = Column(DateTime, nullable=False, index=True)
+    timestamp = Column(DateTime, primary_key=True)
     
     # Relationships
     path = relationship("Path", back_populates="points")
@@ -77,3 +123,148 @@ class SharedPath(Base):
     def __repr__(self):
         return f"<SharedPath path_id={self.path_id} token={self.share_token}>"
 
+
+class PathSimplification(Base):
+    """Precomputed simplified version of a completed path"""
+    
+    __tablename__ = "path_simplifications"
+    __table_args__ = (
+        UniqueConstraint("path_id", "tolerance_meters", name="uq_path_simplifications_path_tolerance"),
+    )
+    
+    id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
+    path_id = Column(UUID(as_uuid=True), ForeignKey("paths.id", ondelete="CASCADE"), nullable=False, index=True)
+    tolerance_meters = Column(Float, nullable=False)
+    point_count = Column(Integer, nullable=False)
+    point_ids = Column(ARRAY(BigInteger), nullable=False)
+    created_at = Column(DateTime, default=datetime.utcnow)
+    
+    # Relationships
+    path = relationship("Path", back_populates="simplifications")
+    
+    def __repr__(self):
+        return f"<PathSimplification path_id={self.path_id} tolerance={self.tolerance_meters}>"
+
+
+class PathSegment(Base):
+    """Compressed point storage for a completed path"""
+    
+    __tablename__ = "path_segments"
+    
+    path_id = Column(UUID(as_uuid=True), ForeignKey("paths.id", ondelete="CASCADE"), primary_key=True)
+    encoding = Column(String(30), nullable=False)
+    point_count = Column(Integer, nullable=False)
+    start_time = Column(DateTime)
+    end_time = Column(DateTime)
+    size_bytes = Column(Integer)
+    data = Column(LargeBinary, nullable=False)
+    created_at = Column(DateTime, default=datetime.utcnow)
+    
+    # Relationships
+    path = relationship("Path", back_populates="segment")
+    
+    def __repr__(self):
+        return f"<PathSegment path_id={self.path_id} points={self.point_count}>"
+
+
+class PathTripSegment(Base):
+    """Stay or movement leg of a path, detected during ingest"""
+    
+    __tablename__ = "path_trip_segments"
+    __table_args__ = (
+        Index("ix_path_trip_segments_path_id_start_time", "path_id", "start_time"),
+    )
+    
+    id = Column(BigInteger, primary_key=True, autoincrement=True)
+    path_id = Column(UUID(as_uuid=True), ForeignKey("paths.id", ondelete="CASCADE"), nullable=False)
+    kind = Column(String(10), nullable=False)  # stay, move
+    start_time = Column(DateTime, nullable=False)
+    end_time = Column(DateTime, nullable=False)
+    # A stay starts and ends at its centroid
+    start_latitude = Column(Float, nullable=False)
+    start_longitude = Column(Float, nullable=False)
+    end_latitude = Column(Float, nullable=False)
+    end_longitude = Column(Float, nullable=False)
+    distance_meters = Column(Float)
+    point_count = Column(Integer)
+    created_at = Column(DateTime, default=datetime.utcnow)
+    
+    # Relationships
+    path = relationship("Path", back_populates="trip_segments")
+    
+    def __repr__(self):
+        return f"<PathTripSegment path_id={self.path_id} kind={self.kind} start={self.start_time}>"
+
+
+class FrequentRoute(Base):
+    """Cluster of a user's paths that follow the same route"""
+    
+    __tablename__ = "frequent_routes"
+    
+    id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
+    user_id = Column(UUID(as_uuid=True), ForeignKey("users.id", ondelete="CASCADE"), nullable=False, index=True)
+    
+    # Geohash cells of the first path, the route's representative
+    cells = Column(ARRAY(String), nullable=False)
+    cell_count = Column(Integer, nullable=False)
+    start_latitude = Column(Float, nullable=False)
+    start_longitude = Column(Float, nullable=False)
+    end_latitude = Column(Float, nullable=False)
+    end_longitude = Column(Float, nullable=False)
+    
+    # Travel statistics over the member paths, kept as running sums
+    path_count = Column(Integer, default=0, nullable=False)
+    duration_sum_seconds = Column(Float, default=0.0, nullable=False)
+    duration_sum_squares = Column(Float, default=0.0, nullable=False)
+    min_duration_seconds = Column(Float)
+    max_duration_seconds = Column(Float)
+    distance_sum_meters = Column(Float, default=0.0, nullable=False)
+    last_traveled_at = Column(DateTime)
+    created_at = Column(DateTime, default=datetime.utcnow)
+    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+    
+    # Relationships
+    paths = relationship("Path", back_populates="frequent_route")
+    route_cells = relationship("RouteCell", back_populates="route", cascade="all, delete-orphan")
+    
+    def __repr__(self):
+        return f"<FrequentRoute id={self.id} paths={self.path_count}>"
+
+
+class RouteCell(Base):
+    """Inverted index from geohash cell to the frequent routes crossing it"""
+    
+    __tablename__ = "route_cells"
+    __table_args__ = (
+        # Candidate lookup: one user's routes sharing any of a set of cells
+        Index("ix_route_cells_user_id_cell", "user_id", "cell"),
+    )
+    
+    route_id = Column(UUID(as_uuid=True), ForeignKey("frequent_routes.id", ondelete="CASCADE"), primary_key=True)
+    cell = Column(String(12), primary_key=True)
+    user_id = Column(UUID(as_uuid=True), nullable=False)
+    
+    # Relationships
+    route = relationship("FrequentRoute", back_populates="route_cells")
+    
+    def __repr__(self):
+        return f"<RouteCell route_id={self.route_id} cell={self.cell}>"
+
+
+class SafeCorridor(Base):
+    """Buffered area around a frequent route that the user marked as safe"""
+    
+    __tablename__ = "safe_corridors"
+    
+    id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
+    user_id = Column(UUID(as_uuid=True), ForeignKey("users.id", ondelete="CASCADE"), nullable=False, index=True)
+    route_id = Column(UUID(as_uuid=True), ForeignKey("frequent_routes.id", ondelete="SET NULL"), index=True)
+    name = Column(String(200))
+    buffer_meters = Column(Float, nullable=False)
+    # Geometry rather than geography so containment tests use prepared geometries
+    area = Column(Geometry(geometry_type="MULTIPOLYGON", srid=4326), nullable=False)
+    is_active = Column(Boolean, default=True)
+    created_at = Column(DateTime, default=datetime.utcnow)
+    
+    def __repr__(self):
+        return f"<SafeCorridor id={self.id} buffer={self.buffer_meters}>"
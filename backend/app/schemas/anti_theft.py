@@ -4,6 +4,7 @@ Anti-theft schemas
 from pydantic import BaseModel, validator
 from typing import Optional, List
 from datetime import datetime
+import math
 import uuid
 
 
@@ -72,6 +73,18 @@ class LocationPoint(BaseModel):
     heading: Optional[float] = None
     timestamp: datetime
     battery_level: Optional[int] = None
+    
+    @validator("latitude")
+    def validate_latitude(cls, v):
+        if not math.isfinite(v) or abs(v) > 90:
+            raise ValueError("Latitude must be between -90 and 90")
+        return v
+    
+    @validator("longitude")
+    def validate_longitude(cls, v):
+        if not math.isfinite(v) or abs(v) > 180:
+            raise ValueError("Longitude must be between -180 and 180")
+        return v
 
 
 class AntiTheftEventCreate(BaseModel):
@@ -112,6 +125,7 @@ class AntiTheftStatusResponse(BaseModel):
     """Anti-theft status response schema"""
     is_enabled: bool
     active_event: Optional[AntiTheftEventResponse] = None
+    latest_location: Optional[LocationPoint] = None
     location_history: List[LocationPoint] = []
     media_recordings: List[MediaRecordingResponse] = []
 
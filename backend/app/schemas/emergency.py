@@ -6,6 +6,8 @@ from typing import Optional, List
 from datetime import datetime
 import uuid
 
+from app.schemas.user import validate_phone_number
+
 
 class EmergencyReportCreate(BaseModel):
     """Emergency report creation schema"""
@@ -90,6 +92,8 @@ class EmergencyContactCreate(BaseModel):
     email: Optional[str] = None
     relationship_type: Optional[str] = None
     priority: int = 1
+    
+    _normalize_phone_number = validator("phone_number", allow_reuse=True)(validate_phone_number)
 
 
 class EmergencyContactUpdate(BaseModel):
@@ -100,6 +104,8 @@ class EmergencyContactUpdate(BaseModel):
     relationship_type: Optional[str] = None
     priority: Optional[int] = None
     is_active: Optional[bool] = None
+    
+    _normalize_phone_number = validator("phone_number", allow_reuse=True)(validate_phone_number)
 
 
 class EmergencyContactResponse(BaseModel):
@@ -1,9 +1,9 @@
 """
 Path tracking schemas
 """
-from pydantic import BaseModel
-from typing import Optional, List
-from datetime import datetime
+from pydantic import BaseModel, Field, validator
+from typing import Optional, List, Dict
+from datetime import datetime, timezone
 import uuid
 
 
@@ -16,6 +16,36 @@ class PathPointCreate(BaseModel):
     speed: Optional[float] = None
     heading: Optional[float] = None
     timestamp: datetime
+    
+    @validator("timestamp")
+    def normalize_timestamp(cls, v):
+        # Stored timestamps are naive UTC
+        if v.tzinfo is not None:
+            v = v.astimezone(timezone.utc).replace(tzinfo=None)
+        return v
+
+
+class ProximityWarning(BaseModel):
+    """Active emergency report near an ingested point"""
+    report_id: uuid.UUID
+    report_type: str
+    severity: Optional[str] = None
+    latitude: float
+    longitude: float
+    distance_meters: float
+
+
+class PathPointBatchResponse(BaseModel):
+    """Path point batch upload result"""
+    message: str
+    received: int
+    accepted: int
+    duplicates: int = 0
+    downsampled: int = 0
+    outside_corridor: int = 0
+    corridor_deviation: bool = False
+    filtered: Dict[str, int] = {}
+    warnings: List[ProximityWarning] = []
 
 
 class PathPointResponse(BaseModel):
@@ -30,11 +60,18 @@ class PathPointResponse(BaseModel):
     timestamp: datetime
 
 
+class PathPointPage(BaseModel):
+    """Keyset-paginated page of path points"""
+    points: List[PathPointResponse] = []
+    next_cursor: Optional[str] = None
+
+
 class PathCreate(BaseModel):
     """Path creation schema"""
     name: Optional[str] = None
     description: Optional[str] = None
     path_type: Optional[str] = "other"
+    safe_corridor_id: Optional[uuid.UUID] = None
 
 
 class PathUpdate(BaseModel):
@@ -55,6 +92,12 @@ class PathResponse(BaseModel):
     is_active: bool
     total_distance_meters: Optional[float] = None
     average_speed_mps: Optional[float] = None
+    point_count: Optional[int] = None
+    max_speed_mps: Optional[float] = None
+    min_latitude: Optional[float] = None
+    min_longitude: Optional[float] = None
+    max_latitude: Optional[float] = None
+    max_longitude: Optional[float] = None
     created_at: datetime
     
     class Config:
@@ -66,6 +109,57 @@ class PathDetailResponse(PathResponse):
     points: List[PathPointResponse] = []
 
 
+class PathTripSegmentResponse(BaseModel):
+    """Stay or movement leg of a path"""
+    kind: str
+    start_time: datetime
+    end_time: datetime
+    start_latitude: float
+    start_longitude: float
+    end_latitude: float
+    end_longitude: float
+    distance_meters: Optional[float] = None
+    point_count: Optional[int] = None
+    
+    class Config:
+        from_attributes = True
+
+
+class FrequentRouteResponse(BaseModel):
+    """Frequent route with aggregated travel statistics"""
+    id: uuid.UUID
+    path_count: int
+    start_latitude: float
+    start_longitude: float
+    end_latitude: float
+    end_longitude: float
+    mean_duration_seconds: Optional[float] = None
+    stddev_duration_seconds: Optional[float] = None
+    min_duration_seconds: Optional[float] = None
+    max_duration_seconds: Optional[float] = None
+    mean_distance_meters: Optional[float] = None
+    last_traveled_at: Optional[datetime] = None
+
+
+class SafeCorridorCreate(BaseModel):
+    """Safe corridor creation schema"""
+    name: Optional[str] = None
+    buffer_meters: Optional[float] = Field(None, gt=0)
+
+
+class SafeCorridorResponse(BaseModel):
+    """Safe corridor response schema"""
+    id: uuid.UUID
+    route_id: Optional[uuid.UUID] = None
+    name: Optional[str] = None
+    buffer_meters: float
+    is_active: bool
+    created_at: datetime
+    
+    class Config:
+        from_attributes = True
+
+
 class PathShareCreate(BaseModel):
     """Path share creation schema"""
     shared_with_email: Optional[str] = None
@@ -7,6 +7,23 @@ from datetime import datetime
 import uuid
 
 
+def normalize_phone(phone: str) -> str:
+    """Strip spacing and punctuation from a phone number, keeping a leading +"""
+    phone = phone.strip()
+    digits = "".join(c for c in phone if c.isdigit())
+    return f"+{digits}" if phone.startswith("+") else digits
+
+
+def validate_phone_number(v: Optional[str]) -> Optional[str]:
+    """Store phone numbers normalized, so inbound SMS senders match them"""
+    if v is None:
+        return v
+    v = normalize_phone(v)
+    if not v.lstrip("+"):
+        raise ValueError("Phone number must contain digits")
+    return v
+
+
 class UserBase(BaseModel):
     """Base user schema"""
     email: EmailStr
@@ -14,6 +31,8 @@ class UserBase(BaseModel):
     first_name: Optional[str] = None
     last_name: Optional[str] = None
     preferred_language: str = "en"
+    
+    _normalize_phone_number = validator("phone_number", allow_reuse=True)(validate_phone_number)
 
 
 class UserCreate(UserBase):
@@ -33,6 +52,8 @@ class UserUpdate(BaseModel):
     last_name: Optional[str] = None
     preferred_language: Optional[str] = None
     phone_number: Optional[str] = None
+    
+    _normalize_phone_number = validator("phone_number", allow_reuse=True)(validate_phone_number)
 
 
 class UserResponse(UserBase):
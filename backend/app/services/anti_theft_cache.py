@@ -0,0 +1,218 @@
+"""
+Hot Redis cache of anti-theft status and event locations
+
+Watchers of a stolen device poll the status, which only needs the latest
+fix and a short history. Each active event keeps in Redis:
+
+* anti_theft:latest:{event_id}: hash with the latest fix; its presence also
+  marks the event's cache as warm
+* anti_theft:history:{event_id}: the ANTI_THEFT_LOCATION_HISTORY_SIZE most
+  recently received fixes, newest first
+* anti_theft:positions: GEO set with the latest position of every event
+
+All three are updated on ingest, before the fix reaches PostgreSQL through
+the write-behind buffer. The rest of the status (configuration, active
+event, media) is cached per user and dropped whenever it changes.
+"""
+import json
+import logging
+from datetime import timezone
+from typing import List, Optional
+import uuid
+
+import redis
+
+from app.core.config import settings
+from app.core.redis import redis_client
+from app.schemas.anti_theft import LocationPoint
+
+logger = logging.getLogger(__name__)
+
+LATEST_KEY = "anti_theft:latest:{event_id}"
+HISTORY_KEY = "anti_theft:history:{event_id}"
+POSITIONS_KEY = "anti_theft:positions"
+STATUS_KEY = "anti_theft:status:{user_id}"
+
+# Fixes can arrive out of order, so the latest fix and position only move
+# forward in time; the history keeps the order of arrival and is sorted
+# when read. ISO timestamps of naive UTC datetimes compare as strings.
+RECORD_LOCATION_SCRIPT = redis_client.client.register_script("""
+    redis.call('LPUSH', KEYS[2], ARGV[5])
+    redis.call('LTRIM', KEYS[2], 0, tonumber(ARGV[6]) - 1)
+    redis.call('EXPIRE', KEYS[2], ARGV[7])
+    local current = redis.call('HGET', KEYS[1], 'timestamp')
+    if current and current > ARGV[4] then
+        return 0
+    end
+    redis.call('HSET', KEYS[1], 'fix', ARGV[5], 'timestamp', ARGV[4])
+    redis.call('EXPIRE', KEYS[1], ARGV[7])
+    redis.call('GEOADD', KEYS[3], ARGV[2], ARGV[3], ARGV[1])
+    return 1
+""")
+
+
+def location_to_dict(location: LocationPoint) -> dict:
+    """Serialize a fix with a naive UTC timestamp"""
+    timestamp = location.timestamp
+    if timestamp.tzinfo is not None:
+        timestamp = timestamp.astimezone(timezone.utc).replace(tzinfo=None)
+
+    return {
+        "latitude": location.latitude,
+        "longitude": location.longitude,
+        "accuracy": location.accuracy,
+        "altitude": location.altitude,
+        "speed": location.speed,
+        "heading": location.heading,
+        "timestamp": timestamp.isoformat(),
+        "battery_level": location.battery_level,
+    }
+
+
+def record_location(event_id: str, fix: dict) -> None:
+    """
+    Update the latest fix, history and position of an event
+
+    Args:
+        event_id: Active event ID
+        fix: Received fix (see location_to_dict)
+    """
+    try:
+        RECORD_LOCATION_SCRIPT(
+            keys=[
+                LATEST_KEY.format(event_id=event_id),
+                HISTORY_KEY.format(event_id=event_id),
+                POSITIONS_KEY,
+            ],
+            args=[
+                str(event_id),
+                fix["longitude"],
+                fix["latitude"],
+                fix["timestamp"],
+                json.dumps(fix),
+                settings.ANTI_THEFT_LOCATION_HISTORY_SIZE,
+                settings.ANTI_THEFT_LOCATION_CACHE_TTL,
+            ]
+        )
+    except redis.RedisError as e:
+        logger.warning(f"Anti-theft location cache not updated: {e}")
+
+
+def get_location_history(event_id: str) -> Optional[List[dict]]:
+    """
+    Cached recent fixes of an event, newest first
+
+    Args:
+        event_id: Event ID
+
+    Returns:
+        Fixes, or None if the event is not cached yet
+    """
+    try:
+        pipe = redis_client.client.pipeline()
+        pipe.exists(LATEST_KEY.format(event_id=event_id))
+        pipe.lrange(HISTORY_KEY.format(event_id=event_id), 0, -1)
+        warm, history = pipe.execute()
+    except redis.RedisError as e:
+        logger.warning(f"Anti-theft location cache unavailable: {e}")
+        return None
+
+    if not warm:
+        return None
+
+    fixes = [json.loads(fix) for fix in history]
+    fixes.sort(key=lambda fix: fix["timestamp"], reverse=True)
+    return fixes
+
+
+def fill_location_history(event_id: str, fixes: List[dict]) -> None:
+    """
+    Warm the cache of an event from its stored fixes
+
+    Stored fixes go after any fix received meanwhile, which also keeps its
+    place as the latest one.
+
+    Args:
+        event_id: Event ID
+        fixes: Most recent stored fixes, newest first, with ISO timestamps
+    """
+    latest_key = LATEST_KEY.format(event_id=event_id)
+    history_key = HISTORY_KEY.format(event_id=event_id)
+    ttl = settings.ANTI_THEFT_LOCATION_CACHE_TTL
+
+    try:
+        pipe = redis_client.client.pipeline()
+        if fixes:
+            pipe.rpush(history_key, *[json.dumps(fix) for fix in fixes])
+            pipe.ltrim(history_key, 0, settings.ANTI_THEFT_LOCATION_HISTORY_SIZE - 1)
+            pipe.expire(history_key, ttl)
+            pipe.hsetnx(latest_key, "fix", json.dumps(fixes[0]))
+            pipe.hsetnx(latest_key, "timestamp", fixes[0]["timestamp"])
+            pipe.geoadd(POSITIONS_KEY, [fixes[0]["longitude"], fixes[0]["latitude"], str(event_id)], nx=True)
+        else:
+            # An empty timestamp marks the event as cached without a fix
+            pipe.hsetnx(latest_key, "timestamp", "")
+        pipe.expire(latest_key, ttl)
+        pipe.execute()
+    except redis.RedisError as e:
+        logger.warning(f"Anti-theft location cache not filled: {e}")
+
+
+def clear_event_locations(event_id: uuid.UUID) -> None:
+    """
+    Drop the cached locations of an event that is no longer active
+
+    Args:
+        event_id: Event ID
+    """
+    try:
+        pipe = redis_client.client.pipeline()
+        pipe.delete(LATEST_KEY.format(event_id=event_id), HISTORY_KEY.format(event_id=event_id))
+        pipe.zrem(POSITIONS_KEY, str(event_id))
+        pipe.execute()
+    except redis.RedisError as e:
+        logger.warning(f"Anti-theft location cache not cleared: {e}")
+
+
+def get_cached_status(user_id: uuid.UUID) -> Optional[dict]:
+    """
+    Cached configuration, active event and media of a user's status
+
+    Args:
+        user_id: User ID
+
+    Returns:
+        Status without locations, or None on a miss
+    """
+    try:
+        return redis_client.get(STATUS_KEY.format(user_id=user_id))
+    except redis.RedisError as e:
+        logger.warning(f"Anti-theft status cache unavailable: {e}")
+        return None
+
+
+def cache_status(user_id: uuid.UUID, status: dict) -> None:
+    """
+    Cache the status of a user, without locations
+
+    Args:
+        user_id: User ID
+        status: JSON-serializable status
+    """
+    try:
+        redis_client.set(STATUS_KEY.format(user_id=user_id), status, settings.ANTI_THEFT_STATUS_CACHE_TTL)
+    except redis.RedisError as e:
+        logger.warning(f"Anti-theft status cache unavailable: {e}")
+
+
+def invalidate_status(user_id: uuid.UUID) -> None:
+    """
+    Drop the cached status of a user after a configuration or event change
+
+    Args:
+        user_id: User ID
+    """
+    try:
+        redis_client.delete(STATUS_KEY.format(user_id=user_id))
+    except redis.RedisError as e:
+        logger.warning(f"Anti-theft status cache invalidation failed: {e}")
@@ -0,0 +1,121 @@
+"""
+Live anti-theft locations published to Redis pub/sub for watchers
+
+The owner of an active event and the verified users who are among the
+owner's active emergency contacts (matched by phone number or email) may
+watch it. Contacts are matched on contact details the watcher typed in, so
+an unverified account could otherwise claim anyone's number or address.
+Each received fix is published once; every worker fans it out to its
+connected watchers through the shared PubSubHub, forwarding the published
+text as is so a fix is serialized once however many watchers there are.
+"""
+import json
+import logging
+from typing import List
+import uuid
+
+import redis
+from sqlalchemy import func, or_
+from sqlalchemy.orm import Session
+
+from app.core.redis import redis_client
+from app.models.anti_theft import AntiTheftEvent
+from app.models.emergency_contact import EmergencyContact
+from app.models.user import User
+
+logger = logging.getLogger(__name__)
+
+EVENT_LOCATIONS_CHANNEL = "anti_theft_event:{event_id}"
+
+# Published as a fixed string so watchers can recognize it without parsing
+END_MESSAGE = json.dumps({"type": "end"})
+
+
+def event_channel(event_id: uuid.UUID) -> str:
+    """Pub/sub channel carrying live locations of one event"""
+    return EVENT_LOCATIONS_CHANNEL.format(event_id=event_id)
+
+
+def _publish(event_id: uuid.UUID, message: str) -> None:
+    """Publish to the event channel; watchers get the latest fixes on reconnect if this fails"""
+    try:
+        redis_client.publish(event_channel(event_id), message)
+    except redis.RedisError as e:
+        logger.warning(f"Live anti-theft update not published: {e}")
+
+
+def publish_event_location(event_id: uuid.UUID, fix: dict) -> None:
+    """
+    Publish a received fix to the event's watchers
+
+    Args:
+        event_id: Event ID
+        fix: Serialized fix (see location_to_dict)
+    """
+    _publish(event_id, json.dumps({"type": "location", "location": fix}, separators=(",", ":")))
+
+
+def publish_event_ended(event_id: uuid.UUID) -> None:
+    """
+    Tell watchers that the event was deactivated
+
+    Args:
+        event_id: Event ID
+    """
+    _publish(event_id, END_MESSAGE)
+
+
+def _contact_of(user: User):
+    """Filter on emergency contacts that designate the user"""
+    conditions = [EmergencyContact.phone_number == user.phone_number]
+    if user.email:
+        conditions.append(func.lower(EmergencyContact.email) == user.email.lower())
+
+    return (EmergencyContact.is_active == True) & or_(*conditions)
+
+
+def can_watch_event(db: Session, user: User, event: AntiTheftEvent) -> bool:
+    """
+    Whether a user may watch an event's live locations
+
+    Args:
+        db: Database session
+        user: Authenticated user
+        event: Anti-theft event
+
+    Returns:
+        True for the owner and the owner's active emergency contacts who
+        are verified users
+    """
+    if event.user_id == user.id:
+        return True
+
+    if not user.is_verified:
+        return False
+
+    return db.query(EmergencyContact.id).filter(
+        EmergencyContact.user_id == event.user_id,
+        _contact_of(user)
+    ).first() is not None
+
+
+def watchable_events(db: Session, user: User) -> List[AntiTheftEvent]:
+    """
+    Active events of the users who have this user as an emergency contact
+
+    Args:
+        db: Database session
+        user: Authenticated user
+
+    Returns:
+        Active events, most recent first (none for unverified users)
+    """
+    if not user.is_verified:
+        return []
+
+    owners = db.query(EmergencyContact.user_id).filter(_contact_of(user))
+
+    return db.query(AntiTheftEvent).filter(
+        AntiTheftEvent.user_id.in_(owners),
+        AntiTheftEvent.status == "active"
+    ).order_by(AntiTheftEvent.trigger_time.desc()).all()
@@ -0,0 +1,221 @@
+"""
+Frequent-route detection over completed paths
+
+Every stopped path with a stored route line is reduced to the set of
+geohash cells it crosses and matched against the user's existing routes
+through the route_cells inverted index: one indexed query returns, per
+candidate route, how many cells it shares with the path. A path joins the
+most similar route whose cell sets overlap enough (Jaccard similarity)
+and whose start and end are close to the path's; otherwise it founds a
+new route. Matching cost depends on the path's own cells, not on how many
+paths or routes are stored.
+"""
+import math
+from typing import List, Optional, Tuple
+
+from geoalchemy2.shape import to_shape
+from sqlalchemy import String, bindparam, text
+from sqlalchemy.dialects.postgresql import ARRAY
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.models.path import FrequentRoute, Path, RouteCell
+from app.services.geo import haversine_meters
+from app.services.geohash import path_cells
+
+CANDIDATE_ROUTES_SQL = text("""
+    SELECT route_id, count(*) AS shared
+    FROM route_cells
+    WHERE user_id = CAST(:user_id AS uuid)
+      AND cell = ANY(:cells)
+    GROUP BY route_id
+    ORDER BY shared DESC
+    LIMIT :limit
+""").bindparams(bindparam("cells", type_=ARRAY(String)))
+
+
+def _path_coordinates(path: Path) -> List[Tuple[float, float]]:
+    """(latitude, longitude) vertices of the stored route line"""
+    return [(lat, lon) for lon, lat in to_shape(path.route).coords]
+
+
+def _path_duration_seconds(path: Path) -> Optional[float]:
+    """Travel time of a path from its first to last point"""
+    start = path.first_point_time or path.start_time
+    end = path.last_point_time or path.end_time
+    if start is None or end is None:
+        return None
+    return max((end - start).total_seconds(), 0.0)
+
+
+def _endpoints_match(route: FrequentRoute, start: Tuple[float, float], end: Tuple[float, float]) -> bool:
+    """Whether a path starts and ends near the route's start and end"""
+    radius = settings.ROUTE_ENDPOINT_RADIUS_METERS
+    return (
+        haversine_meters(route.start_latitude, route.start_longitude, start[0], start[1]) <= radius
+        and haversine_meters(route.end_latitude, route.end_longitude, end[0], end[1]) <= radius
+    )
+
+
+def find_matching_route(
+    db: Session,
+    user_id,
+    cells: List[str],
+    start: Tuple[float, float],
+    end: Tuple[float, float]
+) -> Optional[FrequentRoute]:
+    """
+    Find the user's route that a path with these cells belongs to
+
+    Args:
+        db: Database session
+        user_id: Path owner
+        cells: Geohash cells of the path
+        start: (latitude, longitude) where the path starts
+        end: (latitude, longitude) where the path ends
+
+    Returns:
+        Most similar matching route, or None
+    """
+    candidates = db.execute(CANDIDATE_ROUTES_SQL, {
+        "user_id": str(user_id),
+        "cells": cells,
+        "limit": settings.ROUTE_MATCH_MAX_CANDIDATES,
+    }).all()
+    if not candidates:
+        return None
+
+    routes = {
+        route.id: route
+        for route in db.query(FrequentRoute).filter(
+            FrequentRoute.id.in_([route_id for route_id, _ in candidates])
+        )
+    }
+
+    best = None
+    best_similarity = settings.ROUTE_MATCH_MIN_SIMILARITY
+    for route_id, shared in candidates:
+        route = routes.get(route_id)
+        if route is None:
+            continue
+
+        similarity = shared / (len(cells) + route.cell_count - shared)
+        if similarity >= best_similarity and _endpoints_match(route, start, end):
+            best, best_similarity = route, similarity
+
+    return best
+
+
+def _add_path_to_route(route: FrequentRoute, path: Path) -> None:
+    """Fold a path's travel time and distance into the route statistics"""
+    route.path_count = (route.path_count or 0) + 1
+    route.distance_sum_meters = (route.distance_sum_meters or 0.0) + (path.total_distance_meters or 0.0)
+
+    duration = _path_duration_seconds(path)
+    if duration is not None:
+        route.duration_sum_seconds = (route.duration_sum_seconds or 0.0) + duration
+        route.duration_sum_squares = (route.duration_sum_squares or 0.0) + duration * duration
+        route.min_duration_seconds = duration if route.min_duration_seconds is None else min(route.min_duration_seconds, duration)
+        route.max_duration_seconds = duration if route.max_duration_seconds is None else max(route.max_duration_seconds, duration)
+
+    traveled_at = path.end_time or path.start_time
+    if route.last_traveled_at is None or traveled_at > route.last_traveled_at:
+        route.last_traveled_at = traveled_at
+
+    path.route_id = route.id
+
+
+def index_path(db: Session, path: Path) -> Optional[FrequentRoute]:
+    """
+    Assign a completed path to a frequent route, creating one if needed
+
+    Args:
+        db: Database session
+        path: Stopped path with a stored route line
+
+    Returns:
+        Route the path was assigned to, or None if it has no usable line
+    """
+    coordinates = _path_coordinates(path)
+    if len(coordinates) < 2:
+        return None
+
+    cells = path_cells(coordinates, settings.ROUTE_GEOHASH_PRECISION, settings.ROUTE_SAMPLE_SPACING_METERS)
+    start, end = coordinates[0], coordinates[-1]
+
+    route = find_matching_route(db, path.user_id, cells, start, end)
+
+    if route is None:
+        route = FrequentRoute(
+            user_id=path.user_id,
+            cells=cells,
+            cell_count=len(cells),
+            start_latitude=start[0],
+            start_longitude=start[1],
+            end_latitude=end[0],
+            end_longitude=end[1],
+            path_count=0,
+            duration_sum_seconds=0.0,
+            duration_sum_squares=0.0,
+            distance_sum_meters=0.0,
+        )
+        db.add(route)
+        db.flush()
+        db.add_all([RouteCell(route_id=route.id, cell=cell, user_id=path.user_id) for cell in cells])
+
+    _add_path_to_route(route, path)
+    # Later paths of the same batch must see this route
+    db.flush()
+    return route
+
+
+def index_completed_paths(db: Session, limit: int) -> int:
+    """
+    Index stopped paths that have not been assigned to a route yet
+
+    Rows are locked with SKIP LOCKED so several workers can share the
+    backlog.
+
+    Args:
+        db: Database session
+        limit: Maximum number of paths to index
+
+    Returns:
+        Number of paths assigned to a route
+    """
+    paths = db.query(Path).filter(
+        Path.is_active.is_(False),
+        Path.route_id.is_(None),
+        Path.route.isnot(None)
+    ).order_by(Path.end_time).limit(limit).with_for_update(skip_locked=True).all()
+
+    indexed = 0
+    for path in paths:
+        if index_path(db, path) is not None:
+            indexed += 1
+
+    return indexed
+
+
+def route_statistics(route: FrequentRoute) -> dict:
+    """
+    Aggregated travel statistics of a route
+
+    Args:
+        route: Frequent route
+
+    Returns:
+        Mean and standard deviation of travel time, and mean distance
+    """
+    count = route.path_count or 0
+    if not count:
+        return {"mean_duration_seconds": None, "stddev_duration_seconds": None, "mean_distance_meters": None}
+
+    mean = route.duration_sum_seconds / count
+    variance = max(route.duration_sum_squares / count - mean * mean, 0.0)
+
+    return {
+        "mean_duration_seconds": mean,
+        "stddev_duration_seconds": math.sqrt(variance),
+        "mean_distance_meters": route.distance_sum_meters / count,
+    }
@@ -0,0 +1,95 @@
+"""
+Geohash encoding and path cell sequences
+"""
+from typing import List, Sequence, Tuple
+import math
+
+from app.services.geo import haversine_meters
+
+BASE32 = "0123456789bcdefghjkmnpqrstuvwxyz"
+
+
+def encode_geohash(latitude: float, longitude: float, precision: int) -> str:
+    """
+    Encode a coordinate as a geohash
+
+    Args:
+        latitude: Latitude
+        longitude: Longitude
+        precision: Number of characters (7 is about 150 x 150 meters)
+
+    Returns:
+        Geohash string
+    """
+    lat_low, lat_high = -90.0, 90.0
+    lon_low, lon_high = -180.0, 180.0
+    chars = []
+    bits = bit_count = 0
+    even = True
+
+    while len(chars) < precision:
+        # Bits alternate between longitude and latitude, longitude first
+        if even:
+            middle = (lon_low + lon_high) / 2
+            if longitude >= middle:
+                bits = bits * 2 + 1
+                lon_low = middle
+            else:
+                bits *= 2
+                lon_high = middle
+        else:
+            middle = (lat_low + lat_high) / 2
+            if latitude >= middle:
+                bits = bits * 2 + 1
+                lat_low = middle
+            else:
+                bits *= 2
+                lat_high = middle
+
+        even = not even
+        bit_count += 1
+        if bit_count == 5:
+            chars.append(BASE32[bits])
+            bits = bit_count = 0
+
+    return "".join(chars)
+
+
+def path_cells(coordinates: Sequence[Tuple[float, float]], precision: int, spacing_meters: float) -> List[str]:
+    """
+    Cells crossed by a path, in the order they are first entered
+
+    Segments are sampled every spacing_meters so long straight segments of
+    a simplified line still yield every cell they cross.
+
+    Args:
+        coordinates: (latitude, longitude) pairs in travel order
+        precision: Geohash precision
+        spacing_meters: Sampling distance along segments
+
+    Returns:
+        Distinct geohash cells
+    """
+    cells = []
+    seen = set()
+
+    def visit(latitude: float, longitude: float) -> None:
+        cell = encode_geohash(latitude, longitude, precision)
+        if cell not in seen:
+            seen.add(cell)
+            cells.append(cell)
+
+    for i, (latitude, longitude) in enumerate(coordinates):
+        if i > 0:
+            previous_lat, previous_lon = coordinates[i - 1]
+            distance = haversine_meters(previous_lat, previous_lon, latitude, longitude)
+            steps = int(math.ceil(distance / spacing_meters))
+            for step in range(1, steps):
+                fraction = step / steps
+                visit(
+                    previous_lat + (latitude - previous_lat) * fraction,
+                    previous_lon + (longitude - previous_lon) * fraction
+                )
+        visit(latitude, longitude)
+
+    return cells
@@ -0,0 +1,283 @@
+"""
+In-memory spatial index of active emergency reports for proximity warnings
+
+Every API worker keeps the active reports in a uniform grid whose cells
+are PROXIMITY_WARNING_RADIUS_METERS tall, so the reports within the radius
+of a point are found by looking at its own and neighbouring cells without
+touching the database. The index is loaded once at startup and kept in
+sync through Redis pub/sub: report writes publish the change once and
+every worker applies it. A full reload from the database recovers from
+missed messages (lagging subscriber, Redis outage) and runs periodically.
+"""
+import asyncio
+import json
+import logging
+import math
+from datetime import datetime, timedelta
+from typing import Dict, List, Optional, Tuple
+import uuid
+
+import redis
+from sqlalchemy import text
+
+from app.core.config import settings
+from app.core.database import SessionLocal
+from app.core.pubsub import pubsub_hub
+from app.core.redis import redis_client
+from app.schemas.path import PathPointCreate
+from app.services.geo import haversine_meters
+
+logger = logging.getLogger(__name__)
+
+ACTIVE_REPORTS_CHANNEL = "emergency_reports:active"
+ACTIVE_REPORT_STATUSES = ("pending", "acknowledged", "responding")
+
+# Length of one degree of latitude in meters
+METERS_PER_DEGREE = 111320.0
+
+ACTIVE_REPORTS_SQL = text("""
+    SELECT id, report_type, severity,
+           ST_Y(location::geometry) AS latitude,
+           ST_X(location::geometry) AS longitude,
+           reported_at
+    FROM emergency_reports
+    WHERE status = ANY(:statuses)
+      AND reported_at >= :since
+""")
+
+Cell = Tuple[int, int]
+
+
+class IncidentIndex:
+    """Grid index of the active emergency reports of this worker"""
+
+    def __init__(self, radius_meters: float):
+        self.radius_meters = radius_meters
+        self.cell_degrees = radius_meters / METERS_PER_DEGREE
+        # Cells are replaced, never mutated, so lookups from threadpool
+        # workers never see a cell change while iterating it
+        self._cells: Dict[Cell, Dict[str, dict]] = {}
+        self._report_cells: Dict[str, Cell] = {}
+        self._task: Optional[asyncio.Task] = None
+
+    def _cell(self, latitude: float, longitude: float) -> Cell:
+        return math.floor(latitude / self.cell_degrees), math.floor(longitude / self.cell_degrees)
+
+    def _remove(self, report_id: str) -> None:
+        cell = self._report_cells.pop(report_id, None)
+        if cell is None:
+            return
+        reports = dict(self._cells.get(cell, {}))
+        reports.pop(report_id, None)
+        if reports:
+            self._cells[cell] = reports
+        else:
+            self._cells.pop(cell, None)
+
+    def apply(self, change: dict) -> None:
+        """
+        Apply a published report change
+
+        Args:
+            change: Report message from publish_report_change
+        """
+        report_id = change["id"]
+        self._remove(report_id)
+        if not change["active"]:
+            return
+
+        cell = self._cell(change["latitude"], change["longitude"])
+        reports = dict(self._cells.get(cell, {}))
+        reports[report_id] = change
+        self._cells[cell] = reports
+        self._report_cells[report_id] = cell
+
+    def replace(self, reports: List[dict]) -> None:
+        """
+        Swap in a freshly loaded set of active reports
+
+        Args:
+            reports: Report messages
+        """
+        cells: Dict[Cell, Dict[str, dict]] = {}
+        report_cells: Dict[str, Cell] = {}
+        for report in reports:
+            cell = self._cell(report["latitude"], report["longitude"])
+            cells.setdefault(cell, {})[report["id"]] = report
+            report_cells[report["id"]] = cell
+
+        self._cells, self._report_cells = cells, report_cells
+
+    def nearby(self, latitude: float, longitude: float, since: datetime) -> List[Tuple[dict, float]]:
+        """
+        Active reports within the warning radius of a point
+
+        Args:
+            latitude: Point latitude
+            longitude: Point longitude
+            since: Ignore reports older than this
+
+        Returns:
+            List of (report, distance in meters)
+        """
+        row, column = self._cell(latitude, longitude)
+        # Cells are square in degrees, so they narrow in meters away from
+        # the equator and more columns are needed to cover the radius
+        cos_lat = max(math.cos(math.radians(latitude)), 0.01)
+        columns = math.ceil(1 / cos_lat)
+
+        found = []
+        cells = self._cells
+        for r in range(row - 1, row + 2):
+            for c in range(column - columns, column + columns + 1):
+                for report in cells.get((r, c), {}).values():
+                    if report["reported_at"] < since:
+                        continue
+                    distance = haversine_meters(latitude, longitude, report["latitude"], report["longitude"])
+                    if distance <= self.radius_meters:
+                        found.append((report, distance))
+        return found
+
+    def warnings_for(self, points: List[PathPointCreate]) -> List[dict]:
+        """
+        Proximity warnings for a batch of path points
+
+        Args:
+            points: Ingested points
+
+        Returns:
+            One warning per report near any point, with the closest distance
+        """
+        if not self._report_cells or not points:
+            return []
+
+        since = datetime.utcnow() - timedelta(hours=settings.PROXIMITY_REPORT_MAX_AGE_HOURS)
+        closest: Dict[str, Tuple[dict, float]] = {}
+        for point in points:
+            for report, distance in self.nearby(point.latitude, point.longitude, since):
+                seen = closest.get(report["id"])
+                if seen is None or distance < seen[1]:
+                    closest[report["id"]] = (report, distance)
+
+        return [
+            {
+                "report_id": report["id"],
+                "report_type": report["report_type"],
+                "severity": report["severity"],
+                "latitude": report["latitude"],
+                "longitude": report["longitude"],
+                "distance_meters": round(distance, 1),
+            }
+            for report, distance in sorted(closest.values(), key=lambda item: item[1])
+        ]
+
+    @staticmethod
+    def _load_active_reports() -> List[dict]:
+        """Read the active reports from the database"""
+        since = datetime.utcnow() - timedelta(hours=settings.PROXIMITY_REPORT_MAX_AGE_HOURS)
+        with SessionLocal() as db:
+            rows = db.execute(ACTIVE_REPORTS_SQL, {
+                "statuses": list(ACTIVE_REPORT_STATUSES),
+                "since": since,
+            }).all()
+
+        return [
+            {
+                "id": str(report_id),
+                "active": True,
+                "report_type": report_type,
+                "severity": severity,
+                "latitude": latitude,
+                "longitude": longitude,
+                "reported_at": reported_at,
+            }
+            for report_id, report_type, severity, latitude, longitude, reported_at in rows
+        ]
+
+    async def _reload(self) -> None:
+        self.replace(await asyncio.to_thread(self._load_active_reports))
+
+    async def _sync(self) -> None:
+        """Follow published report changes, reloading on lag and periodically"""
+        loop = asyncio.get_running_loop()
+        while True:
+            try:
+                # Subscribe before loading so no change falls in between
+                async with pubsub_hub.subscribe(ACTIVE_REPORTS_CHANNEL) as queue:
+                    await self._reload()
+                    reload_at = loop.time() + settings.PROXIMITY_INDEX_REFRESH_SECONDS
+
+                    while True:
+                        try:
+                            item = await asyncio.wait_for(queue.get(), timeout=max(reload_at - loop.time(), 0))
+                        except asyncio.TimeoutError:
+                            item = None
+
+                        if item is None:
+                            await self._reload()
+                            reload_at = loop.time() + settings.PROXIMITY_INDEX_REFRESH_SECONDS
+                            continue
+
+                        change = json.loads(item[1])
+                        change["reported_at"] = datetime.fromisoformat(change["reported_at"])
+                        self.apply(change)
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.warning(f"Incident index sync failed, retrying: {e}")
+                await asyncio.sleep(5.0)
+
+    def start(self) -> None:
+        """Start following report changes in this worker"""
+        if self._task is None or self._task.done():
+            self._task = asyncio.create_task(self._sync())
+
+    async def stop(self) -> None:
+        """Stop following report changes"""
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+
+def publish_report_change(
+    report_id: uuid.UUID,
+    report_type: str,
+    severity: Optional[str],
+    status: str,
+    latitude: float,
+    longitude: float,
+    reported_at: datetime
+) -> None:
+    """
+    Announce a created or updated report to every worker's index
+
+    Args:
+        report_id: Report ID
+        report_type: Report type
+        severity: Report severity
+        status: Current status; reports leave the index once resolved or cancelled
+        latitude: Report latitude
+        longitude: Report longitude
+        reported_at: When the report was made
+    """
+    try:
+        redis_client.publish(ACTIVE_REPORTS_CHANNEL, {
+            "id": str(report_id),
+            "active": status in ACTIVE_REPORT_STATUSES,
+            "report_type": report_type,
+            "severity": severity,
+            "latitude": latitude,
+            "longitude": longitude,
+            "reported_at": reported_at.isoformat(),
+        })
+    except redis.RedisError as e:
+        # Workers pick the change up at their next full reload
+        logger.warning(f"Report change not published: {e}")
+
+
+# Per-worker index instance
+incident_index = IncidentIndex(settings.PROXIMITY_WARNING_RADIUS_METERS)
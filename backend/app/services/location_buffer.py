@@ -0,0 +1,381 @@
+"""
+Write-behind buffer for anti-theft location tracking
+
+Devices report fixes of an active theft event every few seconds. Instead of
+a lookup, an INSERT and a commit per fix, the endpoint checks the event
+against a cached owner entry and appends the fix to a Redis stream, so the
+device is answered without waiting on PostgreSQL.
+
+Every API worker runs a flusher that reads the stream through a shared
+consumer group and bulk inserts up to LOCATION_BUFFER_BATCH_SIZE fixes per
+statement, at least every LOCATION_BUFFER_FLUSH_INTERVAL_SECONDS. Entries
+are acknowledged only after the batch is committed; entries left pending
+by a worker that died are claimed by another one after
+LOCATION_BUFFER_CLAIM_IDLE_SECONDS. Delivery is therefore at least once,
+and the unique (event_id, timestamp) constraint makes a replayed batch a
+no-op. Durability of accepted fixes is that of the Redis append-only file.
+
+A batch the database rejects (rather than one it could not be reached
+for) is retried row by row, each row in its own savepoint; entries that
+cannot be parsed or stored are moved to the DEAD_LETTER_KEY stream with
+the error, so one bad fix cannot hold back the fixes behind it.
+"""
+import asyncio
+import logging
+import os
+import socket
+from datetime import datetime, timezone
+from typing import Dict, List, Optional, Tuple
+import uuid
+
+import redis
+from sqlalchemy import text
+from sqlalchemy.exc import InterfaceError, OperationalError, SQLAlchemyError
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.core.database import SessionLocal
+from app.core.redis import redis_client
+from app.models.anti_theft import AntiTheftEvent
+from app.schemas.anti_theft import LocationPoint
+
+logger = logging.getLogger(__name__)
+
+STREAM_KEY = "anti_theft:locations"
+DEAD_LETTER_KEY = "anti_theft:locations:dead"
+CONSUMER_GROUP = "location-flusher"
+ACTIVE_EVENT_KEY = "anti_theft:active_event:{event_id}"
+
+LOCATION_FIELDS = ("latitude", "longitude", "accuracy", "altitude", "speed", "heading", "battery_level")
+
+# Fixes of events deleted in the meantime are dropped by the join instead
+# of failing the whole batch on the foreign key
+BULK_INSERT_LOCATIONS_SQL = text("""
+    INSERT INTO location_tracking (event_id, location, accuracy, altitude, speed, heading, timestamp, battery_level)
+    SELECT
+        t.event_id,
+        ST_SetSRID(ST_MakePoint(t.longitude, t.latitude), 4326)::geography,
+        t.accuracy,
+        t.altitude,
+        t.speed,
+        t.heading,
+        t.timestamp,
+        t.battery_level
+    FROM unnest(
+        CAST(:event_ids AS uuid[]),
+        CAST(:longitudes AS double precision[]),
+        CAST(:latitudes AS double precision[]),
+        CAST(:accuracies AS double precision[]),
+        CAST(:altitudes AS double precision[]),
+        CAST(:speeds AS double precision[]),
+        CAST(:headings AS double precision[]),
+        CAST(:timestamps AS timestamp[]),
+        CAST(:battery_levels AS integer[])
+    ) AS t(event_id, longitude, latitude, accuracy, altitude, speed, heading, timestamp, battery_level)
+    JOIN anti_theft_events e ON e.id = t.event_id
+    ON CONFLICT ON CONSTRAINT uq_location_tracking_event_id_timestamp DO NOTHING
+""")
+
+
+def active_event_owner(db: Session, event_id: str) -> Optional[str]:
+    """
+    Owner of an active anti-theft event, cached in Redis
+
+    Args:
+        db: Database session
+        event_id: Event ID
+
+    Returns:
+        Owner user ID, or None if the event does not exist or is not active
+    """
+    key = ACTIVE_EVENT_KEY.format(event_id=event_id)
+
+    try:
+        owner = redis_client.get_raw(key)
+    except redis.RedisError as e:
+        logger.warning(f"Active event cache unavailable: {e}")
+        owner = None
+
+    if owner is not None:
+        return owner
+
+    user_id = db.query(AntiTheftEvent.user_id).filter(
+        AntiTheftEvent.id == event_id,
+        AntiTheftEvent.status == "active"
+    ).scalar()
+
+    if user_id is None:
+        return None
+
+    try:
+        redis_client.set(key, str(user_id), settings.ANTI_THEFT_ACTIVE_EVENT_CACHE_TTL)
+    except redis.RedisError as e:
+        logger.warning(f"Active event cache unavailable: {e}")
+
+    return str(user_id)
+
+
+def forget_active_event(event_id: uuid.UUID) -> None:
+    """
+    Drop the cached owner entry of an event that is no longer active
+
+    Args:
+        event_id: Event ID
+    """
+    try:
+        redis_client.delete(ACTIVE_EVENT_KEY.format(event_id=event_id))
+    except redis.RedisError as e:
+        logger.warning(f"Active event cache invalidation failed: {e}")
+
+
+def _utc_naive(timestamp: datetime) -> datetime:
+    """Stored timestamps are naive UTC"""
+    if timestamp.tzinfo is not None:
+        timestamp = timestamp.astimezone(timezone.utc).replace(tzinfo=None)
+    return timestamp
+
+
+def buffer_location(event_id: str, location: LocationPoint) -> bool:
+    """
+    Append a fix to the write-behind stream
+
+    Args:
+        event_id: Active event the fix belongs to
+        location: Location fix
+
+    Returns:
+        True if the fix was buffered, False if Redis is unavailable and the
+        caller has to store it directly
+    """
+    fields = {
+        name: "" if getattr(location, name) is None else str(getattr(location, name))
+        for name in LOCATION_FIELDS
+    }
+    fields["event_id"] = str(event_id)
+    fields["timestamp"] = _utc_naive(location.timestamp).isoformat()
+
+    try:
+        redis_client.client.xadd(STREAM_KEY, fields)
+        return True
+    except redis.RedisError as e:
+        logger.warning(f"Location buffer unavailable, storing directly: {e}")
+        return False
+
+
+def _optional(value: str, cast):
+    return cast(value) if value != "" else None
+
+
+def _parse_entry(fields: Dict[str, str]) -> Tuple:
+    """Row values of a stream entry, in BULK_INSERT_LOCATIONS_SQL order"""
+    return (
+        str(uuid.UUID(fields["event_id"])),
+        float(fields["longitude"]),
+        float(fields["latitude"]),
+        _optional(fields["accuracy"], float),
+        _optional(fields["altitude"], float),
+        _optional(fields["speed"], float),
+        _optional(fields["heading"], float),
+        datetime.fromisoformat(fields["timestamp"]),
+        _optional(fields["battery_level"], int),
+    )
+
+
+def _location_params(rows: List[Tuple]) -> Dict[str, list]:
+    """Bind parameters of BULK_INSERT_LOCATIONS_SQL for parsed rows"""
+    columns = list(zip(*rows))
+    return {
+        "event_ids": list(columns[0]),
+        "longitudes": list(columns[1]),
+        "latitudes": list(columns[2]),
+        "accuracies": list(columns[3]),
+        "altitudes": list(columns[4]),
+        "speeds": list(columns[5]),
+        "headings": list(columns[6]),
+        "timestamps": list(columns[7]),
+        "battery_levels": list(columns[8]),
+    }
+
+
+def insert_location(db: Session, event_id: str, location: LocationPoint) -> None:
+    """
+    Store one fix directly, skipping it if it is already stored
+
+    Used when the buffer is disabled or unavailable. The caller commits.
+
+    Args:
+        db: Database session
+        event_id: Event the fix belongs to
+        location: Location fix
+    """
+    row = (
+        str(event_id),
+        location.longitude,
+        location.latitude,
+        location.accuracy,
+        location.altitude,
+        location.speed,
+        location.heading,
+        _utc_naive(location.timestamp),
+        location.battery_level,
+    )
+    db.execute(BULK_INSERT_LOCATIONS_SQL, _location_params([row]))
+
+
+def _insert_locations(rows: List[Tuple]) -> Dict[int, str]:
+    """
+    Bulk insert parsed rows and commit, isolating rows the database rejects
+
+    The whole batch goes in one statement. If the database rejects it, each
+    row is inserted in its own savepoint instead. Connection failures are
+    raised, so the batch stays pending and is retried.
+
+    Args:
+        rows: Parsed rows
+
+    Returns:
+        Error message per index of a rejected row
+    """
+    with SessionLocal() as db:
+        try:
+            db.execute(BULK_INSERT_LOCATIONS_SQL, _location_params(rows))
+            db.commit()
+            return {}
+        except (OperationalError, InterfaceError):
+            raise
+        except SQLAlchemyError as e:
+            db.rollback()
+            logger.warning(f"Buffered location batch rejected, inserting row by row: {e}")
+
+        rejected = {}
+        for index, row in enumerate(rows):
+            try:
+                with db.begin_nested():
+                    db.execute(BULK_INSERT_LOCATIONS_SQL, _location_params([row]))
+            except (OperationalError, InterfaceError):
+                raise
+            except SQLAlchemyError as e:
+                rejected[index] = str(e)
+        db.commit()
+
+    return rejected
+
+
+def _ensure_group() -> None:
+    try:
+        redis_client.client.xgroup_create(STREAM_KEY, CONSUMER_GROUP, id="0", mkstream=True)
+    except redis.ResponseError as e:
+        if "BUSYGROUP" not in str(e):
+            raise
+
+
+def flush_locations(consumer: str) -> int:
+    """
+    Move one batch of buffered fixes into location_tracking
+
+    Entries idle in another consumer's pending list (a worker that died
+    before acknowledging) are claimed first; otherwise new entries are
+    read.
+
+    Args:
+        consumer: Consumer name of this worker
+
+    Returns:
+        Number of stream entries handled
+    """
+    batch_size = settings.LOCATION_BUFFER_BATCH_SIZE
+
+    _, entries, *_ = redis_client.client.xautoclaim(
+        STREAM_KEY,
+        CONSUMER_GROUP,
+        consumer,
+        min_idle_time=settings.LOCATION_BUFFER_CLAIM_IDLE_SECONDS * 1000,
+        start_id="0-0",
+        count=batch_size
+    )
+    if not entries:
+        response = redis_client.client.xreadgroup(CONSUMER_GROUP, consumer, {STREAM_KEY: ">"}, count=batch_size)
+        entries = response[0][1] if response else []
+
+    if not entries:
+        return 0
+
+    parsed = []
+    dead = []
+    for entry_id, fields in entries:
+        # Entries deleted while pending come back without fields
+        if not fields:
+            continue
+        try:
+            parsed.append((entry_id, fields, _parse_entry(fields)))
+        except (KeyError, ValueError) as e:
+            dead.append((entry_id, fields, f"Malformed entry: {e}"))
+
+    if parsed:
+        rejected = _insert_locations([row for _, _, row in parsed])
+        dead.extend((parsed[i][0], parsed[i][1], error) for i, error in rejected.items())
+
+    entry_ids = [entry_id for entry_id, _ in entries]
+    pipe = redis_client.client.pipeline()
+    for entry_id, fields, error in dead:
+        logger.error(f"Dead-lettering buffered location {entry_id}: {error}")
+        pipe.xadd(
+            DEAD_LETTER_KEY,
+            {**fields, "entry_id": entry_id, "error": error[:1000]},
+            maxlen=settings.LOCATION_BUFFER_DEAD_LETTER_MAXLEN,
+            approximate=True
+        )
+    pipe.xack(STREAM_KEY, CONSUMER_GROUP, *entry_ids)
+    pipe.xdel(STREAM_KEY, *entry_ids)
+    pipe.execute()
+
+    return len(entries)
+
+
+class LocationFlusher:
+    """Background task flushing the location buffer in this worker"""
+
+    def __init__(self):
+        self.consumer = f"{socket.gethostname()}-{os.getpid()}"
+        self._task: Optional[asyncio.Task] = None
+
+    async def _run(self) -> None:
+        interval = settings.LOCATION_BUFFER_FLUSH_INTERVAL_SECONDS
+        group_ready = False
+
+        while True:
+            try:
+                if not group_ready:
+                    await asyncio.to_thread(_ensure_group)
+                    group_ready = True
+                flushed = await asyncio.to_thread(flush_locations, self.consumer)
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                # Unacknowledged entries stay pending and are claimed again
+                logger.error(f"Location buffer flush failed: {e}")
+                flushed = 0
+
+            # A full batch means more is waiting; otherwise the interval
+            # bounds how long a fix stays in the buffer
+            if flushed < settings.LOCATION_BUFFER_BATCH_SIZE:
+                await asyncio.sleep(interval)
+
+    def start(self) -> None:
+        """Start flushing in this worker"""
+        if self._task is None or self._task.done():
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        """Stop flushing; buffered fixes stay in the stream for the next start"""
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+
+# Per-worker flusher instance
+location_flusher = LocationFlusher()
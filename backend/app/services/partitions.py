@@ -0,0 +1,176 @@
+"""
+Monthly range partition maintenance for time-series point tables
+"""
+import logging
+import re
+from datetime import datetime
+from typing import Dict, List, Optional
+
+from sqlalchemy import text
+from sqlalchemy.exc import SQLAlchemyError
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+PARTITION_NAME_PATTERN = re.compile(r"_p(\d{4})_(\d{2})$")
+
+
+def partitioned_tables() -> Dict[str, int]:
+    """
+    Partitioned tables and their retention
+
+    Returns:
+        Mapping of table name to retention in months (0 keeps forever)
+    """
+    return {
+        "path_points": settings.PATH_POINTS_RETENTION_MONTHS,
+        "location_tracking": settings.LOCATION_TRACKING_RETENTION_MONTHS,
+    }
+
+
+def month_start(value: datetime) -> datetime:
+    """First instant of the month containing value"""
+    return datetime(value.year, value.month, 1)
+
+
+def add_months(value: datetime, months: int) -> datetime:
+    """Shift a month start by a number of months"""
+    index = value.year * 12 + value.month - 1 + months
+    return datetime(index // 12, index % 12 + 1, 1)
+
+
+def partition_name(table: str, month: datetime) -> str:
+    """Name of the partition holding the given month"""
+    return f"{table}_p{month:%Y_%m}"
+
+
+def create_month_partition(db: Session, table: str, month: datetime) -> Optional[str]:
+    """
+    Create the partition for one month if it does not exist yet
+
+    Args:
+        db: Database session or connection
+        table: Partitioned table
+        month: Month start
+
+    Returns:
+        Partition name, or None if it could not be created
+    """
+    name = partition_name(table, month)
+    statement = text(
+        f'CREATE TABLE IF NOT EXISTS "{name}" PARTITION OF "{table}" '
+        f"FOR VALUES FROM ('{month:%Y-%m-%d}') TO ('{add_months(month, 1):%Y-%m-%d}')"
+    )
+
+    try:
+        # Savepoint so one failing month does not abort the whole run
+        with db.begin_nested():
+            db.execute(statement)
+    except SQLAlchemyError as e:
+        # Typically rows for that month already sit in the default partition
+        logger.error(f"Could not create partition {name}: {e}")
+        return None
+
+    return name
+
+
+def ensure_partitions(db: Session, months_ahead: Optional[int] = None) -> List[str]:
+    """
+    Make sure the default, current and upcoming monthly partitions exist
+
+    Args:
+        db: Database session
+        months_ahead: Future months to create (default PARTITION_PREMAKE_MONTHS)
+
+    Returns:
+        Names of the partitions checked or created
+    """
+    if months_ahead is None:
+        months_ahead = settings.PARTITION_PREMAKE_MONTHS
+
+    current = month_start(datetime.utcnow())
+    names = []
+
+    for table in partitioned_tables():
+        # Catches fixes with badly wrong device clocks
+        db.execute(text(f'CREATE TABLE IF NOT EXISTS "{table}_default" PARTITION OF "{table}" DEFAULT'))
+
+        for offset in range(months_ahead + 1):
+            name = create_month_partition(db, table, add_months(current, offset))
+            if name:
+                names.append(name)
+
+    return names
+
+
+def list_month_partitions(db: Session, table: str) -> Dict[str, datetime]:
+    """
+    List the monthly partitions attached to a table
+
+    Args:
+        db: Database session
+        table: Partitioned table
+
+    Returns:
+        Mapping of partition name to the month it holds
+    """
+    rows = db.execute(text("""
+        SELECT child.relname
+        FROM pg_inherits
+        JOIN pg_class parent ON parent.oid = pg_inherits.inhparent
+        JOIN pg_class child ON child.oid = pg_inherits.inhrelid
+        WHERE parent.relname = :table
+    """), {"table": table}).scalars().all()
+
+    partitions = {}
+    for name in rows:
+        match = PARTITION_NAME_PATTERN.search(name)
+        if match:
+            partitions[name] = datetime(int(match.group(1)), int(match.group(2)), 1)
+
+    return partitions
+
+
+def expire_partitions(db: Session) -> List[str]:
+    """
+    Detach partitions past their table's retention
+
+    Detached partitions are moved to PARTITION_ARCHIVE_SCHEMA, or dropped
+    when no archive schema is configured. Both are metadata-only
+    operations, unlike a DELETE over the expired rows.
+
+    Args:
+        db: Database session
+
+    Returns:
+        Names of the expired partitions
+    """
+    current = month_start(datetime.utcnow())
+    archive_schema = settings.PARTITION_ARCHIVE_SCHEMA
+    expired = []
+
+    if archive_schema:
+        db.execute(text(f'CREATE SCHEMA IF NOT EXISTS "{archive_schema}"'))
+
+    for table, retention_months in partitioned_tables().items():
+        if retention_months <= 0:
+            continue
+
+        cutoff = add_months(current, -retention_months)
+
+        for name, month in sorted(list_month_partitions(db, table).items()):
+            if month >= cutoff:
+                continue
+
+            db.execute(text(f'ALTER TABLE "{table}" DETACH PARTITION "{name}"'))
+            if archive_schema:
+                db.execute(text(f'ALTER TABLE "{name}" SET SCHEMA "{archive_schema}"'))
+            else:
+                db.execute(text(f'DROP TABLE "{name}"'))
+
+            logger.info(f"Expired partition {name} (retention {retention_months} months)")
+            expired.append(name)
+
+    return expired
@@ -0,0 +1,287 @@
+"""
+Compact encodings for path point columns
+
+The columnar encoders take the column dict produced by
+app.services.path_points.load_point_columns, so point arrays are
+serialized without building a dict per point. The streaming encoders
+take row chunks from app.services.path_points.iter_point_chunks.
+"""
+from datetime import datetime, timedelta
+from typing import Dict, Iterable, Iterator, List, Optional, Sequence, Tuple
+import json
+
+JSON_MEDIA_TYPE = "application/json"
+POLYLINE_MEDIA_TYPE = "application/vnd.nuur.polyline+json"
+MSGPACK_MEDIA_TYPE = "application/x-msgpack"
+ARROW_MEDIA_TYPE = "application/vnd.apache.arrow.stream"
+NDJSON_MEDIA_TYPE = "application/x-ndjson"
+
+SUPPORTED_MEDIA_TYPES = (
+    JSON_MEDIA_TYPE,
+    POLYLINE_MEDIA_TYPE,
+    MSGPACK_MEDIA_TYPE,
+    ARROW_MEDIA_TYPE,
+    NDJSON_MEDIA_TYPE,
+)
+
+# Aliases some clients send for the same formats
+MEDIA_TYPE_ALIASES = {
+    "application/msgpack": MSGPACK_MEDIA_TYPE,
+    "application/vnd.msgpack": MSGPACK_MEDIA_TYPE,
+    "application/vnd.apache.arrow.file": ARROW_MEDIA_TYPE,
+    "application/jsonlines": NDJSON_MEDIA_TYPE,
+    "application/x-jsonlines": NDJSON_MEDIA_TYPE,
+}
+
+# Coordinates are sent as integers in 1e-6 degrees (~11 cm)
+COORDINATE_SCALE = 1_000_000
+
+EPOCH = datetime(1970, 1, 1)
+MILLISECOND = timedelta(milliseconds=1)
+
+
+def negotiate_media_type(accept: Optional[str]) -> Optional[str]:
+    """
+    Pick the response format from an Accept header
+
+    Args:
+        accept: Accept header value
+
+    Returns:
+        Supported media type, or None if nothing acceptable is supported
+    """
+    if not accept:
+        return JSON_MEDIA_TYPE
+
+    candidates = []
+    for position, part in enumerate(accept.split(",")):
+        fields = part.strip().split(";")
+        media_type = MEDIA_TYPE_ALIASES.get(fields[0].strip().lower(), fields[0].strip().lower())
+        quality = 1.0
+        for param in fields[1:]:
+            name, _, value = param.strip().partition("=")
+            if name == "q":
+                try:
+                    quality = float(value)
+                except ValueError:
+                    quality = 0.0
+        if quality > 0:
+            candidates.append((-quality, position, media_type))
+
+    for _, _, media_type in sorted(candidates):
+        if media_type in SUPPORTED_MEDIA_TYPES:
+            return media_type
+        if media_type in ("*/*", "application/*"):
+            return JSON_MEDIA_TYPE
+
+    return None
+
+
+def to_epoch_millis(timestamps: Sequence[datetime]) -> List[int]:
+    """
+    Convert naive UTC datetimes to epoch milliseconds
+
+    Args:
+        timestamps: Datetimes
+
+    Returns:
+        Milliseconds since the Unix epoch
+    """
+    return [(ts - EPOCH) // MILLISECOND for ts in timestamps]
+
+
+def delta_encode(values: Sequence[int]) -> List[int]:
+    """
+    Replace each value with its difference from the previous one
+
+    Args:
+        values: Integers
+
+    Returns:
+        First value followed by successive deltas
+    """
+    previous = 0
+    deltas = []
+    for value in values:
+        deltas.append(value - previous)
+        previous = value
+    return deltas
+
+
+def encode_polyline(latitudes: Sequence[float], longitudes: Sequence[float], precision: int = 5) -> str:
+    """
+    Encode coordinates with the Google encoded polyline algorithm
+
+    Args:
+        latitudes: Latitudes
+        longitudes: Longitudes
+        precision: Decimal places kept (5 is the Google Maps default)
+
+    Returns:
+        Encoded polyline string
+    """
+    factor = 10 ** precision
+    chunks = []
+    prev_lat = prev_lon = 0
+
+    for lat, lon in zip(latitudes, longitudes):
+        lat_i = int(round(lat * factor))
+        lon_i = int(round(lon * factor))
+        _append_polyline_value(chunks, lat_i - prev_lat)
+        _append_polyline_value(chunks, lon_i - prev_lon)
+        prev_lat, prev_lon = lat_i, lon_i
+
+    return "".join(chunks)
+
+
+def _append_polyline_value(chunks: List[str], value: int) -> None:
+    """Append one zig-zag, 5-bit chunked polyline value"""
+    value = ~(value << 1) if value < 0 else value << 1
+    while value >= 0x20:
+        chunks.append(chr((0x20 | (value & 0x1f)) + 63))
+        value >>= 5
+    chunks.append(chr(value + 63))
+
+
+def build_polyline_payload(path_data: dict, columns: Dict[str, list]) -> dict:
+    """
+    Build the polyline response body
+
+    Args:
+        path_data: Serialized path fields
+        columns: Point columns
+
+    Returns:
+        JSON-serializable dict with the encoded polyline and delta timestamps
+    """
+    return {
+        **path_data,
+        "point_count": len(columns["id"]),
+        "polyline": encode_polyline(columns["latitude"], columns["longitude"]),
+        "polyline_precision": 5,
+        "timestamps_ms_delta": delta_encode(to_epoch_millis(columns["timestamp"])),
+    }
+
+
+def encode_msgpack(path_data: dict, columns: Dict[str, list]) -> bytes:
+    """
+    Encode points as delta-encoded MessagePack columns
+
+    Integer deltas between consecutive fixes are small, so MessagePack
+    stores most of them in one to three bytes.
+
+    Args:
+        path_data: Serialized path fields
+        columns: Point columns
+
+    Returns:
+        MessagePack document
+    """
+    import msgpack
+
+    return msgpack.packb({
+        "path": path_data,
+        "coordinate_scale": COORDINATE_SCALE,
+        "points": {
+            "id_delta": delta_encode(columns["id"]),
+            "latitude_delta": delta_encode([int(round(v * COORDINATE_SCALE)) for v in columns["latitude"]]),
+            "longitude_delta": delta_encode([int(round(v * COORDINATE_SCALE)) for v in columns["longitude"]]),
+            "timestamp_ms_delta": delta_encode(to_epoch_millis(columns["timestamp"])),
+            "accuracy": columns["accuracy"],
+            "altitude": columns["altitude"],
+            "speed": columns["speed"],
+            "heading": columns["heading"],
+        },
+    }, use_bin_type=True)
+
+
+def encode_arrow_ipc(path_data: dict, columns: Dict[str, list]) -> bytes:
+    """
+    Encode points as an Arrow IPC stream for analytics consumers
+
+    Path fields are attached as schema metadata.
+
+    Args:
+        path_data: Serialized path fields
+        columns: Point columns
+
+    Returns:
+        Arrow IPC stream bytes
+
+    Raises:
+        ImportError: If pyarrow is not installed
+    """
+    import pyarrow as pa
+
+    table = pa.table({
+        "id": pa.array(columns["id"], type=pa.int64()),
+        "latitude": pa.array(columns["latitude"], type=pa.float64()),
+        "longitude": pa.array(columns["longitude"], type=pa.float64()),
+        "accuracy": pa.array(columns["accuracy"], type=pa.float64()),
+        "altitude": pa.array(columns["altitude"], type=pa.float64()),
+        "speed": pa.array(columns["speed"], type=pa.float64()),
+        "heading": pa.array(columns["heading"], type=pa.float64()),
+        "timestamp": pa.array(columns["timestamp"], type=pa.timestamp("us")),
+    }).replace_schema_metadata({"path": json.dumps(path_data)})
+
+    sink = pa.BufferOutputStream()
+    with pa.ipc.new_stream(sink, table.schema) as writer:
+        writer.write_table(table)
+
+    return sink.getvalue().to_pybytes()
+
+
+def _point_json(row: Tuple) -> str:
+    """Serialize one point row (POINT_COLUMNS order) as a JSON object"""
+    point_id, latitude, longitude, accuracy, altitude, speed, heading, timestamp = row
+    return json.dumps({
+        "id": point_id,
+        "latitude": latitude,
+        "longitude": longitude,
+        "accuracy": accuracy,
+        "altitude": altitude,
+        "speed": speed,
+        "heading": heading,
+        "timestamp": timestamp.isoformat(),
+    }, separators=(",", ":"))
+
+
+def iter_ndjson(path_data: dict, chunks: Iterable[List[Tuple]]) -> Iterator[bytes]:
+    """
+    Stream a path as NDJSON: the path fields first, then one point per line
+
+    Args:
+        path_data: Serialized path fields
+        chunks: Point row chunks
+
+    Yields:
+        Encoded NDJSON chunks
+    """
+    yield (json.dumps({"path": path_data}) + "\n").encode()
+
+    for chunk in chunks:
+        yield "".join(_point_json(row) + "\n" for row in chunk).encode()
+
+
+def iter_json_document(path_data: dict, chunks: Iterable[List[Tuple]]) -> Iterator[bytes]:
+    """
+    Stream a path detail JSON document with the same shape as PathDetailResponse
+
+    Args:
+        path_data: Serialized path fields
+        chunks: Point row chunks
+
+    Yields:
+        Encoded JSON fragments
+    """
+    head = json.dumps({**path_data, "points": []})
+    # Open the (empty) points array and stream its items before closing it
+    yield head[:-2].encode()
+
+    first = True
+    for chunk in chunks:
+        body = ",".join(_point_json(row) for row in chunk)
+        yield (body if first else "," + body).encode()
+        first = False
+
+    yield b"]}"
@@ -0,0 +1,220 @@
+"""
+Streaming GPX / GeoJSON / KML export of recorded paths
+
+Exports are produced by generators fed from server-side cursor chunks
+(app.services.path_points.iter_point_chunks), so a multi-month export
+never holds more than one chunk of points in memory.
+"""
+from typing import Callable, Iterable, Iterator, List, Tuple
+from xml.sax.saxutils import escape, quoteattr
+import itertools
+import json
+import tempfile
+import zlib
+
+EXPORT_FORMATS = {
+    "gpx": ("application/gpx+xml", "gpx"),
+    "geojson": ("application/geo+json", "geojson"),
+    "kml": ("application/vnd.google-earth.kml+xml", "kml"),
+}
+
+# Timestamps of a GeoJSON feature kept in memory before spilling to disk
+TIMESTAMP_SPOOL_MAX_BYTES = 1024 * 1024
+SPOOL_READ_SIZE = 64 * 1024
+
+# A path to export: its serialized fields and a lazy source of point chunks
+ExportItem = Tuple[dict, Callable[[], Iterable[List[Tuple]]]]
+
+
+def _iso(timestamp) -> str:
+    """Format a naive UTC datetime as an ISO 8601 UTC timestamp"""
+    return timestamp.isoformat() + "Z"
+
+
+def iter_gpx(items: Iterable[ExportItem]) -> Iterator[str]:
+    """
+    Stream paths as a GPX 1.1 document, one track per path
+
+    Args:
+        items: Paths to export
+
+    Yields:
+        XML fragments
+    """
+    yield (
+        '<?xml version="1.0" encoding="UTF-8"?>\n'
+        '<gpx version="1.1" creator="NuuR" xmlns="http://www.topografix.com/GPX/1/1">\n'
+    )
+
+    for path_data, chunks in items:
+        yield f"<trk><name>{escape(path_data.get('name') or str(path_data['id']))}</name>"
+        if path_data.get("description"):
+            yield f"<desc>{escape(path_data['description'])}</desc>"
+        if path_data.get("path_type"):
+            yield f"<type>{escape(path_data['path_type'])}</type>"
+        yield "<trkseg>\n"
+
+        for chunk in chunks():
+            parts = []
+            for _, latitude, longitude, _, altitude, _, _, timestamp in chunk:
+                ele = f"<ele>{altitude}</ele>" if altitude is not None else ""
+                parts.append(
+                    f'<trkpt lat="{latitude}" lon="{longitude}">{ele}<time>{_iso(timestamp)}</time></trkpt>\n'
+                )
+            yield "".join(parts)
+
+        yield "</trkseg></trk>\n"
+
+    yield "</gpx>\n"
+
+
+def _geojson_position(row: Tuple) -> str:
+    """Format a point row as a GeoJSON position"""
+    _, latitude, longitude, _, altitude, _, _, _ = row
+    return f"[{longitude},{latitude},{altitude}]" if altitude is not None else f"[{longitude},{latitude}]"
+
+
+def _geojson_properties(path_data: dict, timestamps: Iterable[str]) -> Iterator[str]:
+    """Stream the properties object: the path fields, then the timestamps array"""
+    fields = json.dumps(path_data)
+    yield (fields[:-1] + "," if path_data else "{") + '"timestamps":['
+    yield from timestamps
+    yield "]}"
+
+
+def iter_geojson(items: Iterable[ExportItem]) -> Iterator[str]:
+    """
+    Stream paths as a GeoJSON FeatureCollection of LineStrings
+
+    Point timestamps are kept in a parallel "timestamps" property. They can
+    only be written after the coordinates, so they are spooled to a
+    temporary file past TIMESTAMP_SPOOL_MAX_BYTES instead of piling up in
+    memory. A path with a single point is exported as a Point, one
+    without points with a null geometry.
+
+    Args:
+        items: Paths to export
+
+    Yields:
+        JSON fragments
+    """
+    yield '{"type":"FeatureCollection","features":['
+
+    first_feature = True
+    for path_data, chunks in items:
+        yield "" if first_feature else ","
+        first_feature = False
+
+        # Read ahead until the geometry type is known
+        source = iter(chunks())
+        head: List[Tuple] = []
+        for chunk in source:
+            head.extend(chunk)
+            if len(head) >= 2:
+                break
+
+        if len(head) < 2:
+            geometry = {"type": "Point", "coordinates": json.loads(_geojson_position(head[0]))} if head else None
+            properties = {**path_data, "timestamps": [_iso(row[7]) for row in head]}
+            yield json.dumps({"type": "Feature", "geometry": geometry, "properties": properties})
+            continue
+
+        yield '{"type":"Feature","geometry":{"type":"LineString","coordinates":['
+
+        with tempfile.SpooledTemporaryFile(max_size=TIMESTAMP_SPOOL_MAX_BYTES, mode="w+") as spool:
+            first_point = True
+            for chunk in itertools.chain([head], source):
+                if not chunk:
+                    continue
+                coordinates = ",".join(_geojson_position(row) for row in chunk)
+                timestamps = ",".join(f'"{_iso(row[7])}"' for row in chunk)
+                yield coordinates if first_point else "," + coordinates
+                spool.write(timestamps if first_point else "," + timestamps)
+                first_point = False
+
+            yield ']},"properties":'
+            spool.seek(0)
+            yield from _geojson_properties(path_data, iter(lambda: spool.read(SPOOL_READ_SIZE), ""))
+
+        yield "}"
+
+    yield "]}\n"
+
+
+def iter_kml(items: Iterable[ExportItem]) -> Iterator[str]:
+    """
+    Stream paths as a KML document, one Placemark per path
+
+    Args:
+        items: Paths to export
+
+    Yields:
+        XML fragments
+    """
+    yield (
+        '<?xml version="1.0" encoding="UTF-8"?>\n'
+        '<kml xmlns="http://www.opengis.net/kml/2.2"><Document><name>NuuR paths</name>\n'
+    )
+
+    for path_data, chunks in items:
+        yield f"<Placemark id={quoteattr(str(path_data['id']))}>"
+        yield f"<name>{escape(path_data.get('name') or str(path_data['id']))}</name>"
+        if path_data.get("description"):
+            yield f"<description>{escape(path_data['description'])}</description>"
+        if path_data.get("start_time"):
+            end = f"<end>{path_data['end_time']}Z</end>" if path_data.get("end_time") else ""
+            yield f"<TimeSpan><begin>{path_data['start_time']}Z</begin>{end}</TimeSpan>"
+        yield "<LineString><tessellate>1</tessellate><coordinates>\n"
+
+        for chunk in chunks():
+            yield "".join(
+                f"{longitude},{latitude},{altitude if altitude is not None else 0}\n"
+                for _, latitude, longitude, _, altitude, _, _, _ in chunk
+            )
+
+        yield "</coordinates></LineString></Placemark>\n"
+
+    yield "</Document></kml>\n"
+
+
+EXPORT_WRITERS = {
+    "gpx": iter_gpx,
+    "geojson": iter_geojson,
+    "kml": iter_kml,
+}
+
+
+def iter_encoded(fragments: Iterable[str]) -> Iterator[bytes]:
+    """
+    Encode text fragments as UTF-8
+
+    Args:
+        fragments: Text fragments
+
+    Yields:
+        Encoded fragments
+    """
+    for fragment in fragments:
+        if fragment:
+            yield fragment.encode()
+
+
+def iter_gzip(chunks: Iterable[bytes]) -> Iterator[bytes]:
+    """
+    Gzip a byte stream chunk by chunk
+
+    Args:
+        chunks: Uncompressed chunks
+
+    Yields:
+        Gzip member bytes as they become available
+    """
+    # wbits=31 selects the gzip container
+    compressor = zlib.compressobj(6, zlib.DEFLATED, 31)
+
+    for chunk in chunks:
+        compressed = compressor.compress(chunk)
+        if compressed:
+            yield compressed
+
+    yield compressor.flush()
@@ -0,0 +1,201 @@
+"""
+GPS noise filtering stage of the point ingest pipeline
+
+The filter works on a whole uploaded batch, chained onto the last stored
+point of the path (kept in the path's running aggregates), and reports how
+many points each stage removed.
+"""
+from typing import Dict, List, Optional, Tuple
+
+from app.core.config import settings
+from app.models.path import Path
+from app.schemas.path import PathPointCreate
+from app.services.geo import haversine_meters
+from app.services.path_metrics import consecutive_metrics, point_arrays, segment_speeds, valid_coordinates
+
+# Accuracy assumed for fixes that do not report one (meters)
+DEFAULT_ACCURACY_METERS = 20.0
+
+
+def _drop_invalid(points: List[PathPointCreate]) -> Tuple[List[PathPointCreate], int]:
+    """Drop fixes with non-finite or out-of-range coordinates"""
+    if not points:
+        return points, 0
+
+    latitudes, longitudes, _ = point_arrays(points)
+    mask = valid_coordinates(latitudes, longitudes)
+    if mask.all():
+        return points, 0
+
+    kept = [p for p, valid in zip(points, mask) if valid]
+    return kept, len(points) - len(kept)
+
+
+def _dedupe(points: List[PathPointCreate]) -> Tuple[List[PathPointCreate], int]:
+    """Drop repeated timestamps within the batch"""
+    seen = set()
+    kept = []
+    for p in points:
+        if p.timestamp in seen:
+            continue
+        seen.add(p.timestamp)
+        kept.append(p)
+    return kept, len(points) - len(kept)
+
+
+def _drop_inaccurate(points: List[PathPointCreate]) -> Tuple[List[PathPointCreate], int]:
+    """Drop fixes whose reported accuracy is worse than the configured limit"""
+    limit = settings.PATH_FILTER_MAX_ACCURACY_METERS
+    kept = [p for p in points if p.accuracy is None or p.accuracy <= limit]
+    return kept, len(points) - len(kept)
+
+
+def _drop_implausible(
+    points: List[PathPointCreate],
+    last: Optional[Tuple[float, float, object]],
+    stationary_points: Optional[List[PathPointCreate]] = None
+) -> Tuple[List[PathPointCreate], int, int]:
+    """
+    Drop stationary jitter and speed outliers against the previous kept fix
+
+    Distances and speeds to the previous fix are first computed for the
+    whole batch at once. When no fix fails either check, every fix is kept
+    and each one's previous kept fix is simply the one before it, so the
+    batch is accepted without walking it; otherwise the sequential pass
+    decides which fixes the rejected ones are measured against.
+
+    Stationary fixes are appended to stationary_points when it is given.
+
+    Returns:
+        Tuple of (kept points, stationary dropped, outliers dropped)
+    """
+    min_distance = settings.PATH_FILTER_MIN_DISTANCE_METERS
+    max_speed = settings.PATH_FILTER_MAX_SPEED_MPS
+
+    if not points:
+        return points, 0, 0
+
+    latitudes, longitudes, timestamps = point_arrays(points)
+    distances, elapsed = consecutive_metrics(latitudes, longitudes, timestamps, last)
+    if ((distances >= min_distance) & (segment_speeds(distances, elapsed) <= max_speed)).all():
+        return points, 0, 0
+
+    stationary = outliers = 0
+    kept = []
+
+    for p in points:
+        if last is not None:
+            distance = haversine_meters(last[0], last[1], p.latitude, p.longitude)
+            elapsed = (p.timestamp - last[2]).total_seconds()
+
+            if distance < min_distance:
+                stationary += 1
+                if stationary_points is not None:
+                    stationary_points.append(p)
+                continue
+            if elapsed <= 0 or distance / elapsed > max_speed:
+                outliers += 1
+                continue
+
+        kept.append(p)
+        last = (p.latitude, p.longitude, p.timestamp)
+
+    return kept, stationary, outliers
+
+
+def _kalman_smooth(
+    points: List[PathPointCreate],
+    last: Optional[Tuple[float, float, object]]
+) -> List[PathPointCreate]:
+    """
+    Smooth coordinates with a constant-position Kalman filter
+
+    Measurement variance comes from each fix's accuracy; process noise
+    grows with elapsed time at PATH_FILTER_KALMAN_PROCESS_NOISE_MPS.
+    """
+    q = settings.PATH_FILTER_KALMAN_PROCESS_NOISE_MPS
+
+    if last is not None:
+        lat, lon, previous_time = last
+        variance = DEFAULT_ACCURACY_METERS ** 2
+    else:
+        lat = lon = previous_time = None
+        variance = None
+
+    smoothed = []
+    for p in points:
+        accuracy = max(p.accuracy or DEFAULT_ACCURACY_METERS, 1.0)
+
+        if variance is None:
+            lat, lon, variance = p.latitude, p.longitude, accuracy ** 2
+        else:
+            elapsed = max((p.timestamp - previous_time).total_seconds(), 0.0)
+            variance += elapsed * q * q
+            gain = variance / (variance + accuracy ** 2)
+            lat += gain * (p.latitude - lat)
+            lon += gain * (p.longitude - lon)
+            variance *= 1 - gain
+
+        previous_time = p.timestamp
+        smoothed.append(p.model_copy(update={"latitude": lat, "longitude": lon}))
+
+    return smoothed
+
+
+def filter_path_points(
+    path: Path,
+    points: List[PathPointCreate],
+    stationary_points: Optional[List[PathPointCreate]] = None
+) -> Tuple[List[PathPointCreate], Dict[str, int]]:
+    """
+    Run an uploaded batch through the noise filtering stages
+
+    Stages, in order: invalid coordinates, points inside the range already
+    thinned for the point budget, duplicate timestamps, accuracy threshold, stationary jitter, speed plausibility, then optional Kalman
+    smoothing. Points at or before the last stored fix (retries and late
+    uploads) cannot be chained onto it and only go through the first three
+    stages; the idempotent insert skips the ones that are already stored.
+    The first two stages run even with filtering disabled.
+
+    Args:
+        path: Path the batch belongs to (provides the last stored fix)
+        points: Uploaded points
+        stationary_points: If given, the fixes dropped as stationary jitter
+            are appended to it, so stay detection still sees the time spent
+            standing still
+
+    Returns:
+        Tuple of (points to store sorted by timestamp, removed count per stage)
+    """
+    stats = {"invalid": 0, "thinned": 0, "duplicates": 0, "inaccurate": 0, "stationary": 0, "outliers": 0}
+
+    # Coordinates PostGIS would reject are dropped even with filtering off
+    ordered = sorted(points, key=lambda p: p.timestamp)
+    ordered, stats["invalid"] = _drop_invalid(ordered)
+
+    # Retries would otherwise bring back points the budget thinned away
+    if path.thinned_until is not None:
+        thinned = sum(1 for p in ordered if p.timestamp < path.thinned_until)
+        ordered, stats["thinned"] = ordered[thinned:], thinned
+
+    if not settings.PATH_FILTER_ENABLED:
+        return ordered, stats
+
+    last = None
+    if path.last_latitude is not None and path.last_point_time is not None:
+        last = (path.last_latitude, path.last_longitude, path.last_point_time)
+
+    kept, stats["duplicates"] = _dedupe(ordered)
+    kept, stats["inaccurate"] = _drop_inaccurate(kept)
+
+    late = []
+    if path.last_point_time is not None:
+        late = [p for p in kept if p.timestamp <= path.last_point_time]
+        kept = kept[len(late):]
+
+    kept, stats["stationary"], stats["outliers"] = _drop_implausible(kept, last, stationary_points)
+
+    if settings.PATH_FILTER_KALMAN_ENABLED:
+        kept = _kalman_smooth(kept, last)
+
+    return late + kept, stats
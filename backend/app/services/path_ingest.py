@@ -0,0 +1,256 @@
+"""
+Path point ingest service for bulk writes of uploaded location batches
+"""
+from typing import Any, Dict, List, Tuple
+import uuid
+
+import numpy as np
+from sqlalchemy import text
+from sqlalchemy.orm import Session
+
+from app.models.path import Path
+from app.schemas.path import PathPointCreate
+from app.services.incident_index import incident_index
+from app.services.path_filters import filter_path_points
+from app.services.path_limits import enforce_point_limit
+from app.services.path_metrics import haversine_array, point_arrays
+from app.services.safe_corridors import find_corridor_deviation
+from app.services.trip_segments import update_trip_segments
+
+# Whole batch is sent as one column array per field and expanded server-side
+# with unnest(), so a batch costs a single statement and a single round trip.
+# Points already stored for the path (a retried upload) hit the unique
+# (path_id, timestamp) constraint and are skipped.
+BULK_INSERT_PATH_POINTS_SQL = text("""
+    INSERT INTO path_points (path_id, location, accuracy, altitude, speed, heading, timestamp)
+    SELECT
+        CAST(:path_id AS uuid),
+        ST_SetSRID(ST_MakePoint(t.longitude, t.latitude), 4326)::geography,
+        t.accuracy,
+        t.altitude,
+        t.speed,
+        t.heading,
+        t.timestamp
+    FROM unnest(
+        CAST(:longitudes AS double precision[]),
+        CAST(:latitudes AS double precision[]),
+        CAST(:accuracies AS double precision[]),
+        CAST(:altitudes AS double precision[]),
+        CAST(:speeds AS double precision[]),
+        CAST(:headings AS double precision[]),
+        CAST(:timestamps AS timestamp[])
+    ) AS t(longitude, latitude, accuracy, altitude, speed, heading, timestamp)
+    ON CONFLICT ON CONSTRAINT uq_path_points_path_id_timestamp DO NOTHING
+    RETURNING timestamp
+""")
+
+
+def bulk_insert_path_points(db: Session, path_id: uuid.UUID, points: List[PathPointCreate]) -> List[PathPointCreate]:
+    """
+    Insert a batch of path points with a single multi-row INSERT
+
+    No ORM objects or WKT strings are created; geometries are built
+    in PostgreSQL with ST_MakePoint. The insert is idempotent: points whose
+    timestamp is already stored for the path are skipped, so a retried
+    batch adds nothing.
+
+    Args:
+        db: Database session
+        path_id: Path ID
+        points: Uploaded location points
+
+    Returns:
+        The points that were actually inserted
+    """
+    if not points:
+        return []
+
+    result = db.execute(
+        BULK_INSERT_PATH_POINTS_SQL,
+        {
+            "path_id": str(path_id),
+            "longitudes": [p.longitude for p in points],
+            "latitudes": [p.latitude for p in points],
+            "accuracies": [p.accuracy for p in points],
+            "altitudes": [p.altitude for p in points],
+            "speeds": [p.speed for p in points],
+            "headings": [p.heading for p in points],
+            "timestamps": [p.timestamp for p in points],
+        }
+    )
+
+    inserted = set(result.scalars().all())
+    if len(inserted) == len(points):
+        return list(points)
+
+    stored = []
+    for p in points:
+        if p.timestamp in inserted:
+            stored.append(p)
+            # Repeats of a timestamp within the batch were skipped as well
+            inserted.discard(p.timestamp)
+    return stored
+
+
+def update_path_statistics(path: Path, points: List[PathPointCreate]) -> None:
+    """
+    Fold a batch of points into the running aggregates stored on the path
+
+    Points are chained onto the last stored point in timestamp order, so
+    the path's distance, bounding box and speeds stay current without
+    re-reading earlier points. Late points older than the last stored one
+    are counted and widen the bounding box but do not add distance; the
+    exact value is rebuilt by recompute_path_statistics.
+
+    Args:
+        path: Path (should be locked for update by the caller)
+        points: Newly stored location points
+    """
+    if not points:
+        return
+
+    ordered = sorted(points, key=lambda p: p.timestamp)
+    latitudes, longitudes, timestamps = point_arrays(ordered)
+
+    distance = path.total_distance_meters or 0.0
+    last_lat = path.last_latitude
+    last_lon = path.last_longitude
+
+    # Only points after the last stored one extend the line
+    chained = np.ones(len(ordered), dtype=bool)
+    if path.last_point_time is not None:
+        chained = timestamps > np.datetime64(path.last_point_time, "us")
+
+    if chained.any():
+        line_lat = latitudes[chained]
+        line_lon = longitudes[chained]
+        if last_lat is not None and last_lon is not None:
+            line_lat = np.concatenate(([last_lat], line_lat))
+            line_lon = np.concatenate(([last_lon], line_lon))
+
+        distance += float(haversine_array(line_lat[:-1], line_lon[:-1], line_lat[1:], line_lon[1:]).sum())
+        last_lat, last_lon = float(line_lat[-1]), float(line_lon[-1])
+
+    min_lat = float(latitudes.min()) if path.min_latitude is None else min(path.min_latitude, float(latitudes.min()))
+    min_lon = float(longitudes.min()) if path.min_longitude is None else min(path.min_longitude, float(longitudes.min()))
+    max_lat = float(latitudes.max()) if path.max_latitude is None else max(path.max_latitude, float(latitudes.max()))
+    max_lon = float(longitudes.max()) if path.max_longitude is None else max(path.max_longitude, float(longitudes.max()))
+
+    max_speed = path.max_speed_mps
+    speeds = [p.speed for p in ordered if p.speed is not None]
+    if speeds and (max_speed is None or max(speeds) > max_speed):
+        max_speed = max(speeds)
+
+    if path.first_point_time is None or ordered[0].timestamp < path.first_point_time:
+        path.first_point_time = ordered[0].timestamp
+    if path.last_point_time is None or ordered[-1].timestamp >= path.last_point_time:
+        path.last_point_time = ordered[-1].timestamp
+
+    path.point_count = (path.point_count or 0) + len(ordered)
+    path.total_distance_meters = distance
+    path.max_speed_mps = max_speed
+    path.last_latitude = last_lat
+    path.last_longitude = last_lon
+    path.min_latitude = min_lat
+    path.min_longitude = min_lon
+    path.max_latitude = max_lat
+    path.max_longitude = max_lon
+
+    elapsed = (path.last_point_time - path.first_point_time).total_seconds()
+    path.average_speed_mps = distance / elapsed if elapsed > 0 else 0.0
+
+
+RECOMPUTE_PATH_STATISTICS_SQL = text("""
+    SELECT
+        count(*) AS point_count,
+        min(timestamp) AS first_point_time,
+        max(timestamp) AS last_point_time,
+        CASE WHEN count(*) > 1
+            THEN ST_Length(ST_MakeLine(location::geometry ORDER BY timestamp)::geography)
+            ELSE 0
+        END AS total_distance_meters,
+        max(speed) AS max_speed_mps,
+        min(ST_Y(location::geometry)) AS min_latitude,
+        min(ST_X(location::geometry)) AS min_longitude,
+        max(ST_Y(location::geometry)) AS max_latitude,
+        max(ST_X(location::geometry)) AS max_longitude,
+        (array_agg(ST_Y(location::geometry) ORDER BY timestamp DESC))[1] AS last_latitude,
+        (array_agg(ST_X(location::geometry) ORDER BY timestamp DESC))[1] AS last_longitude
+    FROM path_points
+    WHERE path_id = CAST(:path_id AS uuid)
+""")
+
+
+def recompute_path_statistics(db: Session, path: Path) -> None:
+    """
+    Rebuild the path aggregates from the stored points with PostGIS
+
+    Used for paths recorded before aggregates were maintained at ingest
+    time, and as the reference when checking the incremental values.
+
+    Args:
+        db: Database session
+        path: Path
+    """
+    row = db.execute(RECOMPUTE_PATH_STATISTICS_SQL, {"path_id": str(path.id)}).mappings().one()
+
+    for field, value in row.items():
+        setattr(path, field, value)
+
+    elapsed = 0.0
+    if path.first_point_time and path.last_point_time:
+        elapsed = (path.last_point_time - path.first_point_time).total_seconds()
+    path.average_speed_mps = path.total_distance_meters / elapsed if elapsed > 0 else 0.0
+
+
+def store_path_points(
+    db: Session,
+    path: Path,
+    points: List[PathPointCreate]
+) -> Tuple[List[PathPointCreate], Dict[str, Any]]:
+    """
+    Run an uploaded batch through the ingest pipeline
+
+    Filters the batch, bulk inserts what is left, advances stay detection,
+    folds the inserted points into the path aggregates, thins older
+    points if the path went over its point budget, checks the batch
+    against the path's safe corridor and looks up active emergency reports
+    nearby in the worker's incident index. Shared by the REST batch upload
+    and the WebSocket stream; the caller commits.
+
+    Args:
+        db: Database session
+        path: Path (should be locked for update by the caller)
+        points: Uploaded location points
+
+    Returns:
+        Tuple of (inserted points, batch summary with received, accepted,
+        duplicates, downsampled, corridor check, per-stage filtered
+        counts and proximity warnings)
+    """
+    # Drop duplicates, bad fixes and jitter before anything is stored
+    stationary = []
+    accepted, filtered = filter_path_points(path, points, stationary)
+
+    # Points already stored by an earlier attempt of the same batch are skipped
+    inserted = bulk_insert_path_points(db, path.id, accepted)
+    # Continues from the previous last point, so before the aggregates move on
+    update_trip_segments(db, path, inserted, stationary)
+    update_path_statistics(path, inserted)
+
+    # Over-long paths are thinned, never rejected
+    downsampled = enforce_point_limit(db, path)
+
+    outside_corridor, deviation = find_corridor_deviation(db, path, inserted)
+
+    summary = {
+        "received": len(points),
+        "accepted": len(inserted),
+        "duplicates": filtered.pop("duplicates") + len(accepted) - len(inserted),
+        "downsampled": downsampled,
+        "outside_corridor": outside_corridor,
+        "corridor_deviation": deviation is not None,
+        "filtered": filtered,
+        "warnings": incident_index.warnings_for(inserted),
+    }
+    return inserted, summary
@@ -0,0 +1,94 @@
+"""
+Point budget policy for paths that are still being recorded
+
+A path may hold at most PATH_TRACKING_MAX_POINTS points. When an upload
+takes it over the limit, nothing is rejected: the older part of the path
+is thinned instead, while the newest PATH_TRACKING_RECENT_POINTS stay at
+full resolution. Each pass keeps every n-th point of the older part, with
+the stride chosen so that one pass brings the path back under its target,
+so points that have been through several passes are progressively sparser
+than points that were recent at the last one.
+
+The thinned part ends at paths.thinned_until. Points older than that are
+refused at ingest (see app.services.path_filters), otherwise a retried
+batch would bring back the very points a pass removed.
+"""
+from sqlalchemy import text
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.models.path import Path
+
+RECENT_WINDOW_START_SQL = text("""
+    SELECT timestamp
+    FROM path_points
+    WHERE path_id = CAST(:path_id AS uuid)
+    ORDER BY timestamp DESC
+    OFFSET :recent LIMIT 1
+""")
+
+# Keeps rows 1, 1 + stride, 1 + 2 * stride, ... of the older points, with
+# the stride that removes at least :excess of them (the first point of the
+# path is always kept); one scan of the older points
+THIN_OLDER_POINTS_SQL = text("""
+    DELETE FROM path_points p
+    USING (
+        SELECT id, timestamp
+        FROM (
+            SELECT id, timestamp,
+                   row_number() OVER (ORDER BY timestamp, id) AS n,
+                   count(*) OVER () AS total
+            FROM path_points
+            WHERE path_id = CAST(:path_id AS uuid)
+              AND timestamp < :recent_start
+        ) ranked
+        WHERE (n - 1) % ceil(total::numeric / GREATEST(total - :excess, 1))::bigint <> 0
+    ) thinned
+    WHERE p.path_id = CAST(:path_id AS uuid)
+      AND p.id = thinned.id
+      AND p.timestamp = thinned.timestamp
+""")
+
+
+def enforce_point_limit(db: Session, path: Path) -> int:
+    """
+    Thin the older points of a path that is over its point budget
+
+    Works from the running point_count, so paths under the limit cost
+    nothing. Once over it, the older points are thinned in a single pass
+    to bring the path back under PATH_TRACKING_DOWNSAMPLE_TARGET of the
+    limit, which leaves room for many further batches before the next pass,
+    and the thinned range is recorded in path.thinned_until. Distance,
+    speeds and bounding box keep their recorded values.
+
+    Args:
+        db: Database session
+        path: Path (should be locked for update by the caller)
+
+    Returns:
+        Number of points removed
+    """
+    if not path.point_count or path.point_count <= settings.PATH_TRACKING_MAX_POINTS:
+        return 0
+
+    target = int(settings.PATH_TRACKING_MAX_POINTS * settings.PATH_TRACKING_DOWNSAMPLE_TARGET)
+    params = {"path_id": str(path.id)}
+
+    # Everything from the oldest of the recent points on stays untouched
+    recent_start = db.execute(
+        RECENT_WINDOW_START_SQL,
+        {**params, "recent": settings.PATH_TRACKING_RECENT_POINTS - 1}
+    ).scalar()
+    if recent_start is None:
+        return 0
+
+    removed = db.execute(THIN_OLDER_POINTS_SQL, {
+        **params,
+        "recent_start": recent_start,
+        "excess": path.point_count - target,
+    }).rowcount
+    path.point_count -= removed
+    if path.thinned_until is None or recent_start > path.thinned_until:
+        path.thinned_until = recent_start
+
+    return removed
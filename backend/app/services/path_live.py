@@ -0,0 +1,112 @@
+"""
+Live path updates published to Redis pub/sub for shared-path followers
+"""
+import json
+import logging
+from typing import Iterable, List, Optional, Tuple
+import uuid
+
+import redis
+
+from app.core.redis import redis_client
+from app.schemas.path import PathPointCreate
+
+logger = logging.getLogger(__name__)
+
+PATH_POINTS_CHANNEL = "path_points:{path_id}"
+
+
+def path_channel(path_id: uuid.UUID) -> str:
+    """Pub/sub channel carrying live updates of one path"""
+    return PATH_POINTS_CHANNEL.format(path_id=path_id)
+
+
+def point_to_dict(point: PathPointCreate) -> dict:
+    """Serialize an ingested point for a live update"""
+    return {
+        "latitude": point.latitude,
+        "longitude": point.longitude,
+        "accuracy": point.accuracy,
+        "altitude": point.altitude,
+        "speed": point.speed,
+        "heading": point.heading,
+        "timestamp": point.timestamp.isoformat(),
+    }
+
+
+def row_to_dict(row: Tuple) -> dict:
+    """Serialize a stored point row (POINT_COLUMNS order) for a live update"""
+    _, latitude, longitude, accuracy, altitude, speed, heading, timestamp = row
+    return {
+        "latitude": latitude,
+        "longitude": longitude,
+        "accuracy": accuracy,
+        "altitude": altitude,
+        "speed": speed,
+        "heading": heading,
+        "timestamp": timestamp.isoformat(),
+    }
+
+
+def _publish(path_id: uuid.UUID, message: dict) -> None:
+    """Publish to the path channel; followers resync on reconnect if this fails"""
+    try:
+        redis_client.publish(path_channel(path_id), message)
+    except redis.RedisError as e:
+        logger.warning(f"Live path update not published: {e}")
+
+
+def publish_path_points(path_id: uuid.UUID, points: List[PathPointCreate]) -> None:
+    """
+    Publish newly stored points once, after the transaction committed
+
+    Args:
+        path_id: Path ID
+        points: Inserted points
+    """
+    if points:
+        _publish(path_id, {"type": "points", "points": [point_to_dict(p) for p in points]})
+
+
+def publish_path_ended(path_id: uuid.UUID) -> None:
+    """
+    Tell followers that the path was stopped or deleted
+
+    Args:
+        path_id: Path ID
+    """
+    _publish(path_id, {"type": "end"})
+
+
+def format_sse(event: str, data: str, event_id: Optional[str] = None) -> str:
+    """
+    Format one server-sent event
+
+    Args:
+        event: Event name
+        data: Event data (single line)
+        event_id: Optional event ID, sent back by clients as Last-Event-ID
+
+    Returns:
+        Event text
+    """
+    lines = []
+    if event_id is not None:
+        lines.append(f"id: {event_id}")
+    lines.append(f"event: {event}")
+    lines.append(f"data: {data}")
+    return "\n".join(lines) + "\n\n"
+
+
+def points_event(points: Iterable[dict]) -> str:
+    """
+    Format a points event; its ID is the last point timestamp
+
+    Args:
+        points: Serialized points in timestamp order
+
+    Returns:
+        Event text
+    """
+    points = list(points)
+    return format_sse("points", json.dumps({"points": points}, separators=(",", ":")), points[-1]["timestamp"])
@@ -0,0 +1,134 @@
+"""
+Vectorized batch validation and geodesic metrics for uploaded path points
+
+An uploaded batch is turned into NumPy arrays once, and coordinate checks,
+consecutive haversine distances and speeds are computed as whole-array
+operations instead of per-point Python loops.
+"""
+from datetime import datetime, timedelta
+from typing import List, Optional, Tuple
+
+import numpy as np
+
+from app.schemas.path import PathPointCreate
+from app.services.geo import EARTH_RADIUS_METERS
+
+UNIX_EPOCH = datetime(1970, 1, 1)
+ONE_MICROSECOND = timedelta(microseconds=1)
+
+
+def point_arrays(points: List[PathPointCreate]) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Coordinates and timestamps of a batch as arrays
+
+    Timestamps go through integer microseconds since the epoch: letting
+    NumPy convert datetime objects one by one costs more than all of the
+    metrics computed from them.
+
+    Args:
+        points: Path points (naive UTC timestamps, as PathPointCreate
+            stores them)
+
+    Returns:
+        Tuple of (latitudes, longitudes, timestamps as datetime64[us])
+    """
+    latitudes = np.fromiter((p.latitude for p in points), dtype=np.float64, count=len(points))
+    longitudes = np.fromiter((p.longitude for p in points), dtype=np.float64, count=len(points))
+    timestamps = np.fromiter(
+        ((p.timestamp - UNIX_EPOCH) // ONE_MICROSECOND for p in points),
+        dtype=np.int64,
+        count=len(points)
+    ).view("datetime64[us]")
+    return latitudes, longitudes, timestamps
+
+
+def haversine_array(
+    lat1: np.ndarray,
+    lon1: np.ndarray,
+    lat2: np.ndarray,
+    lon2: np.ndarray
+) -> np.ndarray:
+    """
+    Element-wise great-circle distance between WGS84 coordinates
+
+    Args:
+        lat1: Latitudes of the first points
+        lon1: Longitudes of the first points
+        lat2: Latitudes of the second points
+        lon2: Longitudes of the second points
+
+    Returns:
+        Distances in meters
+    """
+    phi1 = np.radians(lat1)
+    phi2 = np.radians(lat2)
+    d_phi = phi2 - phi1
+    d_lambda = np.radians(lon2 - lon1)
+
+    a = np.sin(d_phi / 2) ** 2 + np.cos(phi1) * np.cos(phi2) * np.sin(d_lambda / 2) ** 2
+    return 2 * EARTH_RADIUS_METERS * np.arcsin(np.minimum(1.0, np.sqrt(a)))
+
+
+def valid_coordinates(latitudes: np.ndarray, longitudes: np.ndarray) -> np.ndarray:
+    """
+    Mask of finite coordinates within WGS84 bounds
+
+    Args:
+        latitudes: Latitudes
+        longitudes: Longitudes
+
+    Returns:
+        Boolean mask, True for usable coordinates
+    """
+    return (
+        np.isfinite(latitudes)
+        & np.isfinite(longitudes)
+        & (np.abs(latitudes) <= 90.0)
+        & (np.abs(longitudes) <= 180.0)
+    )
+
+
+def consecutive_metrics(
+    latitudes: np.ndarray,
+    longitudes: np.ndarray,
+    timestamps: np.ndarray,
+    last: Optional[Tuple[float, float, object]] = None
+) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Distance and elapsed time from each point to the one before it
+
+    Args:
+        latitudes: Latitudes in timestamp order
+        longitudes: Longitudes in timestamp order
+        timestamps: Timestamps (datetime64) in ascending order
+        last: (latitude, longitude, timestamp) the batch continues from;
+            without it the first point has no predecessor
+
+    Returns:
+        Tuple of (distances in meters, elapsed seconds), one entry per
+        point that has a predecessor
+    """
+    if last is not None:
+        latitudes = np.concatenate(([last[0]], latitudes))
+        longitudes = np.concatenate(([last[1]], longitudes))
+        timestamps = np.concatenate((np.array([last[2]], dtype="datetime64[us]"), timestamps))
+
+    distances = haversine_array(latitudes[:-1], longitudes[:-1], latitudes[1:], longitudes[1:])
+    elapsed = np.diff(timestamps) / np.timedelta64(1, "s")
+    return distances, elapsed
+
+
+def segment_speeds(distances: np.ndarray, elapsed: np.ndarray) -> np.ndarray:
+    """
+    Speeds over consecutive segments
+
+    Args:
+        distances: Segment lengths in meters
+        elapsed: Segment durations in seconds
+
+    Returns:
+        Speeds in m/s; infinite where no time elapsed
+    """
+    with np.errstate(divide="ignore", invalid="ignore"):
+        speeds = distances / elapsed
+    return np.where(elapsed > 0, speeds, np.inf)
@@ -0,0 +1,310 @@
+"""
+Path point readers that work on plain columns instead of ORM instances
+
+Readers take the Path so archived paths are decoded from their compressed
+segment and live paths are read from path_points, transparently.
+"""
+from datetime import datetime, timezone
+from bisect import bisect_left, bisect_right
+from typing import Dict, Iterator, List, Optional, Tuple
+import base64
+import uuid
+
+from geoalchemy2 import Geometry
+from sqlalchemy import BigInteger, any_, bindparam, cast, func, tuple_
+from sqlalchemy.dialects.postgresql import ARRAY
+from sqlalchemy.orm import Query, Session
+
+from app.core.config import settings
+from app.models.path import Path, PathPoint, PathSegment
+from app.services.path_segments import decode_segment
+
+POINT_COLUMNS = ("id", "latitude", "longitude", "accuracy", "altitude", "speed", "heading", "timestamp")
+
+
+def path_points_query(
+    db: Session,
+    path_id: uuid.UUID,
+    point_ids: Optional[List[int]] = None
+) -> Query:
+    """
+    Build a query returning point rows as plain tuples in POINT_COLUMNS order
+
+    Coordinates are read with ST_Y/ST_X in the database, so no geometry
+    objects are decoded in Python.
+
+    Args:
+        db: Database session
+        path_id: Path ID
+        point_ids: Optional subset of point IDs (e.g. a simplification level)
+
+    Returns:
+        Query ordered by timestamp (ties broken by id)
+    """
+    query = db.query(
+        PathPoint.id,
+        func.ST_Y(cast(PathPoint.location, Geometry)).label("latitude"),
+        func.ST_X(cast(PathPoint.location, Geometry)).label("longitude"),
+        PathPoint.accuracy,
+        PathPoint.altitude,
+        PathPoint.speed,
+        PathPoint.heading,
+        PathPoint.timestamp
+    ).filter(PathPoint.path_id == path_id)
+
+    if point_ids is not None:
+        query = query.filter(PathPoint.id == any_(
+            bindparam("point_ids", point_ids, type_=ARRAY(BigInteger))
+        ))
+
+    return query.order_by(PathPoint.timestamp, PathPoint.id)
+
+
+def load_segment_rows(
+    db: Session,
+    path: Path,
+    point_ids: Optional[List[int]] = None
+) -> List[Tuple]:
+    """
+    Decode the archived points of a path
+
+    Args:
+        db: Database session
+        path: Archived path
+        point_ids: Optional subset of point IDs
+
+    Returns:
+        Row tuples in POINT_COLUMNS order, sorted by timestamp
+    """
+    data = db.query(PathSegment.data).filter(PathSegment.path_id == path.id).scalar()
+    if data is None:
+        return []
+
+    rows = decode_segment(data)
+    if point_ids is not None:
+        wanted = set(point_ids)
+        rows = [row for row in rows if row[0] in wanted]
+
+    return rows
+
+
+def load_point_rows(
+    db: Session,
+    path: Path,
+    point_ids: Optional[List[int]] = None
+) -> List[Tuple]:
+    """
+    Load path points as row tuples
+
+    Args:
+        db: Database session
+        path: Path
+        point_ids: Optional subset of point IDs
+
+    Returns:
+        Row tuples in POINT_COLUMNS order, sorted by timestamp
+    """
+    if path.archived_at is not None:
+        return load_segment_rows(db, path, point_ids)
+
+    return [tuple(row) for row in path_points_query(db, path.id, point_ids).all()]
+
+
+def load_point_columns(
+    db: Session,
+    path: Path,
+    point_ids: Optional[List[int]] = None
+) -> Dict[str, list]:
+    """
+    Load path points as one list per column
+
+    Args:
+        db: Database session
+        path: Path
+        point_ids: Optional subset of point IDs
+
+    Returns:
+        Dict mapping each name in POINT_COLUMNS to its values
+    """
+    rows = load_point_rows(db, path, point_ids)
+
+    if not rows:
+        return {name: [] for name in POINT_COLUMNS}
+
+    return dict(zip(POINT_COLUMNS, (list(column) for column in zip(*rows))))
+
+
+def iter_point_chunks(
+    db: Session,
+    path: Path,
+    point_ids: Optional[List[int]] = None,
+    chunk_size: Optional[int] = None
+) -> Iterator[List[Tuple]]:
+    """
+    Stream point rows in chunks through a server-side cursor
+
+    Only one chunk of rows is held in memory at a time, whatever the
+    path length. Archived paths are a single bounded segment and are
+    decoded in one go.
+
+    Args:
+        db: Database session
+        path: Path
+        point_ids: Optional subset of point IDs
+        chunk_size: Rows fetched per round trip
+
+    Yields:
+        Lists of row tuples in POINT_COLUMNS order
+    """
+    chunk_size = chunk_size or settings.PATH_STREAM_CHUNK_SIZE
+
+    if path.archived_at is not None:
+        rows = load_segment_rows(db, path, point_ids)
+        for offset in range(0, len(rows), chunk_size):
+            yield rows[offset:offset + chunk_size]
+        return
+
+    query = path_points_query(db, path.id, point_ids).yield_per(chunk_size)
+
+    chunk = []
+    for row in query:
+        chunk.append(tuple(row))
+        if len(chunk) >= chunk_size:
+            yield chunk
+            chunk = []
+
+    if chunk:
+        yield chunk
+
+
+def encode_point_cursor(timestamp: datetime, point_id: int) -> str:
+    """
+    Build an opaque keyset cursor from the last returned point
+
+    Args:
+        timestamp: Point timestamp
+        point_id: Point ID
+
+    Returns:
+        URL-safe cursor string
+    """
+    raw = f"{timestamp.isoformat()}|{point_id}"
+    return base64.urlsafe_b64encode(raw.encode()).decode().rstrip("=")
+
+
+def decode_point_cursor(cursor: str) -> Tuple[datetime, int]:
+    """
+    Decode a keyset cursor
+
+    Args:
+        cursor: Cursor from encode_point_cursor
+
+    Returns:
+        Tuple of (timestamp, point ID)
+
+    Raises:
+        ValueError: If the cursor is malformed
+    """
+    padded = cursor + "=" * (-len(cursor) % 4)
+    try:
+        raw = base64.urlsafe_b64decode(padded.encode()).decode()
+        timestamp, point_id = raw.split("|")
+        return datetime.fromisoformat(timestamp), int(point_id)
+    except (ValueError, UnicodeDecodeError) as e:
+        raise ValueError("Invalid cursor") from e
+
+
+def _utc_naive(value: Optional[datetime]) -> Optional[datetime]:
+    """Stored timestamps are naive UTC; convert aware bounds to match"""
+    if value is not None and value.tzinfo is not None:
+        value = value.astimezone(timezone.utc).replace(tzinfo=None)
+    return value
+
+
+def load_point_page(
+    db: Session,
+    path: Path,
+    limit: int,
+    cursor: Optional[str] = None,
+    start: Optional[datetime] = None,
+    end: Optional[datetime] = None
+) -> Tuple[List[Tuple], Optional[str]]:
+    """
+    Load one keyset page of points, optionally within a time window
+
+    Pages seek on (timestamp, id) through the (path_id, timestamp) index,
+    so a deep page costs the same as the first one. Archived paths are
+    sliced by binary search over the decoded segment.
+
+    Args:
+        db: Database session
+        path: Path
+        limit: Page size
+        cursor: Cursor returned with the previous page
+        start: Inclusive lower timestamp bound (aware values are converted to UTC)
+        end: Exclusive upper timestamp bound (aware values are converted to UTC)
+
+    Returns:
+        Tuple of (rows in POINT_COLUMNS order, next cursor or None)
+
+    Raises:
+        ValueError: If the cursor is malformed
+    """
+    start = _utc_naive(start)
+    end = _utc_naive(end)
+
+    if path.archived_at is not None:
+        return _load_segment_page(db, path, limit, cursor, start, end)
+
+    query = path_points_query(db, path.id)
+
+    if start is not None:
+        query = query.filter(PathPoint.timestamp >= start)
+    if end is not None:
+        query = query.filter(PathPoint.timestamp < end)
+    if cursor:
+        after_timestamp, after_id = decode_point_cursor(cursor)
+        query = query.filter(tuple_(PathPoint.timestamp, PathPoint.id) > tuple_(after_timestamp, after_id))
+
+    # Fetch one extra row to learn whether another page exists
+    rows = query.limit(limit + 1).all()
+
+    next_cursor = None
+    if len(rows) > limit:
+        rows = rows[:limit]
+        last = rows[-1]
+        next_cursor = encode_point_cursor(last.timestamp, last.id)
+
+    return rows, next_cursor
+
+
+def _load_segment_page(
+    db: Session,
+    path: Path,
+    limit: int,
+    cursor: Optional[str],
+    start: Optional[datetime],
+    end: Optional[datetime]
+) -> Tuple[List[Tuple], Optional[str]]:
+    """Keyset page over an archived path's decoded segment"""
+    rows = load_segment_rows(db, path)
+    keys = [(row[7], row[0]) for row in rows]
+
+    lower = 0
+    if start is not None:
+        lower = bisect_left(keys, (start, float("-inf")))
+    if cursor:
+        lower = max(lower, bisect_right(keys, decode_point_cursor(cursor)))
+
+    upper = len(keys)
+    if end is not None:
+        upper = bisect_left(keys, (end, float("-inf")))
+
+    page = rows[lower:min(upper, lower + limit)]
+
+    next_cursor = None
+    if lower + limit < upper:
+        last = page[-1]
+        next_cursor = encode_point_cursor(last[7], last[0])
+
+    return page, next_cursor
@@ -0,0 +1,143 @@
+"""
+Compressed archival storage for completed paths
+
+A stopped path's points are packed into a single path_segments row:
+integer columns (IDs, 1e-7 degree coordinates, epoch milliseconds) are
+delta-encoded, optional measurements are kept at 0.1 precision, and the
+whole document is MessagePack'd and zlib-compressed.
+
+The encoding is lossy and the path_points rows are deleted once packed, so
+archived paths permanently keep only:
+
+* coordinates rounded to 1e-7 degrees (about 1 cm)
+* timestamps truncated to whole milliseconds
+* accuracy, altitude, speed and heading rounded to 0.1
+
+Exports, pages and anything recomputed from an archived path see these
+values.
+"""
+from datetime import datetime
+from typing import Dict, List, Optional, Sequence, Tuple
+import zlib
+
+import msgpack
+from sqlalchemy.orm import Session
+
+from app.models.path import Path, PathPoint, PathSegment
+from app.services.path_encoding import EPOCH, MILLISECOND, delta_encode, to_epoch_millis
+
+SEGMENT_ENCODING = "delta-msgpack-zlib/1"
+
+# 1e-7 degrees is ~1 cm, finer than any GPS fix
+COORDINATE_SCALE = 10_000_000
+MEASUREMENT_SCALE = 10
+
+
+def _delta_decode(deltas: Sequence[int]) -> List[int]:
+    """Undo delta_encode"""
+    values = []
+    total = 0
+    for delta in deltas:
+        total += delta
+        values.append(total)
+    return values
+
+
+def _scale_optional(values: Sequence[Optional[float]]) -> List[Optional[int]]:
+    """Quantize optional measurements to MEASUREMENT_SCALE, keeping None"""
+    return [None if v is None else int(round(v * MEASUREMENT_SCALE)) for v in values]
+
+
+def _unscale_optional(values: Sequence[Optional[int]]) -> List[Optional[float]]:
+    """Undo _scale_optional"""
+    return [None if v is None else v / MEASUREMENT_SCALE for v in values]
+
+
+def encode_segment(columns: Dict[str, list]) -> bytes:
+    """
+    Pack point columns into the compressed segment format
+
+    Lossy: see the module docstring for the precision kept.
+
+    Args:
+        columns: Point columns (see app.services.path_points.POINT_COLUMNS)
+
+    Returns:
+        Compressed segment bytes
+    """
+    document = {
+        "id": delta_encode(columns["id"]),
+        "latitude": delta_encode([int(round(v * COORDINATE_SCALE)) for v in columns["latitude"]]),
+        "longitude": delta_encode([int(round(v * COORDINATE_SCALE)) for v in columns["longitude"]]),
+        "timestamp": delta_encode(to_epoch_millis(columns["timestamp"])),
+        "accuracy": _scale_optional(columns["accuracy"]),
+        "altitude": _scale_optional(columns["altitude"]),
+        "speed": _scale_optional(columns["speed"]),
+        "heading": _scale_optional(columns["heading"]),
+    }
+    return zlib.compress(msgpack.packb(document), 9)
+
+
+def decode_segment(data: bytes) -> List[Tuple]:
+    """
+    Unpack a compressed segment into point rows
+
+    Args:
+        data: Segment bytes from encode_segment
+
+    Returns:
+        Row tuples in POINT_COLUMNS order, sorted by timestamp
+    """
+    document = msgpack.unpackb(zlib.decompress(data))
+
+    ids = _delta_decode(document["id"])
+    latitudes = [v / COORDINATE_SCALE for v in _delta_decode(document["latitude"])]
+    longitudes = [v / COORDINATE_SCALE for v in _delta_decode(document["longitude"])]
+    timestamps = [EPOCH + ms * MILLISECOND for ms in _delta_decode(document["timestamp"])]
+
+    return list(zip(
+        ids,
+        latitudes,
+        longitudes,
+        _unscale_optional(document["accuracy"]),
+        _unscale_optional(document["altitude"]),
+        _unscale_optional(document["speed"]),
+        _unscale_optional(document["heading"]),
+        timestamps,
+    ))
+
+
+def archive_path_points(db: Session, path: Path, columns: Dict[str, list]) -> Optional[PathSegment]:
+    """
+    Move a completed path's points into a compressed segment
+
+    The per-point rows (and their index entries) are deleted in the same
+    transaction.
+
+    Args:
+        db: Database session
+        path: Stopped path
+        columns: All of the path's point columns
+
+    Returns:
+        Created segment, or None if the path has no points
+    """
+    if not columns["id"]:
+        return None
+
+    data = encode_segment(columns)
+    segment = PathSegment(
+        path_id=path.id,
+        encoding=SEGMENT_ENCODING,
+        point_count=len(columns["id"]),
+        start_time=columns["timestamp"][0],
+        end_time=columns["timestamp"][-1],
+        size_bytes=len(data),
+        data=data
+    )
+    db.add(segment)
+
+    db.query(PathPoint).filter(PathPoint.path_id == path.id).delete(synchronize_session=False)
+    path.archived_at = datetime.utcnow()
+
+    return segment
@@ -0,0 +1,201 @@
+"""
+Multi-resolution path simplification (Douglas-Peucker)
+"""
+from typing import List, Optional, Sequence, Tuple
+import math
+
+from geoalchemy2 import Geometry
+from geoalchemy2.elements import WKTElement
+from sqlalchemy import cast, func
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.models.path import Path, PathPoint, PathSimplification
+from app.services.geo import EARTH_RADIUS_METERS
+
+# Web Mercator ground resolution at zoom 0 on the equator (meters per pixel)
+METERS_PER_PIXEL_ZOOM_0 = 156543.03392
+
+
+def douglas_peucker(xs: Sequence[float], ys: Sequence[float], tolerance: float) -> List[int]:
+    """
+    Simplify a polyline with the Douglas-Peucker algorithm
+
+    Args:
+        xs: X coordinates in meters
+        ys: Y coordinates in meters
+        tolerance: Maximum distance of a dropped vertex from the kept line, in meters
+
+    Returns:
+        Sorted indexes of the vertices to keep
+    """
+    n = len(xs)
+    if n <= 2:
+        return list(range(n))
+
+    keep = [False] * n
+    keep[0] = keep[n - 1] = True
+    tolerance_sq = tolerance * tolerance
+
+    # Iterative to stay clear of the recursion limit on 50k-point paths
+    stack = [(0, n - 1)]
+    while stack:
+        start, end = stack.pop()
+        if end - start < 2:
+            continue
+
+        ax, ay = xs[start], ys[start]
+        dx, dy = xs[end] - ax, ys[end] - ay
+        seg_len_sq = dx * dx + dy * dy
+
+        max_dist_sq = -1.0
+        index = start
+        for i in range(start + 1, end):
+            px, py = xs[i] - ax, ys[i] - ay
+            # Distance to the segment, not the infinite line, so detours
+            # beyond either end are kept
+            t = 0.0 if seg_len_sq == 0 else min(1.0, max(0.0, (px * dx + py * dy) / seg_len_sq))
+            ex, ey = px - t * dx, py - t * dy
+            dist_sq = ex * ex + ey * ey
+            if dist_sq > max_dist_sq:
+                max_dist_sq = dist_sq
+                index = i
+
+        if max_dist_sq > tolerance_sq:
+            keep[index] = True
+            stack.append((start, index))
+            stack.append((index, end))
+
+    return [i for i in range(n) if keep[i]]
+
+
+def project_to_meters(latitudes: Sequence[float], longitudes: Sequence[float]):
+    """
+    Project coordinates onto a local equirectangular plane in meters
+
+    Accurate enough for simplification tolerances over city-scale paths.
+
+    Args:
+        latitudes: Latitudes
+        longitudes: Longitudes
+
+    Returns:
+        Tuple of (xs, ys) in meters
+    """
+    if not latitudes:
+        return [], []
+
+    ref_lat = math.radians(sum(latitudes) / len(latitudes))
+    kx = math.cos(ref_lat) * math.radians(1) * EARTH_RADIUS_METERS
+    ky = math.radians(1) * EARTH_RADIUS_METERS
+
+    return [lon * kx for lon in longitudes], [lat * ky for lat in latitudes]
+
+
+def tolerance_for_zoom(zoom: int, latitude: float) -> float:
+    """
+    Map tolerance (one screen pixel) for a Web Mercator zoom level
+
+    Args:
+        zoom: Map zoom level
+        latitude: Latitude the map is centred on
+
+    Returns:
+        Tolerance in meters
+    """
+    return METERS_PER_PIXEL_ZOOM_0 * math.cos(math.radians(latitude)) / (2 ** zoom)
+
+
+def route_element(coordinates: Sequence[Tuple[float, float]]) -> Optional[WKTElement]:
+    """
+    Build the route line stored on a path from (latitude, longitude) pairs
+
+    Args:
+        coordinates: Coordinates in timestamp order
+
+    Returns:
+        LINESTRING element, or None for fewer than two points
+    """
+    if len(coordinates) < 2:
+        return None
+
+    vertices = ", ".join(f"{lon} {lat}" for lat, lon in coordinates)
+    return WKTElement(f"LINESTRING({vertices})", srid=4326)
+
+
+def build_path_simplifications(db: Session, path: Path) -> None:
+    """
+    Compute and store every configured simplification level for a path
+
+    Every level is simplified from the full point list, so each one
+    deviates from the recorded path by at most its own tolerance. The
+    finest level is also stored as the path route.
+
+    Args:
+        db: Database session
+        path: Path (typically just stopped)
+    """
+    rows = db.query(
+        PathPoint.id,
+        func.ST_Y(cast(PathPoint.location, Geometry)),
+        func.ST_X(cast(PathPoint.location, Geometry))
+    ).filter(
+        PathPoint.path_id == path.id
+    ).order_by(PathPoint.timestamp).all()
+
+    db.query(PathSimplification).filter(
+        PathSimplification.path_id == path.id
+    ).delete(synchronize_session=False)
+
+    if len(rows) < 3:
+        path.route = route_element([(r[1], r[2]) for r in rows])
+        return
+
+    ids = [r[0] for r in rows]
+    coordinates = [(r[1], r[2]) for r in rows]
+    xs, ys = project_to_meters([r[1] for r in rows], [r[2] for r in rows])
+
+    for level, tolerance in enumerate(sorted(settings.PATH_SIMPLIFICATION_TOLERANCES)):
+        kept = douglas_peucker(xs, ys, tolerance)
+
+        # The finest level doubles as the line drawn in map tiles
+        if level == 0:
+            path.route = route_element([coordinates[i] for i in kept])
+
+        db.add(PathSimplification(
+            path_id=path.id,
+            tolerance_meters=tolerance,
+            point_count=len(kept),
+            point_ids=[ids[i] for i in kept]
+        ))
+
+
+def find_path_simplification(
+    db: Session,
+    path: Path,
+    tolerance: Optional[float] = None,
+    zoom: Optional[int] = None
+) -> Optional[PathSimplification]:
+    """
+    Pick the coarsest stored level that stays within the requested tolerance
+
+    Args:
+        db: Database session
+        path: Path
+        tolerance: Requested tolerance in meters
+        zoom: Requested map zoom level (used when tolerance is not given)
+
+    Returns:
+        Matching simplification level, or None to serve the full path
+    """
+    if tolerance is None and zoom is not None:
+        latitude = ((path.min_latitude or 0.0) + (path.max_latitude or 0.0)) / 2
+        tolerance = tolerance_for_zoom(zoom, latitude)
+
+    if tolerance is None:
+        return None
+
+    return db.query(PathSimplification).filter(
+        PathSimplification.path_id == path.id,
+        PathSimplification.tolerance_meters <= tolerance
+    ).order_by(PathSimplification.tolerance_meters.desc()).first()
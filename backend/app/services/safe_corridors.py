@@ -0,0 +1,167 @@
+"""
+Safe corridors: buffered usual routes that live paths are checked against
+
+A corridor is precomputed once, when the user marks a frequent route as
+safe: the route lines of its most recent trips are buffered by the allowed
+deviation and merged into one polygon, stored with a spatial index. A path
+started on the corridor is then checked with a single containment query
+per ingested batch; a fix outside the polygon is more than buffer_meters
+away from every one of those trips.
+"""
+import logging
+from typing import List, Optional, Tuple
+import uuid
+
+import redis
+from sqlalchemy import Float, bindparam, text
+from sqlalchemy.dialects.postgresql import ARRAY
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.core.redis import redis_client
+from app.models.path import FrequentRoute, Path, SafeCorridor
+from app.schemas.path import PathPointCreate
+from app.tasks.alerts import send_corridor_deviation_alert
+
+logger = logging.getLogger(__name__)
+
+ALERT_COOLDOWN_KEY = "safe_corridor:alert:{path_id}"
+
+# Buffers are computed on geography (meters) and stored as geometry, so
+# containment tests reuse PostGIS' prepared-geometry cache
+BUILD_CORRIDOR_AREA_SQL = text("""
+    SELECT ST_Multi(ST_Union(ST_Buffer(recent.route, :buffer_meters)::geometry))
+    FROM (
+        SELECT route
+        FROM paths
+        WHERE route_id = CAST(:route_id AS uuid)
+          AND route IS NOT NULL
+        ORDER BY end_time DESC
+        LIMIT :max_paths
+    ) recent
+""")
+
+POINTS_OUTSIDE_CORRIDOR_SQL = text("""
+    SELECT t.n
+    FROM safe_corridors c
+    CROSS JOIN unnest(:longitudes, :latitudes) WITH ORDINALITY AS t(longitude, latitude, n)
+    WHERE c.id = CAST(:corridor_id AS uuid)
+      AND c.is_active
+      AND NOT ST_Covers(c.area, ST_SetSRID(ST_MakePoint(t.longitude, t.latitude), 4326))
+    ORDER BY t.n
+""").bindparams(
+    bindparam("longitudes", type_=ARRAY(Float)),
+    bindparam("latitudes", type_=ARRAY(Float))
+)
+
+
+def create_safe_corridor(
+    db: Session,
+    route: FrequentRoute,
+    buffer_meters: float,
+    name: Optional[str] = None
+) -> Optional[SafeCorridor]:
+    """
+    Precompute a corridor around a frequent route
+
+    Args:
+        db: Database session
+        route: Frequent route of the user
+        buffer_meters: Allowed deviation from the route
+        name: Display name
+
+    Returns:
+        New corridor, or None if the route has no stored trip lines
+    """
+    area = db.execute(BUILD_CORRIDOR_AREA_SQL, {
+        "route_id": str(route.id),
+        "buffer_meters": buffer_meters,
+        "max_paths": settings.SAFE_CORRIDOR_MAX_PATHS,
+    }).scalar()
+
+    if area is None:
+        return None
+
+    corridor = SafeCorridor(
+        user_id=route.user_id,
+        route_id=route.id,
+        name=name,
+        buffer_meters=buffer_meters,
+        area=area,
+        is_active=True
+    )
+    db.add(corridor)
+    return corridor
+
+
+def find_corridor_deviation(
+    db: Session,
+    path: Path,
+    points: List[PathPointCreate]
+) -> Tuple[int, Optional[PathPointCreate]]:
+    """
+    Check a stored batch against the path's safe corridor
+
+    A batch deviates when its latest point is outside the corridor and at
+    least SAFE_CORRIDOR_MIN_OUTSIDE_POINTS of its points (or all of a
+    smaller batch) are, so a single stray fix does not raise an alert.
+
+    Args:
+        db: Database session
+        path: Path followed on a safe corridor
+        points: Inserted points
+
+    Returns:
+        Tuple of (points outside the corridor, latest point if the batch
+        deviates, else None)
+    """
+    if path.safe_corridor_id is None or not points:
+        return 0, None
+
+    ordered = sorted(points, key=lambda p: p.timestamp)
+    outside = db.execute(POINTS_OUTSIDE_CORRIDOR_SQL, {
+        "corridor_id": str(path.safe_corridor_id),
+        "longitudes": [p.longitude for p in ordered],
+        "latitudes": [p.latitude for p in ordered],
+    }).scalars().all()
+
+    required = min(settings.SAFE_CORRIDOR_MIN_OUTSIDE_POINTS, len(ordered))
+    if outside and outside[-1] == len(ordered) and len(outside) >= required:
+        return len(outside), ordered[-1]
+
+    return len(outside), None
+
+
+def _claim_alert(path_id: uuid.UUID) -> bool:
+    """Take the alert slot of a path for SAFE_CORRIDOR_ALERT_COOLDOWN_SECONDS"""
+    try:
+        return bool(redis_client.client.set(
+            ALERT_COOLDOWN_KEY.format(path_id=path_id),
+            1,
+            nx=True,
+            ex=settings.SAFE_CORRIDOR_ALERT_COOLDOWN_SECONDS
+        ))
+    except redis.RedisError as e:
+        # Better a repeated alert than a missed one
+        logger.warning(f"Corridor alert cooldown unavailable: {e}")
+        return True
+
+
+def alert_corridor_deviation(path_id: uuid.UUID, point: PathPointCreate) -> None:
+    """
+    Queue an SMS alert to the owner's emergency contacts
+
+    At most one alert per path is sent within the cooldown; the SMS itself
+    goes out from a Celery worker so ingest never waits on the gateway.
+
+    Args:
+        path_id: Path that left its corridor
+        point: Latest point outside the corridor
+    """
+    if not _claim_alert(path_id):
+        return
+
+    try:
+        send_corridor_deviation_alert.delay(str(path_id), point.latitude, point.longitude)
+    except Exception as e:
+        logger.error(f"Failed to queue corridor deviation alert for path {path_id}: {e}")
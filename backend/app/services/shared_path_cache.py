@@ -0,0 +1,185 @@
+"""
+Redis cache for public shared-path payloads
+"""
+import logging
+from datetime import datetime
+from typing import Iterable, Optional
+import uuid
+
+import redis
+
+from app.core.config import settings
+from app.core.redis import redis_client
+
+logger = logging.getLogger(__name__)
+
+SHARE_TOKEN_KEY = "shared_path:token:{token}"
+PATH_VERSION_KEY = "path:version:{path_id}"
+PAYLOAD_KEY = "shared_path:payload:{path_id}:{version}:{variant}"
+
+
+def _ttl_until(expires_at: Optional[datetime]) -> int:
+    """Cache TTL capped by the share link expiry"""
+    ttl = settings.REDIS_CACHE_TTL
+    if expires_at is not None:
+        ttl = min(ttl, int((expires_at - datetime.utcnow()).total_seconds()))
+    return ttl
+
+
+def get_share(token: str) -> Optional[dict]:
+    """
+    Get the cached share token entry
+
+    Args:
+        token: Share token
+
+    Returns:
+        Dict with path_id and expires_at, or None on a miss
+    """
+    try:
+        entry = redis_client.get(SHARE_TOKEN_KEY.format(token=token))
+    except redis.RedisError as e:
+        logger.warning(f"Shared path cache unavailable: {e}")
+        return None
+
+    if not isinstance(entry, dict):
+        return None
+
+    return {
+        "path_id": uuid.UUID(entry["path_id"]),
+        "expires_at": datetime.fromisoformat(entry["expires_at"]) if entry["expires_at"] else None,
+    }
+
+
+def set_share(token: str, path_id: uuid.UUID, expires_at: Optional[datetime]) -> None:
+    """
+    Cache a share token entry until the link expires
+
+    Args:
+        token: Share token
+        path_id: Shared path ID
+        expires_at: Share link expiry
+    """
+    ttl = _ttl_until(expires_at)
+    if ttl <= 0:
+        return
+
+    try:
+        redis_client.set(
+            SHARE_TOKEN_KEY.format(token=token),
+            {"path_id": str(path_id), "expires_at": expires_at.isoformat() if expires_at else None},
+            ttl
+        )
+    except redis.RedisError as e:
+        logger.warning(f"Shared path cache unavailable: {e}")
+
+
+def get_path_version(path_id: uuid.UUID) -> Optional[int]:
+    """
+    Get the current cache version of a path
+
+    Args:
+        path_id: Path ID
+
+    Returns:
+        Version number, or None if Redis is unavailable
+    """
+    try:
+        version = redis_client.get_raw(PATH_VERSION_KEY.format(path_id=path_id))
+    except redis.RedisError as e:
+        logger.warning(f"Shared path cache unavailable: {e}")
+        return None
+
+    return int(version) if version else 0
+
+
+def get_payload(path_id: uuid.UUID, version: int, variant: str) -> Optional[str]:
+    """
+    Get a cached serialized shared-path payload
+
+    Args:
+        path_id: Path ID
+        version: Path cache version
+        variant: Request variant (format and simplification)
+
+    Returns:
+        Serialized payload, or None on a miss
+    """
+    try:
+        return redis_client.get_raw(PAYLOAD_KEY.format(path_id=path_id, version=version, variant=variant))
+    except redis.RedisError as e:
+        logger.warning(f"Shared path cache unavailable: {e}")
+        return None
+
+
+def set_payload(
+    path_id: uuid.UUID,
+    version: int,
+    variant: str,
+    payload: str,
+    expires_at: Optional[datetime]
+) -> None:
+    """
+    Cache a serialized shared-path payload
+
+    Args:
+        path_id: Path ID
+        version: Path cache version the payload was built at
+        variant: Request variant (format and simplification)
+        payload: Serialized payload
+        expires_at: Share link expiry
+    """
+    ttl = _ttl_until(expires_at)
+    if ttl <= 0:
+        return
+
+    try:
+        redis_client.set(PAYLOAD_KEY.format(path_id=path_id, version=version, variant=variant), payload, ttl)
+    except redis.RedisError as e:
+        logger.warning(f"Shared path cache unavailable: {e}")
+
+
+def invalidate_path(path_id: uuid.UUID) -> None:
+    """
+    Bump the path cache version so cached payloads and ETags go stale
+
+    Payloads cached under older versions expire on their own TTL.
+
+    Args:
+        path_id: Path ID
+    """
+    try:
+        redis_client.increment(PATH_VERSION_KEY.format(path_id=path_id))
+    except redis.RedisError as e:
+        logger.warning(f"Shared path cache invalidation failed for {path_id}: {e}")
+
+
+def forget_path(path_id: uuid.UUID, share_tokens: Iterable[str]) -> None:
+    """
+    Drop every cache entry of a deleted path
+
+    Args:
+        path_id: Path ID
+        share_tokens: Share tokens of the path
+    """
+    try:
+        redis_client.delete(PATH_VERSION_KEY.format(path_id=path_id))
+        for token in share_tokens:
+            redis_client.delete(SHARE_TOKEN_KEY.format(token=token))
+    except redis.RedisError as e:
+        logger.warning(f"Shared path cache invalidation failed for {path_id}: {e}")
+
+
+def build_etag(path_id: uuid.UUID, version: int, variant: str) -> str:
+    """
+    Build the ETag of a shared-path response
+
+    Args:
+        path_id: Path ID
+        version: Path cache version
+        variant: Request variant (format and simplification)
+
+    Returns:
+        Weak ETag header value
+    """
+    return f'W/"{path_id}-{version}-{variant}"'
@@ -0,0 +1,319 @@
+"""
+Anti-theft triggers received as inbound SMS
+
+The SMS gateway posts each inbound message to the webhook, which first
+checks that the gateway sent it (Twilio's request signature, or the shared
+secret in Africa's Talking's callback URL) and throttles each sender, so a
+keyword cannot be guessed by brute force. The sender is then resolved to its anti-theft configuration through a phone index cached in
+Redis (unknown senders are cached too, briefly), so a burst of messages
+does not turn into a burst of user lookups. The message is checked against
+the keyed HMAC of the trigger keyword in constant time, and gateway
+retries of a message that was already handled are dropped by message ID.
+"""
+import base64
+import hashlib
+import hmac
+import logging
+from typing import Mapping, Optional, Tuple
+import uuid
+
+import redis
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.core.redis import redis_client
+from app.core.security import keyword_hmac, verify_keyword, verify_keyword_hmac
+from app.models.anti_theft import AntiTheftConfig, AntiTheftEvent
+from app.models.user import User
+from app.schemas.user import normalize_phone
+
+logger = logging.getLogger(__name__)
+
+PHONE_INDEX_KEY = "anti_theft:phone:{phone}"
+MESSAGE_KEY = "sms_webhook:{provider}:{message_id}"
+SENDER_RATE_KEY = "sms_webhook:sender:{phone}"
+
+
+def twilio_signature(url: str, form: Mapping[str, str], auth_token: str) -> str:
+    """
+    Signature Twilio sends in X-Twilio-Signature for a form POST
+
+    Base64 HMAC-SHA1, keyed with the account auth token, of the full
+    callback URL followed by every form field name and value, sorted by
+    name.
+
+    Args:
+        url: Callback URL as configured in Twilio
+        form: Posted form fields
+        auth_token: Twilio auth token
+
+    Returns:
+        Expected signature
+    """
+    payload = url + "".join(f"{name}{form[name]}" for name in sorted(form))
+    digest = hmac.new(auth_token.encode(), payload.encode(), hashlib.sha1).digest()
+    return base64.b64encode(digest).decode()
+
+
+def verify_gateway_request(
+    provider: str,
+    url: str,
+    form: Mapping[str, str],
+    signature: Optional[str],
+    token: Optional[str]
+) -> bool:
+    """
+    Check that an inbound SMS callback comes from the gateway
+
+    Fails closed: a provider without a configured credential is refused.
+
+    Args:
+        provider: Gateway the payload claims to come from
+        url: Callback URL the request was made to
+        form: Posted form fields
+        signature: X-Twilio-Signature header
+        token: token query parameter
+
+    Returns:
+        True if the request is authentic
+    """
+    if provider == "twilio":
+        if not settings.TWILIO_AUTH_TOKEN or not signature:
+            return False
+        url = settings.SMS_WEBHOOK_PUBLIC_URL or url
+        return hmac.compare_digest(twilio_signature(url, form, settings.TWILIO_AUTH_TOKEN), signature)
+
+    if not settings.SMS_WEBHOOK_SECRET or not token:
+        return False
+    return hmac.compare_digest(settings.SMS_WEBHOOK_SECRET.encode(), token.encode())
+
+
+def allow_sender(phone: str) -> bool:
+    """
+    Count a message against the sender's SMS_WEBHOOK_SENDER_LIMIT
+
+    Args:
+        phone: Normalized sender phone number
+
+    Returns:
+        False once the sender went over the limit within the window
+    """
+    key = SENDER_RATE_KEY.format(phone=phone)
+
+    try:
+        count = redis_client.increment(key)
+        if count == 1:
+            redis_client.expire(key, settings.SMS_WEBHOOK_SENDER_WINDOW_SECONDS)
+    except redis.RedisError as e:
+        # Requests are still authenticated, so an outage is not an open door
+        logger.warning(f"SMS webhook throttling unavailable: {e}")
+        return True
+
+    return count <= settings.SMS_WEBHOOK_SENDER_LIMIT
+
+
+def parse_inbound_sms(form: dict) -> Optional[Tuple[str, str, str, Optional[str]]]:
+    """
+    Read an inbound SMS from an Africa's Talking or Twilio form payload
+
+    Args:
+        form: Posted form fields
+
+    Returns:
+        Tuple of (provider, normalized sender, text, message ID), or None
+        if the payload is not an inbound SMS
+    """
+    if "MessageSid" in form or "Body" in form:
+        provider, sender, text, message_id = "twilio", form.get("From"), form.get("Body"), form.get("MessageSid")
+    else:
+        provider, sender, text, message_id = "africastalking", form.get("from"), form.get("text"), form.get("id")
+
+    if not sender or text is None:
+        return None
+
+    return provider, normalize_phone(sender), text, message_id or None
+
+
+def claim_message(provider: str, message_id: Optional[str]) -> bool:
+    """
+    Record a message as handled, returning False for gateway retries
+
+    Args:
+        provider: SMS gateway
+        message_id: Gateway message ID
+
+    Returns:
+        True if the message has not been seen before
+    """
+    if message_id is None:
+        return True
+
+    try:
+        return bool(redis_client.client.set(
+            MESSAGE_KEY.format(provider=provider, message_id=message_id),
+            1,
+            nx=True,
+            ex=settings.SMS_WEBHOOK_DEDUPE_TTL
+        ))
+    except redis.RedisError as e:
+        # An active event is reused, so a retry cannot start a second one
+        logger.warning(f"SMS webhook dedupe unavailable: {e}")
+        return True
+
+
+def release_message(provider: str, message_id: Optional[str]) -> None:
+    """
+    Forget a claimed message that could not be handled so its retry is processed
+
+    Args:
+        provider: SMS gateway
+        message_id: Gateway message ID
+    """
+    if message_id is None:
+        return
+
+    try:
+        redis_client.client.delete(MESSAGE_KEY.format(provider=provider, message_id=message_id))
+    except redis.RedisError as e:
+        logger.warning(f"SMS webhook dedupe unavailable: {e}")
+
+
+def _load_phone_entry(db: Session, phone: str) -> dict:
+    """Index entry of a phone number read from the database (stored normalized)"""
+    row = db.query(
+        AntiTheftConfig.id,
+        AntiTheftConfig.user_id,
+        AntiTheftConfig.is_enabled,
+        AntiTheftConfig.trigger_keyword_hmac,
+        AntiTheftConfig.trigger_keyword_hash
+    ).join(User, User.id == AntiTheftConfig.user_id).filter(
+        User.phone_number == phone,
+        User.is_active == True
+    ).first()
+
+    if row is None:
+        return {}
+
+    config_id, user_id, is_enabled, digest, legacy_hash = row
+    return {
+        "config_id": str(config_id),
+        "user_id": str(user_id),
+        "is_enabled": bool(is_enabled),
+        "keyword_hmac": digest,
+        "keyword_hash": legacy_hash,
+    }
+
+
+def resolve_phone(db: Session, phone: str) -> Optional[dict]:
+    """
+    Anti-theft configuration of the user with this phone number
+
+    Args:
+        db: Database session
+        phone: Normalized sender phone number
+
+    Returns:
+        Index entry with config_id, user_id, is_enabled and the keyword
+        digests, or None if no user with anti-theft has this number
+    """
+    key = PHONE_INDEX_KEY.format(phone=phone)
+
+    try:
+        cached = redis_client.get(key)
+    except redis.RedisError as e:
+        logger.warning(f"SMS trigger index unavailable: {e}")
+        return _load_phone_entry(db, phone) or None
+
+    if cached is None:
+        entry = _load_phone_entry(db, phone)
+        ttl = settings.SMS_TRIGGER_INDEX_TTL if entry else settings.SMS_TRIGGER_UNKNOWN_PHONE_TTL
+        try:
+            redis_client.set(key, entry, ttl)
+        except redis.RedisError as e:
+            logger.warning(f"SMS trigger index unavailable: {e}")
+        cached = entry
+
+    return cached or None
+
+
+def invalidate_phone_index(*phones: Optional[str]) -> None:
+    """
+    Drop cached index entries after a phone number or configuration change
+
+    Args:
+        phones: Phone numbers whose entries are stale
+    """
+    keys = [PHONE_INDEX_KEY.format(phone=normalize_phone(phone)) for phone in phones if phone]
+    if not keys:
+        return
+
+    try:
+        redis_client.client.delete(*keys)
+    except redis.RedisError as e:
+        logger.warning(f"SMS trigger index invalidation failed: {e}")
+
+
+def _keyword_matches(db: Session, phone: str, entry: dict, text: str) -> bool:
+    """
+    Check the message against the keyword, upgrading legacy SHA-256 hashes
+
+    A legacy hash is kept next to the HMAC stored from it until that HMAC
+    has matched once, which shows it was made under the key still in use;
+    until then a failed HMAC check falls back to the legacy hash.
+    """
+    if entry["keyword_hmac"] and verify_keyword_hmac(text, entry["keyword_hmac"]):
+        if entry["keyword_hash"]:
+            db.query(AntiTheftConfig).filter(AntiTheftConfig.id == entry["config_id"]).update({
+                AntiTheftConfig.trigger_keyword_hash: None,
+            }, synchronize_session=False)
+            invalidate_phone_index(phone)
+        return True
+
+    if not entry["keyword_hash"] or not verify_keyword(text.strip(), entry["keyword_hash"]):
+        return False
+
+    # The plaintext is only available now, so this is when the HMAC can be stored
+    db.query(AntiTheftConfig).filter(AntiTheftConfig.id == entry["config_id"]).update({
+        AntiTheftConfig.trigger_keyword_hmac: keyword_hmac(text),
+    }, synchronize_session=False)
+    invalidate_phone_index(phone)
+    return True
+
+
+def trigger_from_sms(db: Session, phone: str, text: str) -> Optional[AntiTheftEvent]:
+    """
+    Start anti-theft for the sender if the message is their trigger keyword
+
+    An event that is already active is returned instead of starting a
+    second one. The caller commits.
+
+    Args:
+        db: Database session
+        phone: Normalized sender phone number
+        text: Message text
+
+    Returns:
+        Active event, or None if the message is not a valid trigger
+    """
+    entry = resolve_phone(db, phone)
+    if entry is None or not entry["is_enabled"]:
+        return None
+
+    if not _keyword_matches(db, phone, entry, text):
+        return None
+
+    user_id = uuid.UUID(entry["user_id"])
+    event = db.query(AntiTheftEvent).filter(
+        AntiTheftEvent.user_id == user_id,
+        AntiTheftEvent.status == "active"
+    ).first()
+
+    if event is None:
+        event = AntiTheftEvent(
+            user_id=user_id,
+            triggered_by="sms",
+            status="active"
+        )
+        db.add(event)
+
+    return event
@@ -0,0 +1,358 @@
+"""
+Mapbox Vector Tile rendering with PostGIS ST_AsMVT and per-tile Redis caching
+
+A tile is the concatenation of independently rendered layers (MVT layers
+are plain protobuf messages, so concatenated layers form a valid tile):
+
+* paths: the requesting user's paths as lines
+* reports: density of public emergency reports on a grid of tile cells
+
+Each layer is cached per tile. The reports layer is shared by all users;
+the paths layer is cached per user. Writes invalidate only the tiles that
+the changed features are drawn into, including the MVT_BUFFER margin.
+"""
+import logging
+import math
+from datetime import datetime, timedelta
+from typing import Iterable, Optional, Sequence, Set, Tuple
+import uuid
+
+import redis
+from sqlalchemy import text
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.core.redis import redis_client
+
+logger = logging.getLogger(__name__)
+
+MVT_MEDIA_TYPE = "application/vnd.mapbox-vector-tile"
+MVT_EXTENT = 4096
+# Geometry margin around each tile, in tile units (ST_AsMVTGeom buffer)
+MVT_BUFFER = 64
+
+# Width of the Web Mercator square in meters
+MERCATOR_WIDTH_METERS = 2 * 20037508.342789244
+
+PATHS_TILE_KEY = "tiles:paths:{user_id}:{z}:{x}:{y}"
+PATHS_TILE_INDEX_KEY = "tiles:paths:{user_id}:keys"
+REPORTS_TILE_KEY = "tiles:reports:{z}:{x}:{y}"
+
+# Stopped paths are drawn from their stored route; paths still being
+# recorded (or stopped before routes were stored) are built from their
+# points, pre-filtered by the bounding box kept in the path aggregates
+PATHS_TILE_SQL = text("""
+    WITH bounds AS (
+        SELECT ST_TileEnvelope(:z, :x, :y) AS geom,
+               ST_Transform(ST_TileEnvelope(:z, :x, :y), 4326) AS geom_4326
+    ),
+    lines AS (
+        SELECT p.id, p.is_active, p.start_time, p.route::geometry AS geom
+        FROM paths p, bounds b
+        WHERE p.user_id = CAST(:user_id AS uuid)
+          AND p.route IS NOT NULL
+          AND p.route && b.geom_4326::geography
+        UNION ALL
+        SELECT p.id, p.is_active, p.start_time,
+               ST_MakeLine(pp.location::geometry ORDER BY pp.timestamp) AS geom
+        FROM paths p
+        CROSS JOIN bounds b
+        JOIN path_points pp ON pp.path_id = p.id
+        WHERE p.user_id = CAST(:user_id AS uuid)
+          AND p.route IS NULL
+          AND p.archived_at IS NULL
+          AND (
+              p.min_latitude IS NULL
+              OR ST_MakeEnvelope(p.min_longitude, p.min_latitude, p.max_longitude, p.max_latitude, 4326) && b.geom_4326
+          )
+        GROUP BY p.id, p.is_active, p.start_time
+        HAVING count(*) > 1
+    ),
+    mvt AS (
+        SELECT l.id::text AS id,
+               l.is_active,
+               extract(epoch FROM l.start_time)::bigint AS start_time,
+               ST_AsMVTGeom(ST_Transform(l.geom, 3857), b.geom, :extent, :buffer, true) AS geom
+        FROM lines l, bounds b
+    )
+    SELECT ST_AsMVT(mvt.*, 'paths', :extent, 'geom') FROM mvt WHERE geom IS NOT NULL
+""")
+
+# Reports are snapped to a grid of cell_size meters and each occupied cell
+# becomes one point with the number of reports in it
+REPORTS_TILE_SQL = text("""
+    WITH bounds AS (
+        SELECT ST_TileEnvelope(:z, :x, :y) AS geom
+    ),
+    reports AS (
+        SELECT ST_Transform(r.location::geometry, 3857) AS geom
+        FROM emergency_reports r, bounds b
+        WHERE r.location && ST_Transform(b.geom, 4326)::geography
+          AND r.status <> 'cancelled'
+          AND r.reported_at >= :since
+    ),
+    cells AS (
+        SELECT count(*) AS count, ST_Centroid(ST_Collect(geom)) AS geom
+        FROM reports
+        GROUP BY ST_SnapToGrid(geom, :cell_size)
+    ),
+    mvt AS (
+        SELECT c.count, ST_AsMVTGeom(c.geom, b.geom, :extent, 0, true) AS geom
+        FROM cells c, bounds b
+    )
+    SELECT ST_AsMVT(mvt.*, 'reports', :extent, 'geom') FROM mvt WHERE geom IS NOT NULL
+""")
+
+
+def is_valid_tile(z: int, x: int, y: int) -> bool:
+    """Check tile coordinates against the zoom range and the tile grid"""
+    if z < 0 or z > settings.TILE_MAX_ZOOM:
+        return False
+    size = 1 << z
+    return 0 <= x < size and 0 <= y < size
+
+
+def tile_for(latitude: float, longitude: float, z: int) -> Tuple[int, int]:
+    """
+    Web Mercator tile containing a coordinate
+
+    Args:
+        latitude: Latitude
+        longitude: Longitude
+        z: Zoom level
+
+    Returns:
+        Tuple of (x, y)
+    """
+    size = 1 << z
+    latitude = max(min(latitude, 85.0511), -85.0511)
+    lat_rad = math.radians(latitude)
+
+    x = int((longitude + 180.0) / 360.0 * size)
+    y = int((1.0 - math.asinh(math.tan(lat_rad)) / math.pi) / 2.0 * size)
+    return min(max(x, 0), size - 1), min(max(y, 0), size - 1)
+
+
+def _tile_position(latitude: float, longitude: float, z: int) -> Tuple[float, float]:
+    """Unclamped fractional Web Mercator tile coordinates of a coordinate"""
+    size = 1 << z
+    lat_rad = math.radians(max(min(latitude, 85.0511), -85.0511))
+    return (
+        (longitude + 180.0) / 360.0 * size,
+        (1.0 - math.asinh(math.tan(lat_rad)) / math.pi) / 2.0 * size,
+    )
+
+
+def _segment_tiles(
+    start: Tuple[float, float],
+    end: Tuple[float, float],
+    max_tiles: int
+) -> Optional[Set[Tuple[int, int, int]]]:
+    """
+    Cached tiles a line segment can be drawn into
+
+    A tile holds a feature when the feature crosses the tile grown by
+    MVT_BUFFER, so every tile overlapping the segment's bounding box grown
+    by the same margin is covered, at every zoom up to TILE_CACHE_MAX_ZOOM.
+
+    Args:
+        start: (latitude, longitude) of one end
+        end: (latitude, longitude) of the other end (same as start for a
+            lone point)
+        max_tiles: Give up once more tiles than this are covered
+
+    Returns:
+        Set of (z, x, y), or None if there are more than max_tiles
+    """
+    margin = MVT_BUFFER / MVT_EXTENT
+    tiles = set()
+
+    for z in range(settings.TILE_CACHE_MAX_ZOOM + 1):
+        size = 1 << z
+        x0, y0 = _tile_position(start[0], start[1], z)
+        x1, y1 = _tile_position(end[0], end[1], z)
+
+        min_x = max(int(math.floor(min(x0, x1) - margin)), 0)
+        max_x = min(int(math.floor(max(x0, x1) + margin)), size - 1)
+        min_y = max(int(math.floor(min(y0, y1) - margin)), 0)
+        max_y = min(int(math.floor(max(y0, y1) + margin)), size - 1)
+
+        if len(tiles) + (max_x - min_x + 1) * (max_y - min_y + 1) > max_tiles:
+            return None
+
+        for x in range(min_x, max_x + 1):
+            for y in range(min_y, max_y + 1):
+                tiles.add((z, x, y))
+
+    return tiles
+
+
+def _covering_tiles(coordinates: Iterable[Tuple[float, float]]) -> Set[Tuple[int, int, int]]:
+    """Cached tiles (every zoom up to TILE_CACHE_MAX_ZOOM) containing the coordinates"""
+    tiles = set()
+    for latitude, longitude in coordinates:
+        if latitude is None or longitude is None:
+            continue
+        for z in range(settings.TILE_CACHE_MAX_ZOOM + 1):
+            x, y = tile_for(latitude, longitude, z)
+            tiles.add((z, x, y))
+    return tiles
+
+
+def _render_paths_layer(db: Session, user_id: uuid.UUID, z: int, x: int, y: int) -> bytes:
+    """Render the user's paths layer of a tile"""
+    tile = db.execute(PATHS_TILE_SQL, {
+        "user_id": str(user_id),
+        "z": z,
+        "x": x,
+        "y": y,
+        "extent": MVT_EXTENT,
+        "buffer": MVT_BUFFER,
+    }).scalar()
+    return bytes(tile or b"")
+
+
+def _render_reports_layer(db: Session, z: int, x: int, y: int) -> bytes:
+    """Render the emergency report density layer of a tile"""
+    tile = db.execute(REPORTS_TILE_SQL, {
+        "z": z,
+        "x": x,
+        "y": y,
+        "extent": MVT_EXTENT,
+        "cell_size": MERCATOR_WIDTH_METERS / (1 << z) / settings.TILE_REPORT_GRID_SIZE,
+        "since": datetime.utcnow() - timedelta(days=settings.TILE_REPORT_WINDOW_DAYS),
+    }).scalar()
+    return bytes(tile or b"")
+
+
+def _cache_get(key: str) -> Optional[bytes]:
+    """Cached layer bytes (possibly empty), or None on a miss"""
+    try:
+        return redis_client.get_bytes(key)
+    except redis.RedisError as e:
+        logger.warning(f"Tile cache unavailable: {e}")
+        return None
+
+
+def _cache_set(key: str, layer: bytes, index_key: Optional[str] = None) -> None:
+    """Cache layer bytes, recording the key in a per-user index if given"""
+    try:
+        redis_client.set_bytes(key, layer, settings.TILE_CACHE_TTL)
+        if index_key is not None:
+            redis_client.client.sadd(index_key, key)
+            redis_client.expire(index_key, settings.TILE_CACHE_TTL)
+    except redis.RedisError as e:
+        logger.warning(f"Tile cache unavailable: {e}")
+
+
+def render_tile(db: Session, user_id: uuid.UUID, z: int, x: int, y: int) -> bytes:
+    """
+    Get a vector tile with the user's paths and the report density
+
+    Layers are served from Redis when cached; tiles above
+    TILE_CACHE_MAX_ZOOM cover little ground and are always rendered.
+
+    Args:
+        db: Database session
+        user_id: User whose paths are drawn
+        z: Zoom level
+        x: Tile column
+        y: Tile row
+
+    Returns:
+        MVT bytes (empty when the tile has no features)
+    """
+    cacheable = z <= settings.TILE_CACHE_MAX_ZOOM
+
+    paths_key = PATHS_TILE_KEY.format(user_id=user_id, z=z, x=x, y=y)
+    reports_key = REPORTS_TILE_KEY.format(z=z, x=x, y=y)
+
+    paths_layer = _cache_get(paths_key) if cacheable else None
+    if paths_layer is None:
+        paths_layer = _render_paths_layer(db, user_id, z, x, y)
+        if cacheable:
+            _cache_set(paths_key, paths_layer, PATHS_TILE_INDEX_KEY.format(user_id=user_id))
+
+    reports_layer = _cache_get(reports_key) if cacheable else None
+    if reports_layer is None:
+        reports_layer = _render_reports_layer(db, z, x, y)
+        if cacheable:
+            _cache_set(reports_key, reports_layer)
+
+    return paths_layer + reports_layer
+
+
+def invalidate_path_tiles(user_id: uuid.UUID, coordinates: Sequence[Tuple[float, float]]) -> None:
+    """
+    Drop the user's cached path tiles that the new line segments are drawn into
+
+    Each pair of consecutive coordinates is a segment of the path line;
+    every tile touched by its buffered bounding box is dropped. When that
+    comes to more than TILE_INVALIDATE_MAX_TILES tiles (long jumps at high
+    zoom), all of the user's path tiles are dropped instead.
+
+    Args:
+        user_id: Path owner
+        coordinates: (latitude, longitude) of the previous last point, so
+            the joining segment is redrawn, then the new points in path
+            order
+    """
+    coordinates = [c for c in coordinates if c[0] is not None and c[1] is not None]
+    if not coordinates:
+        return
+
+    max_tiles = settings.TILE_INVALIDATE_MAX_TILES
+    segments = list(zip(coordinates, coordinates[1:])) or [(coordinates[0], coordinates[0])]
+    tiles = set()
+
+    for start, end in segments:
+        covered = _segment_tiles(start, end, max_tiles - len(tiles))
+        if covered is None:
+            invalidate_user_path_tiles(user_id)
+            return
+        tiles |= covered
+
+    keys = [PATHS_TILE_KEY.format(user_id=user_id, z=z, x=x, y=y) for z, x, y in tiles]
+
+    try:
+        redis_client.client.delete(*keys)
+    except redis.RedisError as e:
+        logger.warning(f"Tile cache invalidation failed: {e}")
+
+
+def invalidate_user_path_tiles(user_id: uuid.UUID) -> None:
+    """
+    Drop every cached path tile of a user
+
+    Used when whole paths change, e.g. they are stopped (the stored route
+    replaces the live line) or deleted.
+
+    Args:
+        user_id: Path owner
+    """
+    index_key = PATHS_TILE_INDEX_KEY.format(user_id=user_id)
+
+    try:
+        keys = redis_client.client.smembers(index_key)
+        redis_client.client.delete(index_key, *keys)
+    except redis.RedisError as e:
+        logger.warning(f"Tile cache invalidation failed: {e}")
+
+
+def invalidate_report_tiles(latitude: float, longitude: float) -> None:
+    """
+    Drop the cached report density tiles containing a report
+
+    Args:
+        latitude: Report latitude
+        longitude: Report longitude
+    """
+    keys = [
+        REPORTS_TILE_KEY.format(z=z, x=x, y=y)
+        for z, x, y in _covering_tiles([(latitude, longitude)])
+    ]
+
+    try:
+        redis_client.client.delete(*keys)
+    except redis.RedisError as e:
+        logger.warning(f"Tile cache invalidation failed: {e}")
@@ -0,0 +1,199 @@
+"""
+Incremental stay-point detection and trip segmentation
+
+A stay is a run of points that remain within PATH_STAY_RADIUS_METERS of
+the run's first point (the anchor) for at least
+PATH_STAY_MIN_DURATION_SECONDS; the movement between two stays is a move
+leg. Batches are processed as they are ingested, so the only state kept
+per active path is the current anchor run and the start of the open move
+leg (Path.trip_state), whatever the length of the path. Closed stays and
+legs are stored as PathTripSegment rows.
+
+Fixes within PATH_FILTER_MIN_DISTANCE_METERS of the previous one are
+dropped as jitter before they are stored, which is exactly what standing
+still produces. Ingest therefore hands them over separately: they extend
+the current run in time but add neither distance nor position.
+"""
+from datetime import datetime
+from typing import List, Sequence
+
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.models.path import Path, PathTripSegment
+from app.schemas.path import PathPointCreate
+from app.services.geo import haversine_meters
+
+
+def _mark(latitude: float, longitude: float, time: datetime, distance: float) -> dict:
+    """A position along the path, with the path distance travelled up to it"""
+    return {"latitude": latitude, "longitude": longitude, "time": time.isoformat(), "distance": distance}
+
+
+def _time(mark: dict) -> datetime:
+    return datetime.fromisoformat(mark["time"])
+
+
+def _start_run(state: dict, point: PathPointCreate, distance: float) -> None:
+    """Make a point the anchor of a new candidate stay"""
+    state["anchor"] = _mark(point.latitude, point.longitude, point.timestamp, distance)
+    state["last"] = state["anchor"]
+    state["latitude_sum"] = point.latitude
+    state["longitude_sum"] = point.longitude
+    state["count"] = 1
+
+
+def _is_stay(state: dict) -> bool:
+    """Whether the current run has lasted long enough to be a stay"""
+    duration = (_time(state["last"]) - _time(state["anchor"])).total_seconds()
+    return duration >= settings.PATH_STAY_MIN_DURATION_SECONDS
+
+
+def _close_stay(db: Session, path: Path, state: dict) -> None:
+    """Store the current run as a stay, preceded by the leg that led to it"""
+    anchor, last, leg = state["anchor"], state["last"], state.get("leg")
+    latitude = state["latitude_sum"] / state["count"]
+    longitude = state["longitude_sum"] / state["count"]
+
+    if leg is not None and _time(leg) < _time(anchor):
+        db.add(PathTripSegment(
+            path_id=path.id,
+            kind="move",
+            start_time=_time(leg),
+            end_time=_time(anchor),
+            start_latitude=leg["latitude"],
+            start_longitude=leg["longitude"],
+            end_latitude=anchor["latitude"],
+            end_longitude=anchor["longitude"],
+            distance_meters=anchor["distance"] - leg["distance"]
+        ))
+
+    db.add(PathTripSegment(
+        path_id=path.id,
+        kind="stay",
+        start_time=_time(anchor),
+        end_time=_time(last),
+        start_latitude=latitude,
+        start_longitude=longitude,
+        end_latitude=latitude,
+        end_longitude=longitude,
+        distance_meters=last["distance"] - anchor["distance"],
+        point_count=state["count"]
+    ))
+
+    # The next leg leaves from the stay
+    state["leg"] = _mark(latitude, longitude, _time(last), last["distance"])
+
+
+def update_trip_segments(
+    db: Session,
+    path: Path,
+    points: List[PathPointCreate],
+    stationary_points: Sequence[PathPointCreate] = ()
+) -> None:
+    """
+    Advance stay-point detection over a newly stored batch
+
+    Must run before the batch is folded into the path aggregates, whose
+    last point and distance it continues from. Points at or before the
+    last stored point arrived late and are ignored.
+
+    Args:
+        db: Database session
+        path: Path (should be locked for update by the caller)
+        points: Inserted points
+        stationary_points: Fixes of the batch the filter dropped as
+            stationary jitter; they only extend the current run in time
+    """
+    state = dict(path.trip_state or {})
+    last_time = path.last_point_time
+    last_lat, last_lon = path.last_latitude, path.last_longitude
+    distance = path.total_distance_meters or 0.0
+    radius = settings.PATH_STAY_RADIUS_METERS
+
+    fixes = [(p, False) for p in points] + [(p, True) for p in stationary_points]
+
+    for p, is_stationary in sorted(fixes, key=lambda fix: fix[0].timestamp):
+        if last_time is not None and p.timestamp <= last_time:
+            continue
+
+        if is_stationary:
+            anchor = state.get("anchor")
+            if anchor is not None and haversine_meters(anchor["latitude"], anchor["longitude"], p.latitude, p.longitude) <= radius:
+                state["last"] = {**state["last"], "time": p.timestamp.isoformat()}
+            continue
+
+        if last_lat is not None and last_lon is not None:
+            distance += haversine_meters(last_lat, last_lon, p.latitude, p.longitude)
+        last_lat, last_lon, last_time = p.latitude, p.longitude, p.timestamp
+
+        if "anchor" not in state:
+            _start_run(state, p, distance)
+            state.setdefault("leg", state["anchor"])
+            continue
+
+        anchor = state["anchor"]
+        if haversine_meters(anchor["latitude"], anchor["longitude"], p.latitude, p.longitude) <= radius:
+            state["last"] = _mark(p.latitude, p.longitude, p.timestamp, distance)
+            state["latitude_sum"] += p.latitude
+            state["longitude_sum"] += p.longitude
+            state["count"] += 1
+            continue
+
+        # The point left the anchor radius: the run was either a stay or
+        # just part of the current leg
+        if _is_stay(state):
+            _close_stay(db, path, state)
+        _start_run(state, p, distance)
+
+    # Reassign so the JSONB column is flagged as changed
+    path.trip_state = state
+
+
+def close_trip_segments(db: Session, path: Path) -> None:
+    """
+    Store the open stay and leg of a path that was just stopped
+
+    Args:
+        db: Database session
+        path: Path (aggregates are up to date)
+    """
+    state = path.trip_state
+    if not state:
+        return
+
+    state = dict(state)
+    if "anchor" in state and _is_stay(state):
+        _close_stay(db, path, state)
+
+    leg = state.get("leg")
+    if leg is not None and path.last_point_time is not None and path.last_point_time > _time(leg):
+        db.add(PathTripSegment(
+            path_id=path.id,
+            kind="move",
+            start_time=_time(leg),
+            end_time=path.last_point_time,
+            start_latitude=leg["latitude"],
+            start_longitude=leg["longitude"],
+            end_latitude=path.last_latitude,
+            end_longitude=path.last_longitude,
+            distance_meters=(path.total_distance_meters or 0.0) - leg["distance"]
+        ))
+
+    path.trip_state = None
+
+
+def list_trip_segments(db: Session, path: Path) -> List[PathTripSegment]:
+    """
+    Stored stays and legs of a path in time order
+
+    Args:
+        db: Database session
+        path: Path
+
+    Returns:
+        Trip segments
+    """
+    return db.query(PathTripSegment).filter(
+        PathTripSegment.path_id == path.id
+    ).order_by(PathTripSegment.start_time).all()
@@ -0,0 +1,52 @@
+"""
+Safety alert tasks
+"""
+import logging
+
+from app.core.celery_app import celery_app
+from app.core.database import SessionLocal
+from app.models.emergency_contact import EmergencyContact
+from app.models.path import Path
+from app.services.sms_service import sms_service
+
+logger = logging.getLogger(__name__)
+
+
+@celery_app.task
+def send_corridor_deviation_alert(path_id: str, latitude: float, longitude: float) -> dict:
+    """
+    Text the path owner's emergency contacts that they left their safe corridor
+
+    Args:
+        path_id: Path ID
+        latitude: Latest position outside the corridor
+        longitude: Latest position outside the corridor
+
+    Returns:
+        SMS success/failure counts
+    """
+    db = SessionLocal()
+    try:
+        path = db.query(Path).filter(Path.id == path_id).first()
+        if path is None:
+            return {"success": 0, "failed": 0}
+
+        contacts = db.query(EmergencyContact).filter(
+            EmergencyContact.user_id == path.user_id,
+            EmergencyContact.is_active == True
+        ).order_by(EmergencyContact.priority).all()
+
+        user_name = path.user.full_name
+        corridor = path.safe_corridor
+        corridor_name = corridor.name if corridor is not None and corridor.name else "their usual route"
+    finally:
+        db.close()
+
+    message = (
+        f"NuuR alert: {user_name} has left {corridor_name}. "
+        f"Last location: https://maps.google.com/?q={latitude},{longitude}"
+    )
+    results = sms_service.send_bulk_sms([contact.phone_number for contact in contacts], message)
+
+    logger.info(f"Corridor deviation alert for path {path_id}: {results}")
+    return results
@@ -0,0 +1,33 @@
+"""
+Partition maintenance tasks
+"""
+import logging
+
+from app.core.celery_app import celery_app
+from app.core.database import SessionLocal
+from app.services.partitions import ensure_partitions, expire_partitions
+
+logger = logging.getLogger(__name__)
+
+
+@celery_app.task
+def maintain_point_partitions() -> dict:
+    """
+    Create upcoming monthly partitions and expire old ones
+
+    Returns:
+        Names of the ensured and expired partitions
+    """
+    db = SessionLocal()
+    try:
+        ensured = ensure_partitions(db)
+        expired = expire_partitions(db)
+        db.commit()
+    except Exception:
+        db.rollback()
+        logger.exception("Partition maintenance failed")
+        raise
+    finally:
+        db.close()
+
+    return {"ensured": ensured, "expired": expired}
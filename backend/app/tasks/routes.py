@@ -0,0 +1,33 @@
+"""
+Frequent-route indexing tasks
+"""
+import logging
+
+from app.core.celery_app import celery_app
+from app.core.config import settings
+from app.core.database import SessionLocal
+from app.services.frequent_routes import index_completed_paths
+
+logger = logging.getLogger(__name__)
+
+
+@celery_app.task
+def index_frequent_routes() -> dict:
+    """
+    Assign newly completed paths to frequent routes
+
+    Returns:
+        Number of indexed paths
+    """
+    db = SessionLocal()
+    try:
+        indexed = index_completed_paths(db, settings.ROUTE_INDEX_BATCH_SIZE)
+        db.commit()
+    except Exception:
+        db.rollback()
+        logger.exception("Frequent-route indexing failed")
+        raise
+    finally:
+        db.close()
+
+    return {"indexed": indexed}
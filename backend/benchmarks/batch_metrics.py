@@ -0,0 +1,55 @@
+"""
+Vectorized batch metrics against per-point Python loops
+
+For each batch size, times bounds checking, consecutive haversine
+distances and speeds over a synthetic walk, once with the NumPy helpers of
+app.services.path_metrics (including the conversion of the batch into
+arrays) and once as a plain loop over the points with haversine_meters.
+
+Usage (from backend/):
+    python -m benchmarks.batch_metrics [repeats]
+"""
+import sys
+import timeit
+
+from app.services.geo import haversine_meters
+from app.services.path_metrics import consecutive_metrics, point_arrays, segment_speeds, valid_coordinates
+from benchmarks.synthetic import synthetic_walk
+
+BATCH_SIZES = (100, 1000, 10000)
+
+
+def vectorized(points):
+    latitudes, longitudes, timestamps = point_arrays(points)
+    valid = valid_coordinates(latitudes, longitudes)
+    distances, elapsed = consecutive_metrics(latitudes, longitudes, timestamps)
+    return valid, distances, segment_speeds(distances, elapsed)
+
+
+def per_point(points):
+    valid, distances, speeds = [], [], []
+    previous = None
+    for p in points:
+        valid.append(-90.0 <= p.latitude <= 90.0 and -180.0 <= p.longitude <= 180.0)
+        if previous is not None:
+            distance = haversine_meters(previous.latitude, previous.longitude, p.latitude, p.longitude)
+            elapsed = (p.timestamp - previous.timestamp).total_seconds()
+            distances.append(distance)
+            speeds.append(distance / elapsed if elapsed > 0 else float("inf"))
+        previous = p
+    return valid, distances, speeds
+
+
+def main() -> None:
+    repeats = int(sys.argv[1]) if len(sys.argv) > 1 else 20
+
+    print(f"{'points':>8} {'loop_ms':>9} {'numpy_ms':>9} {'speedup':>8}")
+    for size in BATCH_SIZES:
+        points = synthetic_walk(size)
+        loop = min(timeit.repeat(lambda: per_point(points), number=1, repeat=repeats)) * 1000
+        numpy = min(timeit.repeat(lambda: vectorized(points), number=1, repeat=repeats)) * 1000
+        print(f"{size:>8} {loop:>9.3f} {numpy:>9.3f} {loop / numpy:>7.1f}x")
+
+
+if __name__ == "__main__":
+    main()
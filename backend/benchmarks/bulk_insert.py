@@ -0,0 +1,73 @@
+"""
+Rows per second of the unnest bulk insert against the per-point ORM loop
+
+Needs the PostgreSQL/PostGIS database from DATABASE_URL. Every run works
+on a throwaway user and path inside one transaction that is rolled back.
+
+Usage (from backend/):
+    python -m benchmarks.bulk_insert [batch_size] [batches]
+"""
+from datetime import datetime, timedelta
+import sys
+import time
+
+from geoalchemy2.elements import WKTElement
+
+from app.core.database import SessionLocal
+from app.models.path import PathPoint
+from app.services.path_ingest import bulk_insert_path_points
+from benchmarks.synthetic import scratch_path, synthetic_walk
+
+
+def orm_loop(db, path_id, points) -> None:
+    """The per-point insert the endpoint used before the bulk insert"""
+    for point_data in points:
+        point_geom = WKTElement(f"POINT({point_data.longitude} {point_data.latitude})", srid=4326)
+        db.add(PathPoint(
+            path_id=path_id,
+            location=point_geom,
+            accuracy=point_data.accuracy,
+            altitude=point_data.altitude,
+            speed=point_data.speed,
+            heading=point_data.heading,
+            timestamp=point_data.timestamp
+        ))
+    db.flush()
+
+
+def bulk(db, path_id, points) -> None:
+    bulk_insert_path_points(db, path_id, points)
+
+
+def measure(method, batch_size: int, batches: int) -> float:
+    """Rows per second over batches uploads of batch_size points"""
+    db = SessionLocal()
+    try:
+        path = scratch_path(db)
+        start = datetime(2026, 1, 1)
+        uploads = [
+            synthetic_walk(batch_size, seed=i, start=start + timedelta(seconds=i * batch_size))
+            for i in range(batches)
+        ]
+
+        started = time.perf_counter()
+        for points in uploads:
+            method(db, path.id, points)
+        elapsed = time.perf_counter() - started
+        return batch_size * batches / elapsed
+    finally:
+        db.rollback()
+        db.close()
+
+
+def main() -> None:
+    batch_size = int(sys.argv[1]) if len(sys.argv) > 1 else 100
+    batches = int(sys.argv[2]) if len(sys.argv) > 2 else 50
+
+    for name, method in (("orm_loop", orm_loop), ("bulk_unnest", bulk)):
+        rate = measure(method, batch_size, batches)
+        print(f"{name:>12}: {rate:>10.0f} rows/s ({batches} batches of {batch_size})")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,104 @@
+"""
+In-process fan-out latency of live anti-theft locations
+
+Connects the given numbers of subscribers to one event channel of a
+PubSubHub whose Redis connection is replaced by an in-memory feed, then
+publishes fixes and measures how long each takes from the hub reading it
+until every subscriber has taken it off its queue. This is the per-worker
+part of the fan-out; the Redis round trip and the WebSocket send are not
+included.
+
+Usage (from backend/):
+    python -m benchmarks.live_fanout [messages]
+"""
+import asyncio
+import json
+import statistics
+import sys
+import time
+import uuid
+
+from app.core.pubsub import PubSubHub
+from app.services.anti_theft_live import END_MESSAGE, event_channel
+
+SUBSCRIBER_COUNTS = (100, 1000, 5000, 10000)
+
+
+class MemoryPubSub:
+    """Stands in for the hub's Redis pub/sub connection"""
+
+    def __init__(self):
+        self.feed = asyncio.Queue()
+
+    async def subscribe(self, *channels):
+        pass
+
+    async def unsubscribe(self, *channels):
+        pass
+
+    async def get_message(self, timeout):
+        try:
+            return await asyncio.wait_for(self.feed.get(), timeout)
+        except asyncio.TimeoutError:
+            return None
+
+    async def aclose(self):
+        pass
+
+
+async def measure(subscribers: int, messages: int) -> list:
+    hub = PubSubHub("redis://unused", queue_size=256)
+    hub._pubsub = MemoryPubSub()
+    channel = event_channel(uuid.uuid4())
+    received = [asyncio.Event() for _ in range(messages)]
+    remaining = [subscribers] * messages
+    latest = [0.0] * messages
+    ready = asyncio.Barrier(subscribers + 1)
+    payloads = [
+        json.dumps({"type": "location", "location": {"latitude": 9.03, "longitude": 38.74, "index": index}})
+        for index in range(messages)
+    ]
+    indexes = {payload: index for index, payload in enumerate(payloads)}
+
+    async def watch():
+        async with hub.subscribe(channel) as queue:
+            await ready.wait()
+            while True:
+                _, data = await queue.get()
+                if data == END_MESSAGE:
+                    return
+                # Real watchers forward the published text without parsing it
+                index = indexes[data]
+                remaining[index] -= 1
+                if not remaining[index]:
+                    latest[index] = time.perf_counter()
+                    received[index].set()
+
+    watchers = [asyncio.create_task(watch()) for _ in range(subscribers)]
+    await ready.wait()
+
+    latencies = []
+    for index in range(messages):
+        started = time.perf_counter()
+        await hub._pubsub.feed.put({"type": "message", "channel": channel, "data": payloads[index]})
+        await received[index].wait()
+        latencies.append((latest[index] - started) * 1000)
+
+    await hub._pubsub.feed.put({"type": "message", "channel": channel, "data": END_MESSAGE})
+    await asyncio.gather(*watchers)
+    await hub.close()
+    return latencies
+
+
+def main() -> None:
+    messages = int(sys.argv[1]) if len(sys.argv) > 1 else 50
+
+    print(f"{'subscribers':>11} {'p50_ms':>8} {'p99_ms':>8} {'max_ms':>8}")
+    for subscribers in SUBSCRIBER_COUNTS:
+        latencies = sorted(asyncio.run(measure(subscribers, messages)))
+        p99 = latencies[min(len(latencies) - 1, int(len(latencies) * 0.99))]
+        print(f"{subscribers:>11} {statistics.median(latencies):>8.2f} {p99:>8.2f} {latencies[-1]:>8.2f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,81 @@
+"""
+Time-window reads and retention on monthly path_points partitions
+
+Fills a throwaway path with rows spread over a run of months in the past
+(partitions are created for them), then measures:
+
+* a one-week window read, which only scans the partition it falls in
+* expiring the oldest month with DELETE against DETACH + DROP PARTITION
+
+Needs the PostgreSQL/PostGIS database from DATABASE_URL, upgraded to head.
+Everything, including the partitions, is rolled back.
+
+Usage (from backend/):
+    python -m benchmarks.partition_volume [rows] [months]
+"""
+from datetime import datetime, timedelta
+import sys
+import time
+
+from sqlalchemy import text
+
+from app.core.database import SessionLocal
+from app.services.partitions import add_months, create_month_partition, partition_name
+from benchmarks.synthetic import scratch_path
+
+# Far enough back not to collide with partitions holding real data
+FIRST_MONTH = datetime(2001, 1, 1)
+
+
+def timed(db, statement, params=None):
+    started = time.perf_counter()
+    result = db.execute(text(statement), params or {})
+    return result, (time.perf_counter() - started) * 1000
+
+
+def main() -> None:
+    rows = int(sys.argv[1]) if len(sys.argv) > 1 else 1_000_000
+    months = int(sys.argv[2]) if len(sys.argv) > 2 else 6
+
+    db = SessionLocal()
+    try:
+        path = scratch_path(db)
+        for offset in range(months):
+            create_month_partition(db, "path_points", add_months(FIRST_MONTH, offset))
+
+        span = add_months(FIRST_MONTH, months) - FIRST_MONTH
+        _, elapsed = timed(db, """
+            INSERT INTO path_points (path_id, location, timestamp)
+            SELECT CAST(:path_id AS uuid),
+                   ST_SetSRID(ST_MakePoint(38.74 + i * 1e-7, 9.03), 4326)::geography,
+                   CAST(:start AS timestamp) + i * CAST(:step AS interval)
+            FROM generate_series(0, :rows - 1) AS i
+        """, {"path_id": str(path.id), "start": FIRST_MONTH, "step": span / rows, "rows": rows})
+        print(f"insert {rows} rows over {months} months: {elapsed:.0f} ms")
+
+        window_start = add_months(FIRST_MONTH, months // 2)
+        result, elapsed = timed(db, """
+            SELECT count(*) FROM path_points
+            WHERE path_id = CAST(:path_id AS uuid) AND timestamp >= :start AND timestamp < :end
+        """, {"path_id": str(path.id), "start": window_start, "end": window_start + timedelta(days=7)})
+        print(f"one-week window read ({result.scalar()} rows): {elapsed:.1f} ms")
+
+        oldest = partition_name("path_points", FIRST_MONTH)
+
+        savepoint = db.begin_nested()
+        result, elapsed = timed(db, """
+            DELETE FROM path_points WHERE timestamp >= :start AND timestamp < :end
+        """, {"start": FIRST_MONTH, "end": add_months(FIRST_MONTH, 1)})
+        print(f"expire oldest month with DELETE ({result.rowcount} rows): {elapsed:.0f} ms")
+        savepoint.rollback()
+
+        _, detach = timed(db, f'ALTER TABLE path_points DETACH PARTITION "{oldest}"')
+        _, drop = timed(db, f'DROP TABLE "{oldest}"')
+        print(f"expire oldest month with DETACH + DROP: {detach + drop:.1f} ms")
+    finally:
+        db.rollback()
+        db.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,68 @@
+"""
+Cross-check of the ingest-time aggregates against a PostGIS recompute
+
+Stores a synthetic path batch by batch through store_path_points, then
+compares the incremental distance and aggregates with
+recompute_path_statistics, which uses ST_Length(ST_MakeLine(...)) on the
+stored points. ST_Length on geography is ellipsoidal while ingest uses the
+haversine sphere, so distances agree to within a few tenths of a percent,
+not exactly.
+
+Needs the PostgreSQL/PostGIS database from DATABASE_URL. The run is rolled
+back.
+
+Usage (from backend/):
+    python -m benchmarks.path_aggregates [point_count] [batch_size]
+"""
+import sys
+import time
+
+from app.core.database import SessionLocal
+from app.services.path_ingest import bulk_insert_path_points, recompute_path_statistics, update_path_statistics
+from benchmarks.synthetic import scratch_path, synthetic_walk
+
+FIELDS = (
+    "point_count",
+    "total_distance_meters",
+    "max_speed_mps",
+    "min_latitude",
+    "min_longitude",
+    "max_latitude",
+    "max_longitude",
+    "last_latitude",
+    "last_longitude",
+)
+
+
+def main() -> None:
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 50000
+    batch_size = int(sys.argv[2]) if len(sys.argv) > 2 else 100
+    points = synthetic_walk(count)
+
+    db = SessionLocal()
+    try:
+        path = scratch_path(db)
+
+        started = time.perf_counter()
+        for i in range(0, count, batch_size):
+            update_path_statistics(path, bulk_insert_path_points(db, path.id, points[i:i + batch_size]))
+        ingest_seconds = time.perf_counter() - started
+        incremental = {field: getattr(path, field) for field in FIELDS}
+
+        started = time.perf_counter()
+        recompute_path_statistics(db, path)
+        recompute_seconds = time.perf_counter() - started
+
+        print(f"ingest {count} points in batches of {batch_size}: {ingest_seconds:.2f}s")
+        print(f"full ST_Length recompute: {recompute_seconds * 1000:.0f} ms")
+        for field in FIELDS:
+            value, reference = incremental[field], getattr(path, field)
+            error = abs(value - reference) / abs(reference) if reference else abs(value - reference)
+            print(f"{field:>22}: incremental={value:<22} recomputed={reference:<22} rel_error={error:.2e}")
+    finally:
+        db.rollback()
+        db.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,41 @@
+"""
+Payload size and simplification time per stored tolerance level
+
+Simplifies a synthetic random-walk path at every configured tolerance and
+reports the point count, the size of the JSON points payload and the time
+spent in douglas_peucker. Database and network time are not included.
+
+Usage (from backend/):
+    python -m benchmarks.simplify_levels [point_count]
+"""
+import json
+import sys
+import time
+
+from app.core.config import settings
+from app.services.path_simplify import douglas_peucker, project_to_meters
+from benchmarks.synthetic import synthetic_walk
+
+
+def main() -> None:
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 50000
+    points = [
+        {"id": i, "latitude": p.latitude, "longitude": p.longitude, "timestamp": p.timestamp.isoformat()}
+        for i, p in enumerate(synthetic_walk(count))
+    ]
+    xs, ys = project_to_meters([p["latitude"] for p in points], [p["longitude"] for p in points])
+
+    full = len(json.dumps(points))
+    print(f"{'tolerance_m':>12} {'points':>8} {'payload_kb':>11} {'ratio':>7} {'simplify_ms':>12}")
+    print(f"{'raw':>12} {count:>8} {full / 1024:>11.1f} {1.0:>7.3f} {0.0:>12.1f}")
+
+    for tolerance in sorted(settings.PATH_SIMPLIFICATION_TOLERANCES):
+        started = time.perf_counter()
+        kept = douglas_peucker(xs, ys, tolerance)
+        elapsed = (time.perf_counter() - started) * 1000
+        size = len(json.dumps([points[i] for i in kept]))
+        print(f"{tolerance:>12.0f} {len(kept):>8} {size / 1024:>11.1f} {size / full:>7.3f} {elapsed:>12.1f}")
+
+
+if __name__ == "__main__":
+    main()
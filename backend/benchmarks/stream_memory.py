@@ -0,0 +1,65 @@
+"""
+Peak memory of the buffered path detail body against the streamed one
+
+Rows are generated lazily in PATH_STREAM_CHUNK_SIZE chunks, standing in
+for the server-side cursor, so the figures cover what the API process
+holds while encoding. Driver-side buffering is not included.
+
+Usage (from backend/):
+    python -m benchmarks.stream_memory [point_count]
+"""
+from datetime import datetime, timedelta
+import json
+import sys
+import tracemalloc
+
+from app.core.config import settings
+from app.services.path_encoding import iter_json_document
+from app.services.path_points import POINT_COLUMNS
+
+START = datetime(2026, 1, 1)
+
+
+def iter_rows(count: int):
+    for i in range(count):
+        yield (i, 9.03 + i * 1e-6, 38.74 + i * 1e-6, 5.0, 2350.0, 1.4, 90.0, START + timedelta(seconds=i))
+
+
+def iter_chunks(count: int, chunk_size: int):
+    chunk = []
+    for row in iter_rows(count):
+        chunk.append(row)
+        if len(chunk) == chunk_size:
+            yield chunk
+            chunk = []
+    if chunk:
+        yield chunk
+
+
+def buffered(count: int) -> int:
+    """Point dicts for the whole path, then one JSON document"""
+    points = [dict(zip(POINT_COLUMNS, row)) for row in iter_rows(count)]
+    return len(json.dumps({"id": "path", "points": points}, default=str))
+
+
+def streamed(count: int) -> int:
+    """Chunks encoded and handed on one at a time"""
+    return sum(len(part) for part in iter_json_document({"id": "path"}, iter_chunks(count, settings.PATH_STREAM_CHUNK_SIZE)))
+
+
+def peak_mib(function, count: int) -> float:
+    tracemalloc.start()
+    function(count)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return peak / 2 ** 20
+
+
+def main() -> None:
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 200000
+    for name, function in (("buffered", buffered), ("streamed", streamed)):
+        print(f"{name:>9}: peak {peak_mib(function, count):>8.1f} MiB for {count} points")
+
+
+if __name__ == "__main__":
+    main()
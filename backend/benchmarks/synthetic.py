@@ -0,0 +1,70 @@
+"""
+Synthetic paths and scratch rows shared by the benchmarks
+"""
+from datetime import datetime, timedelta
+from typing import List
+import math
+import random
+import uuid
+
+from sqlalchemy.orm import Session
+
+from app.models.path import Path
+from app.models.user import User
+from app.schemas.path import PathPointCreate
+
+
+def synthetic_walk(count: int, seed: int = 1, start: datetime = datetime(2026, 1, 1)) -> List[PathPointCreate]:
+    """
+    Random walk of count fixes one second apart at ~1.4 m/s around Addis Ababa
+
+    Args:
+        count: Number of fixes
+        seed: Random seed
+        start: Timestamp of the first fix
+
+    Returns:
+        Fixes in timestamp order
+    """
+    rng = random.Random(seed)
+    lat, lon = 9.03, 38.74
+    heading = 0.0
+    points = []
+    for i in range(count):
+        heading += rng.gauss(0.0, 0.3)
+        step = 1.4 * 9e-6 * rng.uniform(0.5, 1.5)
+        lat += step * math.cos(heading)
+        lon += step * math.sin(heading)
+        points.append(PathPointCreate(
+            latitude=lat,
+            longitude=lon,
+            accuracy=rng.uniform(3.0, 15.0),
+            speed=rng.uniform(0.5, 2.5),
+            timestamp=start + timedelta(seconds=i)
+        ))
+    return points
+
+
+def scratch_path(db: Session) -> Path:
+    """
+    Flush a throwaway user and active path; callers roll the session back
+
+    Args:
+        db: Database session
+
+    Returns:
+        Path with no points
+    """
+    tag = uuid.uuid4().hex[:12]
+    user = User(
+        email=f"bench-{tag}@example.com",
+        phone_number=f"+0{int(tag, 16) % 10 ** 12:012d}",
+        password_hash="-"
+    )
+    db.add(user)
+    db.flush()
+
+    path = Path(user_id=user.id, name="benchmark", start_time=datetime(2026, 1, 1), is_active=True)
+    db.add(path)
+    db.flush()
+    return path
@@ -0,0 +1,6 @@
+"""
+Test settings that have no default
+"""
+import os
+
+os.environ.setdefault("TRIGGER_KEYWORD_HMAC_KEY", "test-trigger-keyword-hmac-key-0123456789")
@@ -0,0 +1,56 @@
+"""
+Tests for who may watch live anti-theft locations
+"""
+import uuid
+from unittest.mock import MagicMock
+
+import pytest
+
+import app.models  # noqa: F401  (configures all mappers)
+from app.models.anti_theft import AntiTheftEvent
+from app.models.user import User
+from app.schemas.emergency import EmergencyContactCreate
+from app.services.anti_theft_live import can_watch_event, watchable_events
+
+OWNER_ID = uuid.uuid4()
+
+
+def make_user(is_verified=True):
+    return User(id=uuid.uuid4(), phone_number="+251911234567", email="contact@example.com", is_verified=is_verified)
+
+
+def make_db(is_contact):
+    db = MagicMock()
+    db.query.return_value.filter.return_value.first.return_value = (uuid.uuid4(),) if is_contact else None
+    return db
+
+
+def test_owner_can_watch_without_lookup():
+    owner = make_user(is_verified=False)
+    owner.id = OWNER_ID
+    db = make_db(False)
+
+    assert can_watch_event(db, owner, AntiTheftEvent(user_id=OWNER_ID))
+    db.query.assert_not_called()
+
+
+@pytest.mark.parametrize("is_verified, is_contact, allowed", [
+    (True, True, True),
+    (True, False, False),
+    (False, True, False),
+])
+def test_contacts_must_be_verified(is_verified, is_contact, allowed):
+    assert can_watch_event(make_db(is_contact), make_user(is_verified), AntiTheftEvent(user_id=OWNER_ID)) is allowed
+
+
+def test_unverified_user_watches_nothing():
+    db = MagicMock()
+
+    assert watchable_events(db, make_user(is_verified=False)) == []
+    db.query.assert_not_called()
+
+
+def test_contact_phone_numbers_are_stored_normalized():
+    contact = EmergencyContactCreate(contact_name="Abebe", phone_number="+251 911-23 45 67")
+
+    assert contact.phone_number == "+251911234567"
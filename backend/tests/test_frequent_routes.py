@@ -0,0 +1,123 @@
+"""
+Tests for geohash cells and frequent-route matching
+"""
+import uuid
+from datetime import datetime, timedelta
+from unittest.mock import MagicMock
+
+import pytest
+
+import app.models  # noqa: F401  (configures all mappers)
+from app.core.config import settings
+from app.models.path import FrequentRoute, Path
+from app.services.frequent_routes import _add_path_to_route, find_matching_route, route_statistics
+from app.services.geo import haversine_meters
+from app.services.geohash import encode_geohash, path_cells
+
+START = (9.03, 38.74)
+END = (9.05, 38.76)
+
+
+@pytest.mark.parametrize("latitude, longitude, precision, expected", [
+    (42.6, -5.6, 5, "ezs42"),
+    (57.64911, 10.40744, 11, "u4pruydqqvj"),
+    (-25.382708, -49.265506, 8, "6gkzwgjz"),
+])
+def test_encode_geohash_reference_values(latitude, longitude, precision, expected):
+    assert encode_geohash(latitude, longitude, precision) == expected
+
+
+def test_geohash_prefixes_nest():
+    assert encode_geohash(9.03, 38.74, 9).startswith(encode_geohash(9.03, 38.74, 6))
+
+
+def test_path_cells_sample_long_segments():
+    # One 2.2 km straight segment crosses many ~150 m cells between its two vertices
+    coordinates = [(9.03, 38.74), (9.05, 38.74)]
+
+    cells = path_cells(coordinates, 7, 50.0)
+
+    assert cells[0] == encode_geohash(*coordinates[0], 7)
+    assert cells[-1] == encode_geohash(*coordinates[1], 7)
+    assert len(cells) == len(set(cells)) > 10
+
+
+def test_path_cells_keep_first_entry_order():
+    there_and_back = [(9.03, 38.74), (9.04, 38.74), (9.03, 38.74)]
+
+    assert path_cells(there_and_back, 7, 50.0) == path_cells(there_and_back[:2], 7, 50.0)
+
+
+def make_route(cell_count, start=START, end=END):
+    return FrequentRoute(
+        id=uuid.uuid4(),
+        cell_count=cell_count,
+        start_latitude=start[0],
+        start_longitude=start[1],
+        end_latitude=end[0],
+        end_longitude=end[1],
+    )
+
+
+def make_db(candidates, routes):
+    db = MagicMock()
+    db.execute.return_value.all.return_value = candidates
+    db.query.return_value.filter.return_value = routes
+    return db
+
+
+def test_most_similar_route_wins(monkeypatch):
+    monkeypatch.setattr(settings, "ROUTE_MATCH_MIN_SIMILARITY", 0.6)
+    close, closer = make_route(12), make_route(10)
+    db = make_db([(close.id, 9), (closer.id, 9)], [close, closer])
+
+    # 9 of 10 path cells shared: 9 / (10 + 12 - 9) = 0.69 and 9 / (10 + 10 - 9) = 0.82
+    assert find_matching_route(db, uuid.uuid4(), [str(i) for i in range(10)], START, END) is closer
+
+
+def test_low_similarity_or_far_endpoints_found_a_new_route(monkeypatch):
+    monkeypatch.setattr(settings, "ROUTE_MATCH_MIN_SIMILARITY", 0.6)
+    monkeypatch.setattr(settings, "ROUTE_ENDPOINT_RADIUS_METERS", 300.0)
+    sparse = make_route(30)
+    elsewhere = make_route(10, end=(9.06, 38.76))
+    assert haversine_meters(*END, 9.06, 38.76) > 300.0
+    db = make_db([(sparse.id, 10), (elsewhere.id, 10)], [sparse, elsewhere])
+
+    assert find_matching_route(db, uuid.uuid4(), [str(i) for i in range(10)], START, END) is None
+
+
+def test_no_shared_cells():
+    db = make_db([], [])
+
+    assert find_matching_route(db, uuid.uuid4(), ["abc"], START, END) is None
+    db.query.assert_not_called()
+
+
+def test_route_statistics_from_running_sums():
+    route = make_route(10)
+    route.path_count = route.duration_sum_seconds = route.duration_sum_squares = route.distance_sum_meters = 0
+    start = datetime(2026, 1, 5, 8, 0)
+
+    for minutes in (20, 25, 30):
+        path = Path(
+            start_time=start,
+            first_point_time=start,
+            last_point_time=start + timedelta(minutes=minutes),
+            end_time=start + timedelta(minutes=minutes),
+            total_distance_meters=3000.0,
+        )
+        _add_path_to_route(route, path)
+        assert path.route_id == route.id
+
+    stats = route_statistics(route)
+
+    assert route.path_count == 3
+    assert stats["mean_duration_seconds"] == pytest.approx(25 * 60)
+    assert stats["stddev_duration_seconds"] == pytest.approx(((2 * 300 ** 2) / 3) ** 0.5)
+    assert stats["mean_distance_meters"] == pytest.approx(3000.0)
+    assert route.min_duration_seconds == 20 * 60
+    assert route.max_duration_seconds == 30 * 60
+
+
+def test_route_statistics_without_paths():
+    assert route_statistics(make_route(1))["mean_duration_seconds"] is None
@@ -0,0 +1,139 @@
+"""
+Tests for the anti-theft location write-behind buffer
+"""
+from contextlib import contextmanager
+from datetime import datetime, timezone
+from unittest.mock import MagicMock
+
+import pytest
+from pydantic import ValidationError
+from sqlalchemy.exc import DataError, OperationalError
+
+from app.schemas.anti_theft import LocationPoint
+from app.services import location_buffer
+
+EVENT_ID = "6f1c1b1e-8a43-4c4e-9d3a-3f3b1c2d4e5f"
+
+
+def make_location(**overrides):
+    values = {"latitude": 9.03, "longitude": 38.74, "timestamp": datetime(2026, 1, 1, 8, 0, tzinfo=timezone.utc)}
+    return LocationPoint(**{**values, **overrides})
+
+
+@pytest.mark.parametrize("overrides", [
+    {"latitude": 90.5},
+    {"latitude": float("nan")},
+    {"longitude": -180.5},
+    {"longitude": float("inf")},
+])
+def test_location_point_bounds(overrides):
+    with pytest.raises(ValidationError):
+        make_location(**overrides)
+
+
+def test_buffered_fields_parse_back(monkeypatch):
+    client = MagicMock()
+    monkeypatch.setattr(location_buffer.redis_client, "client", client)
+
+    assert location_buffer.buffer_location(EVENT_ID, make_location(accuracy=12.5, battery_level=40))
+
+    stream, fields = client.xadd.call_args.args
+    assert stream == location_buffer.STREAM_KEY
+    assert location_buffer._parse_entry(fields) == (
+        EVENT_ID, 38.74, 9.03, 12.5, None, None, None, datetime(2026, 1, 1, 8, 0), 40
+    )
+
+
+class FakeSession:
+    """Session whose statements fail for rows with a latitude in bad_latitudes"""
+
+    def __init__(self, bad_latitudes, error=DataError):
+        self.bad_latitudes = bad_latitudes
+        self.error = error
+        self.inserted = []
+        self.commits = 0
+
+    def execute(self, statement, params):
+        if any(lat in self.bad_latitudes for lat in params["latitudes"]):
+            raise self.error("INSERT", params, Exception("rejected"))
+        self.inserted.extend(params["latitudes"])
+
+    @contextmanager
+    def begin_nested(self):
+        yield
+
+    def rollback(self):
+        pass
+
+    def commit(self):
+        self.commits += 1
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+
+def row(latitude):
+    return (EVENT_ID, 38.74, latitude, None, None, None, None, datetime(2026, 1, 1), None)
+
+
+def test_rejected_batch_is_inserted_row_by_row(monkeypatch):
+    session = FakeSession({9.2})
+    monkeypatch.setattr(location_buffer, "SessionLocal", lambda: session)
+
+    rejected = location_buffer._insert_locations([row(9.1), row(9.2), row(9.3)])
+
+    assert list(rejected) == [1]
+    assert session.inserted == [9.1, 9.3]
+    assert session.commits == 1
+
+
+def test_connection_failure_keeps_batch_pending(monkeypatch):
+    monkeypatch.setattr(location_buffer, "SessionLocal", lambda: FakeSession({9.1}, OperationalError))
+
+    with pytest.raises(OperationalError):
+        location_buffer._insert_locations([row(9.1)])
+
+
+def test_flush_dead_letters_bad_entries_and_acks_everything(monkeypatch):
+    good = {
+        "event_id": EVENT_ID, "latitude": "9.03", "longitude": "38.74", "accuracy": "", "altitude": "",
+        "speed": "", "heading": "", "battery_level": "", "timestamp": "2026-01-01T08:00:00",
+    }
+    rejected = {**good, "timestamp": "2026-01-01T08:00:05"}
+    malformed = {**good, "latitude": "north"}
+    entries = [("1-0", good), ("2-0", malformed), ("3-0", rejected), ("4-0", {})]
+
+    client = MagicMock()
+    client.xautoclaim.return_value = ("0-0", entries, [])
+    pipe = client.pipeline.return_value
+    monkeypatch.setattr(location_buffer.redis_client, "client", client)
+
+    inserted = []
+
+    def insert(rows):
+        inserted.extend(rows)
+        return {1: "value out of range"}
+
+    monkeypatch.setattr(location_buffer, "_insert_locations", insert)
+
+    assert location_buffer.flush_locations("worker-1") == 4
+
+    assert len(inserted) == 2
+    dead = [call.args[1] for call in pipe.xadd.call_args_list]
+    assert [(d["entry_id"], d["error"].split(":")[0]) for d in dead] == [("2-0", "Malformed entry"), ("3-0", "value out of range")]
+    assert all(call.args[0] == location_buffer.DEAD_LETTER_KEY for call in pipe.xadd.call_args_list)
+    pipe.xack.assert_called_once_with(location_buffer.STREAM_KEY, location_buffer.CONSUMER_GROUP, "1-0", "2-0", "3-0", "4-0")
+    pipe.execute.assert_called_once()
+
+
+def test_direct_insert_skips_stored_fixes():
+    db = MagicMock()
+
+    location_buffer.insert_location(db, EVENT_ID, make_location())
+
+    statement, params = db.execute.call_args.args
+    assert "ON CONFLICT" in str(statement)
+    assert params["timestamps"] == [datetime(2026, 1, 1, 8, 0)]
@@ -0,0 +1,165 @@
+"""
+Tests for path point encodings and Accept negotiation
+"""
+from datetime import datetime, timedelta
+import json
+
+import msgpack
+import pyarrow as pa
+import pytest
+
+from app.services.path_encoding import (
+    ARROW_MEDIA_TYPE,
+    COORDINATE_SCALE,
+    JSON_MEDIA_TYPE,
+    MSGPACK_MEDIA_TYPE,
+    NDJSON_MEDIA_TYPE,
+    POLYLINE_MEDIA_TYPE,
+    build_polyline_payload,
+    delta_encode,
+    encode_arrow_ipc,
+    encode_msgpack,
+    encode_polyline,
+    iter_json_document,
+    iter_ndjson,
+    negotiate_media_type,
+    to_epoch_millis,
+)
+
+START = datetime(2026, 1, 1, 8, 0, 0)
+
+
+def decode_polyline(encoded, precision=5):
+    """Reference decoder for the Google encoded polyline algorithm"""
+    values, value, shift = [], 0, 0
+    for char in encoded:
+        chunk = ord(char) - 63
+        value |= (chunk & 0x1f) << shift
+        shift += 5
+        if chunk < 0x20:
+            values.append(~(value >> 1) if value & 1 else value >> 1)
+            value, shift = 0, 0
+
+    coordinates, lat, lon = [], 0, 0
+    for d_lat, d_lon in zip(values[::2], values[1::2]):
+        lat += d_lat
+        lon += d_lon
+        coordinates.append((lat / 10 ** precision, lon / 10 ** precision))
+    return coordinates
+
+
+def make_columns(count=3):
+    return {
+        "id": [100 + i for i in range(count)],
+        "latitude": [9.03 + i * 0.0001 for i in range(count)],
+        "longitude": [38.74 - i * 0.0002 for i in range(count)],
+        "accuracy": [5.0] * count,
+        "altitude": [2350.0] * count,
+        "speed": [1.2] * count,
+        "heading": [None] * count,
+        "timestamp": [START + timedelta(seconds=i, microseconds=250) for i in range(count)],
+    }
+
+
+def make_rows(columns):
+    return list(zip(
+        columns["id"],
+        columns["latitude"],
+        columns["longitude"],
+        columns["accuracy"],
+        columns["altitude"],
+        columns["speed"],
+        columns["heading"],
+        columns["timestamp"],
+    ))
+
+
+@pytest.mark.parametrize("accept, expected", [
+    (None, JSON_MEDIA_TYPE),
+    ("", JSON_MEDIA_TYPE),
+    ("*/*", JSON_MEDIA_TYPE),
+    ("application/x-msgpack", MSGPACK_MEDIA_TYPE),
+    ("application/msgpack", MSGPACK_MEDIA_TYPE),
+    ("application/vnd.apache.arrow.file", ARROW_MEDIA_TYPE),
+    ("application/x-jsonlines", NDJSON_MEDIA_TYPE),
+    ("application/json;q=0.5, application/vnd.nuur.polyline+json", POLYLINE_MEDIA_TYPE),
+    ("application/x-msgpack;q=0, application/json", JSON_MEDIA_TYPE),
+    ("text/html, application/x-msgpack;q=0.9", MSGPACK_MEDIA_TYPE),
+    ("text/html", None),
+])
+def test_negotiate_media_type(accept, expected):
+    assert negotiate_media_type(accept) == expected
+
+
+def test_polyline_matches_reference_example():
+    # Example from the Google encoded polyline algorithm documentation
+    assert encode_polyline([38.5, 40.7, 43.252], [-120.2, -120.95, -126.453]) == "_p~iF~ps|U_ulLnnqC_mqNvxq`@"
+
+
+def test_polyline_round_trip():
+    columns = make_columns(50)
+    decoded = decode_polyline(encode_polyline(columns["latitude"], columns["longitude"]))
+    for (lat, lon), expected_lat, expected_lon in zip(decoded, columns["latitude"], columns["longitude"]):
+        assert lat == pytest.approx(expected_lat, abs=1e-5)
+        assert lon == pytest.approx(expected_lon, abs=1e-5)
+
+
+def test_delta_encode():
+    assert delta_encode([10, 12, 11, 11]) == [10, 2, -1, 0]
+    assert delta_encode([]) == []
+
+
+def test_polyline_payload_timestamps():
+    columns = make_columns(3)
+    payload = build_polyline_payload({"id": "p"}, columns)
+    assert payload["point_count"] == 3
+    first = to_epoch_millis([START])[0]
+    assert payload["timestamps_ms_delta"] == [first, 1000, 1000]
+
+
+def test_msgpack_round_trip():
+    columns = make_columns(4)
+    document = msgpack.unpackb(encode_msgpack({"id": "p"}, columns), raw=False)
+    points = document["points"]
+
+    latitudes, total = [], 0
+    for delta in points["latitude_delta"]:
+        total += delta
+        latitudes.append(total / COORDINATE_SCALE)
+
+    assert document["path"] == {"id": "p"}
+    assert latitudes == pytest.approx(columns["latitude"], abs=1e-6)
+    assert sum(points["id_delta"]) == columns["id"][-1]
+    assert points["heading"] == [None] * 4
+
+
+def test_arrow_round_trip():
+    columns = make_columns(4)
+    table = pa.ipc.open_stream(encode_arrow_ipc({"id": "p"}, columns)).read_all()
+
+    assert table.column("latitude").to_pylist() == columns["latitude"]
+    assert table.column("heading").null_count == 4
+    assert table.column("timestamp").to_pylist() == columns["timestamp"]
+    assert json.loads(table.schema.metadata[b"path"]) == {"id": "p"}
+
+def test_streamed_json_document_is_valid_json():
+    columns = make_columns(5)
+    rows = make_rows(columns)
+    body = b"".join(iter_json_document({"id": "p", "name": "walk"}, [rows[:2], rows[2:]]))
+    document = json.loads(body)
+
+    assert document["name"] == "walk"
+    assert [p["id"] for p in document["points"]] == columns["id"]
+    assert document["points"][0]["timestamp"] == columns["timestamp"][0].isoformat()
+
+
+def test_streamed_json_document_without_points():
+    assert json.loads(b"".join(iter_json_document({"id": "p"}, []))) == {"id": "p", "points": []}
+
+
+def test_ndjson_has_header_then_one_point_per_line():
+    rows = make_rows(make_columns(3))
+    lines = b"".join(iter_ndjson({"id": "p"}, [rows])).decode().splitlines()
+
+    assert json.loads(lines[0]) == {"path": {"id": "p"}}
+    assert [json.loads(line)["id"] for line in lines[1:]] == [100, 101, 102]
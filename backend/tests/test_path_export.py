@@ -0,0 +1,83 @@
+"""
+Tests for the streaming path exporters
+"""
+from datetime import datetime, timedelta
+from xml.etree import ElementTree
+import gzip
+import json
+
+from app.services import path_export
+from app.services.path_export import iter_encoded, iter_geojson, iter_gpx, iter_gzip, iter_kml
+
+START = datetime(2026, 1, 1, 8, 0, 0)
+
+
+def make_rows(count, altitude=2350.0):
+    return [
+        (i, 9.03 + i * 0.0001, 38.74 + i * 0.0001, 5.0, altitude, 1.4, 90.0, START + timedelta(seconds=i))
+        for i in range(count)
+    ]
+
+
+def item(path_id, rows, chunk_size=3):
+    chunks = [rows[i:i + chunk_size] for i in range(0, len(rows), chunk_size)]
+    return {"id": path_id, "name": f"Path <{path_id}>"}, lambda: iter(chunks)
+
+
+def export_geojson(items):
+    return json.loads("".join(iter_geojson(items)))
+
+
+def test_geojson_line_with_parallel_timestamps():
+    rows = make_rows(7)
+    collection = export_geojson([item("a", rows), item("b", make_rows(2, altitude=None))])
+
+    first, second = collection["features"]
+    assert first["geometry"]["type"] == "LineString"
+    assert first["geometry"]["coordinates"][0] == [38.74, 9.03, 2350.0]
+    assert first["properties"]["timestamps"] == [row[7].isoformat() + "Z" for row in rows]
+    assert first["properties"]["name"] == "Path <a>"
+    assert len(second["geometry"]["coordinates"][1]) == 2
+
+
+def test_geojson_single_point_and_empty_paths_stay_valid():
+    collection = export_geojson([item("one", make_rows(1)), item("none", [])])
+
+    one, none = collection["features"]
+    assert one["geometry"] == {"type": "Point", "coordinates": [38.74, 9.03, 2350.0]}
+    assert one["properties"]["timestamps"] == ["2026-01-01T08:00:00Z"]
+    assert none["geometry"] is None
+    assert none["properties"]["timestamps"] == []
+
+
+def test_geojson_line_after_empty_chunk():
+    rows = make_rows(4)
+    collection = export_geojson([({"id": "a"}, lambda: iter([[], rows[:1], rows[1:]]))])
+
+    assert len(collection["features"][0]["geometry"]["coordinates"]) == 4
+
+
+def test_geojson_timestamps_spill_to_disk(monkeypatch):
+    monkeypatch.setattr(path_export, "TIMESTAMP_SPOOL_MAX_BYTES", 64)
+    monkeypatch.setattr(path_export, "SPOOL_READ_SIZE", 10)
+    rows = make_rows(500)
+
+    collection = export_geojson([item("a", rows, chunk_size=50)])
+
+    assert collection["features"][0]["properties"]["timestamps"][-1] == rows[-1][7].isoformat() + "Z"
+
+
+def test_gpx_and_kml_are_well_formed():
+    items = [item("a", make_rows(5)), item("b", make_rows(2, altitude=None))]
+
+    gpx = ElementTree.fromstring("".join(iter_gpx(items)))
+    kml = ElementTree.fromstring("".join(iter_kml(items)))
+
+    namespace = {"gpx": "http://www.topografix.com/GPX/1/1"}
+    assert len(gpx.findall(".//gpx:trkpt", namespace)) == 7
+    assert len(kml.findall(".//{http://www.opengis.net/kml/2.2}Placemark")) == 2
+
+
+def test_gzip_stream_round_trip():
+    body = b"".join(iter_gzip(iter_encoded(iter_geojson([item("a", make_rows(20))]))))
+    assert json.loads(gzip.decompress(body))["features"][0]["properties"]["id"] == "a"
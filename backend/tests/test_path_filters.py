@@ -0,0 +1,137 @@
+"""
+Tests for the GPS noise filtering stages
+"""
+from datetime import datetime, timedelta
+
+import pytest
+
+import app.models  # noqa: F401  (configures all mappers)
+from app.core.config import settings
+from app.models.path import Path
+from app.schemas.path import PathPointCreate
+from app.services.geo import haversine_meters
+from app.services.path_filters import _kalman_smooth, filter_path_points
+
+START = datetime(2026, 1, 1, 8, 0, 0)
+
+# ~11 m per 1e-4 degree of latitude
+STEP = 1e-4
+
+
+def make_point(seconds, latitude, longitude=38.74, accuracy=5.0):
+    return PathPointCreate(
+        latitude=latitude,
+        longitude=longitude,
+        accuracy=accuracy,
+        timestamp=START + timedelta(seconds=seconds)
+    )
+
+
+def walk(count, start_seconds=0):
+    return [make_point(start_seconds + i * 10, 9.03 + i * STEP) for i in range(count)]
+
+
+@pytest.fixture(autouse=True)
+def filter_settings(monkeypatch):
+    monkeypatch.setattr(settings, "PATH_FILTER_ENABLED", True)
+    monkeypatch.setattr(settings, "PATH_FILTER_MAX_ACCURACY_METERS", 100.0)
+    monkeypatch.setattr(settings, "PATH_FILTER_MIN_DISTANCE_METERS", 2.0)
+    monkeypatch.setattr(settings, "PATH_FILTER_MAX_SPEED_MPS", 70.0)
+    monkeypatch.setattr(settings, "PATH_FILTER_KALMAN_ENABLED", False)
+
+
+def test_clean_batch_passes_sorted():
+    points = walk(5)
+    kept, stats = filter_path_points(Path(), list(reversed(points)))
+
+    assert kept == points
+    assert sum(stats.values()) == 0
+
+
+def test_each_stage_is_counted():
+    points = walk(4)
+    batch = points + [
+        make_point(0, 9.5),                      # duplicate timestamp
+        make_point(35, 9.03 + 3 * STEP, accuracy=500.0),  # inaccurate
+        make_point(31, 9.03 + 3 * STEP + 1e-6),  # stationary (~0.1 m from the last kept fix)
+        make_point(32, 10.0),                    # ~100 km in a second
+        make_point(33, 91.0),                    # invalid latitude
+    ]
+
+    kept, stats = filter_path_points(Path(), batch)
+
+    assert kept == points
+    assert stats == {"invalid": 1, "thinned": 0, "duplicates": 1, "inaccurate": 1, "stationary": 1, "outliers": 1}
+
+
+def test_outlier_does_not_become_reference():
+    points = [make_point(0, 9.03), make_point(10, 9.5), make_point(20, 9.03 + STEP)]
+    kept, stats = filter_path_points(Path(), points)
+
+    assert kept == [points[0], points[2]]
+    assert stats["outliers"] == 1
+
+
+def test_batch_chains_onto_last_stored_fix():
+    path = Path(last_latitude=9.03, last_longitude=38.74, last_point_time=START)
+    jitter = make_point(10, 9.03 + 1e-6)
+    jump = make_point(11, 9.2)
+
+    kept, stats = filter_path_points(path, [jitter, jump, make_point(20, 9.03 + STEP)])
+
+    assert [p.timestamp for p in kept] == [START + timedelta(seconds=20)]
+    assert stats["stationary"] == 1
+    assert stats["outliers"] == 1
+
+
+def test_late_points_skip_chained_stages():
+    path = Path(last_latitude=9.03, last_longitude=38.74, last_point_time=START + timedelta(seconds=100))
+    late = make_point(50, 9.03)
+
+    kept, stats = filter_path_points(path, [late])
+
+    assert kept == [late]
+    assert stats["stationary"] == 0
+
+
+def test_disabled_filter_only_drops_invalid(monkeypatch):
+    monkeypatch.setattr(settings, "PATH_FILTER_ENABLED", False)
+    points = [make_point(0, 9.03), make_point(0, 9.03), make_point(1, 95.0)]
+
+    kept, stats = filter_path_points(Path(), points)
+
+    assert kept == points[:2]
+    assert stats["invalid"] == 1
+
+
+def test_kalman_pulls_noisy_fix_towards_track():
+    points = walk(5)
+    # Inaccurate fix ~100 m off to the east
+    points[3] = make_point(30, 9.03 + 3 * STEP, longitude=38.7409, accuracy=60.0)
+
+    smoothed = _kalman_smooth(points, None)
+
+    raw_offset = haversine_meters(9.03 + 3 * STEP, 38.74, points[3].latitude, points[3].longitude)
+    smoothed_offset = haversine_meters(9.03 + 3 * STEP, 38.74, smoothed[3].latitude, smoothed[3].longitude)
+    assert smoothed_offset < raw_offset / 2
+    assert smoothed[0].latitude == points[0].latitude
+    assert [p.timestamp for p in smoothed] == [p.timestamp for p in points]
+
+
+def test_kalman_trusts_accurate_fixes():
+    points = [make_point(i * 10, 9.03 + i * STEP, accuracy=1.0) for i in range(5)]
+
+    smoothed = _kalman_smooth(points, None)
+
+    for raw, fix in zip(points, smoothed):
+        assert haversine_meters(raw.latitude, raw.longitude, fix.latitude, fix.longitude) < 1.0
+
+
+def test_points_in_thinned_range_are_refused(monkeypatch):
+    monkeypatch.setattr(settings, "PATH_FILTER_ENABLED", False)
+    path = Path(thinned_until=START + timedelta(seconds=25))
+
+    kept, stats = filter_path_points(path, walk(5))
+
+    assert [p.timestamp for p in kept] == [START + timedelta(seconds=s) for s in (30, 40)]
+    assert stats["thinned"] == 3
@@ -0,0 +1,114 @@
+"""
+Tests for path ingest aggregates and the bulk point insert
+"""
+from datetime import datetime, timedelta
+from unittest.mock import MagicMock
+import uuid
+
+import pytest
+
+import app.models  # noqa: F401  (configures all mappers)
+from app.models.path import Path
+from app.schemas.path import PathPointCreate
+from app.services.geo import haversine_meters
+from app.services.path_ingest import bulk_insert_path_points, update_path_statistics
+from benchmarks.synthetic import synthetic_walk
+
+START = datetime(2026, 1, 1, 8, 0, 0)
+
+
+def make_point(seconds, latitude, longitude, speed=None):
+    return PathPointCreate(
+        latitude=latitude,
+        longitude=longitude,
+        speed=speed,
+        timestamp=START + timedelta(seconds=seconds)
+    )
+
+
+def test_haversine_one_degree_of_latitude():
+    assert haversine_meters(9.0, 38.7, 10.0, 38.7) == pytest.approx(111195, rel=1e-4)
+
+
+def test_haversine_same_point_is_zero():
+    assert haversine_meters(9.0, 38.7, 9.0, 38.7) == 0.0
+
+
+def test_update_path_statistics_chains_batches():
+    path = Path(start_time=START)
+    first = [make_point(0, 9.0, 38.7), make_point(10, 9.001, 38.7, speed=4.0)]
+    second = [make_point(20, 9.002, 38.7, speed=6.0)]
+
+    update_path_statistics(path, first)
+    update_path_statistics(path, second)
+
+    expected = haversine_meters(9.0, 38.7, 9.001, 38.7) + haversine_meters(9.001, 38.7, 9.002, 38.7)
+    assert path.point_count == 3
+    assert path.total_distance_meters == pytest.approx(expected)
+    assert path.first_point_time == START
+    assert path.last_point_time == START + timedelta(seconds=20)
+    assert (path.last_latitude, path.last_longitude) == (9.002, 38.7)
+    assert path.max_speed_mps == 6.0
+    assert path.average_speed_mps == pytest.approx(expected / 20)
+
+
+def test_update_path_statistics_late_point_does_not_add_distance():
+    path = Path(start_time=START)
+    update_path_statistics(path, [make_point(0, 9.0, 38.7), make_point(10, 9.001, 38.7)])
+    distance = path.total_distance_meters
+
+    update_path_statistics(path, [make_point(5, 8.9, 38.6)])
+
+    assert path.total_distance_meters == distance
+    assert path.point_count == 3
+    assert (path.min_latitude, path.min_longitude) == (8.9, 38.6)
+    assert path.last_point_time == START + timedelta(seconds=10)
+
+
+def test_bulk_insert_sends_one_statement_with_column_arrays():
+    points = [make_point(0, 9.0, 38.7), make_point(10, 9.001, 38.71)]
+    db = MagicMock()
+    db.execute.return_value.scalars.return_value.all.return_value = [p.timestamp for p in points]
+
+    stored = bulk_insert_path_points(db, uuid.uuid4(), points)
+
+    assert stored == points
+    db.execute.assert_called_once()
+    params = db.execute.call_args.args[1]
+    assert params["latitudes"] == [9.0, 9.001]
+    assert params["longitudes"] == [38.7, 38.71]
+    assert params["timestamps"] == [p.timestamp for p in points]
+
+
+def test_bulk_insert_returns_only_points_not_already_stored():
+    points = [make_point(0, 9.0, 38.7), make_point(10, 9.001, 38.7), make_point(10, 9.002, 38.7)]
+    db = MagicMock()
+    # Retried upload: the first timestamp hit ON CONFLICT DO NOTHING
+    db.execute.return_value.scalars.return_value.all.return_value = [points[1].timestamp]
+
+    stored = bulk_insert_path_points(db, uuid.uuid4(), points)
+
+    assert stored == [points[1]]
+
+
+def test_bulk_insert_empty_batch_skips_database():
+    db = MagicMock()
+    assert bulk_insert_path_points(db, uuid.uuid4(), []) == []
+    db.execute.assert_not_called()
+
+
+def test_incremental_aggregates_match_single_pass_on_50k_points():
+    points = synthetic_walk(50000)
+    path = Path(start_time=START)
+    for i in range(0, len(points), 100):
+        update_path_statistics(path, points[i:i + 100])
+
+    expected = sum(
+        haversine_meters(a.latitude, a.longitude, b.latitude, b.longitude)
+        for a, b in zip(points, points[1:])
+    )
+    assert path.point_count == 50000
+    assert path.total_distance_meters == pytest.approx(expected, rel=1e-9)
+    assert path.min_latitude == min(p.latitude for p in points)
+    assert path.max_longitude == max(p.longitude for p in points)
+    assert path.max_speed_mps == max(p.speed for p in points)
@@ -0,0 +1,74 @@
+"""
+Tests for the path point budget
+"""
+import math
+import uuid
+from datetime import datetime
+from unittest.mock import MagicMock
+
+import pytest
+
+import app.models  # noqa: F401  (configures all mappers)
+from app.core.config import settings
+from app.models.path import Path
+from app.services.path_limits import THIN_OLDER_POINTS_SQL, enforce_point_limit
+
+RECENT_START = datetime(2026, 1, 1, 12, 0, 0)
+
+
+@pytest.fixture(autouse=True)
+def budget(monkeypatch):
+    monkeypatch.setattr(settings, "PATH_TRACKING_MAX_POINTS", 1000)
+    monkeypatch.setattr(settings, "PATH_TRACKING_RECENT_POINTS", 200)
+    monkeypatch.setattr(settings, "PATH_TRACKING_DOWNSAMPLE_TARGET", 0.8)
+
+
+def make_db(deleted):
+    db = MagicMock()
+    db.execute.return_value.scalar.return_value = RECENT_START
+    db.execute.return_value.rowcount = deleted
+    return db
+
+
+def kept_by_stride(total, excess):
+    """Python mirror of the stride in THIN_OLDER_POINTS_SQL"""
+    stride = math.ceil(total / max(total - excess, 1))
+    return [n for n in range(1, total + 1) if (n - 1) % stride == 0]
+
+
+def test_under_budget_does_nothing():
+    db = make_db(0)
+    assert enforce_point_limit(db, Path(id=uuid.uuid4(), point_count=1000)) == 0
+    db.execute.assert_not_called()
+
+
+def test_single_thinning_pass():
+    path = Path(id=uuid.uuid4(), point_count=1200)
+    db = make_db(500)
+
+    assert enforce_point_limit(db, path) == 500
+
+    statements = [call.args[0] for call in db.execute.call_args_list]
+    assert statements.count(THIN_OLDER_POINTS_SQL) == 1
+    params = db.execute.call_args_list[-1].args[1]
+    assert params["excess"] == 1200 - 800
+    assert params["recent_start"] == RECENT_START
+    assert path.point_count == 700
+    assert path.thinned_until == RECENT_START
+
+
+def test_thinned_until_only_moves_forward():
+    later = datetime(2026, 1, 2)
+    path = Path(id=uuid.uuid4(), point_count=1200, thinned_until=later)
+
+    enforce_point_limit(make_db(400), path)
+
+    assert path.thinned_until == later
+
+
+@pytest.mark.parametrize("total, excess", [(1000, 400), (1000, 1), (1000, 999), (999, 500), (10, 50), (7, 3)])
+def test_stride_removes_enough_and_keeps_first(total, excess):
+    kept = kept_by_stride(total, excess)
+
+    assert kept[0] == 1
+    assert total - len(kept) >= min(excess, total - 1)
@@ -0,0 +1,120 @@
+"""
+Tests for the vectorized batch metrics and the filter stage built on them
+"""
+import random
+from datetime import datetime, timedelta
+
+import numpy as np
+import pytest
+
+from app.core.config import settings
+from app.services.geo import haversine_meters
+from app.services.path_filters import _drop_implausible
+from app.services.path_metrics import (
+    consecutive_metrics,
+    haversine_array,
+    point_arrays,
+    segment_speeds,
+    valid_coordinates,
+)
+from benchmarks.synthetic import synthetic_walk
+
+START = datetime(2026, 1, 1, 8, 0, 0)
+
+
+@pytest.fixture(autouse=True)
+def filter_settings(monkeypatch):
+    monkeypatch.setattr(settings, "PATH_FILTER_MIN_DISTANCE_METERS", 2.0)
+    monkeypatch.setattr(settings, "PATH_FILTER_MAX_SPEED_MPS", 70.0)
+
+
+def test_haversine_array_matches_scalar():
+    rng = np.random.default_rng(3)
+    lat1, lat2 = rng.uniform(-89, 89, 500), rng.uniform(-89, 89, 500)
+    lon1, lon2 = rng.uniform(-180, 180, 500), rng.uniform(-180, 180, 500)
+
+    expected = [haversine_meters(*args) for args in zip(lat1, lon1, lat2, lon2)]
+
+    np.testing.assert_allclose(haversine_array(lat1, lon1, lat2, lon2), expected, rtol=1e-12)
+
+
+def test_valid_coordinates():
+    latitudes = np.array([0.0, 90.0, -90.1, np.nan, 45.0, 45.0])
+    longitudes = np.array([0.0, 180.0, 0.0, 0.0, 180.5, np.inf])
+
+    assert valid_coordinates(latitudes, longitudes).tolist() == [True, True, False, False, False, False]
+
+
+def test_consecutive_metrics_continue_from_last_fix():
+    points = synthetic_walk(20)
+    latitudes, longitudes, timestamps = point_arrays(points)
+    last = (9.0, 38.7, points[0].timestamp - timedelta(seconds=5))
+
+    distances, elapsed = consecutive_metrics(latitudes, longitudes, timestamps, last)
+
+    assert len(distances) == len(elapsed) == 20
+    assert distances[0] == pytest.approx(haversine_meters(9.0, 38.7, points[0].latitude, points[0].longitude))
+    assert elapsed[0] == pytest.approx(5.0)
+    assert elapsed[1] == pytest.approx((points[1].timestamp - points[0].timestamp).total_seconds())
+    assert len(consecutive_metrics(latitudes, longitudes, timestamps)[0]) == 19
+
+
+def test_segment_speeds_without_elapsed_time():
+    speeds = segment_speeds(np.array([10.0, 0.0, 5.0]), np.array([2.0, 0.0, -1.0]))
+
+    assert speeds.tolist() == [5.0, np.inf, np.inf]
+
+
+def sequential_drop_implausible(points, last):
+    """Reference: the plain per-point loop the vectorized stage must agree with"""
+    kept, stationary, outliers = [], 0, 0
+    for p in points:
+        if last is not None:
+            distance = haversine_meters(last[0], last[1], p.latitude, p.longitude)
+            elapsed = (p.timestamp - last[2]).total_seconds()
+            if distance < settings.PATH_FILTER_MIN_DISTANCE_METERS:
+                stationary += 1
+                continue
+            if elapsed <= 0 or distance / elapsed > settings.PATH_FILTER_MAX_SPEED_MPS:
+                outliers += 1
+                continue
+        kept.append(p)
+        last = (p.latitude, p.longitude, p.timestamp)
+    return kept, stationary, outliers
+
+
+@pytest.mark.parametrize("seed", range(20))
+def test_vectorized_stage_matches_sequential_loop(seed, monkeypatch):
+    rng = random.Random(seed)
+    points = synthetic_walk(rng.randint(1, 300), seed=seed)
+
+    # Sprinkle in jitter and jumps, or leave a clean batch that takes the
+    # fast path (synthetic fixes are 0.7-2.1 m apart)
+    if not seed % 2:
+        monkeypatch.setattr(settings, "PATH_FILTER_MIN_DISTANCE_METERS", 0.5)
+    else:
+        for i in rng.sample(range(len(points)), len(points) // 10):
+            p = points[i]
+            if rng.random() < 0.5:
+                shifted = (p.latitude + 1e-6, p.longitude)
+            else:
+                shifted = (p.latitude + rng.uniform(0.05, 0.5), p.longitude)
+            if i > 0 and rng.random() < 0.5:
+                shifted = (points[i - 1].latitude + 1e-6, points[i - 1].longitude)
+            points[i] = p.model_copy(update={"latitude": shifted[0], "longitude": shifted[1]})
+
+    last = None if seed % 3 else (points[0].latitude - 1e-3, points[0].longitude, points[0].timestamp - timedelta(seconds=30))
+
+    expected = sequential_drop_implausible(points, last)
+    assert _drop_implausible(points, last) == expected
+    if not seed % 2 and last is None:
+        assert expected[0] == points
+
+
+def test_point_arrays_keep_microseconds():
+    points = synthetic_walk(3, start=datetime(2026, 3, 1, 12, 0, 0, 123456))
+
+    _, _, timestamps = point_arrays(points)
+
+    assert timestamps.dtype == np.dtype("datetime64[us]")
+    assert timestamps.tolist() == [p.timestamp for p in points]
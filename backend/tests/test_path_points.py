@@ -0,0 +1,62 @@
+"""
+Tests for keyset cursors and archived path pages
+"""
+from datetime import datetime, timedelta, timezone
+from types import SimpleNamespace
+
+import pytest
+
+from app.services import path_points
+from app.services.path_points import decode_point_cursor, encode_point_cursor, load_point_page
+
+
+def test_cursor_round_trip():
+    timestamp = datetime(2026, 1, 1, 8, 0, 0, 123456)
+    cursor = encode_point_cursor(timestamp, 4242)
+
+    assert "=" not in cursor
+    assert decode_point_cursor(cursor) == (timestamp, 4242)
+
+
+@pytest.mark.parametrize("cursor", ["", "not-base64!", "bm8tc2VwYXJhdG9y", "MjAyNi0wMS0wMXxhYmM"])
+def test_malformed_cursor_is_rejected(cursor):
+    with pytest.raises(ValueError):
+        decode_point_cursor(cursor)
+
+
+def make_rows(count):
+    return [
+        (i, 9.03, 38.74, None, None, None, None, datetime(2026, 1, 1, 8, 0, 0) + timedelta(minutes=i))
+        for i in range(count)
+    ]
+
+
+@pytest.fixture
+def archived_path(monkeypatch):
+    rows = make_rows(10)
+    monkeypatch.setattr(path_points, "load_segment_rows", lambda db, path: rows)
+    return SimpleNamespace(id="p", archived_at=datetime(2026, 1, 2)), rows
+
+
+def test_archived_page_walks_all_points(archived_path):
+    path, rows = archived_path
+    seen, cursor = [], None
+    while True:
+        page, cursor = load_point_page(None, path, 3, cursor)
+        seen.extend(page)
+        if cursor is None:
+            break
+
+    assert seen == rows
+
+
+def test_archived_page_accepts_aware_bounds(archived_path):
+    path, rows = archived_path
+    # 11:02+03:00 is 08:02 UTC
+    start = datetime(2026, 1, 1, 11, 2, tzinfo=timezone(timedelta(hours=3)))
+    end = datetime(2026, 1, 1, 8, 5, tzinfo=timezone.utc)
+
+    page, cursor = load_point_page(None, path, 10, start=start, end=end)
+
+    assert page == rows[2:5]
+    assert cursor is None
@@ -0,0 +1,66 @@
+"""
+Tests for the archived path segment codec
+"""
+from datetime import datetime, timedelta
+import random
+
+import pytest
+
+from app.services.path_segments import decode_segment, encode_segment
+
+START = datetime(2026, 1, 1, 8, 0, 0)
+
+
+def make_columns(count, seed=3):
+    rng = random.Random(seed)
+    columns = {name: [] for name in ("id", "latitude", "longitude", "accuracy", "altitude", "speed", "heading", "timestamp")}
+    for i in range(count):
+        columns["id"].append(1000 + i * rng.randint(1, 3))
+        columns["latitude"].append(9.03 + rng.uniform(-0.01, 0.01))
+        columns["longitude"].append(38.74 + rng.uniform(-0.01, 0.01))
+        columns["accuracy"].append(rng.uniform(3.0, 30.0))
+        columns["altitude"].append(None if i % 5 == 0 else rng.uniform(2300.0, 2400.0))
+        columns["speed"].append(rng.uniform(0.0, 15.0))
+        columns["heading"].append(None if i % 7 == 0 else rng.uniform(0.0, 360.0))
+        columns["timestamp"].append(START + timedelta(seconds=i, microseconds=rng.randint(0, 999999)))
+    return columns
+
+
+def test_round_trip_within_documented_precision():
+    columns = make_columns(500)
+    rows = decode_segment(encode_segment(columns))
+
+    assert len(rows) == 500
+    for i, row in enumerate(rows):
+        point_id, latitude, longitude, accuracy, altitude, speed, heading, timestamp = row
+        assert point_id == columns["id"][i]
+        assert latitude == pytest.approx(columns["latitude"][i], abs=0.5e-7)
+        assert longitude == pytest.approx(columns["longitude"][i], abs=0.5e-7)
+        assert accuracy == pytest.approx(columns["accuracy"][i], abs=0.05)
+        assert speed == pytest.approx(columns["speed"][i], abs=0.05)
+        if columns["altitude"][i] is None:
+            assert altitude is None
+        else:
+            assert altitude == pytest.approx(columns["altitude"][i], abs=0.05)
+        if columns["heading"][i] is None:
+            assert heading is None
+        else:
+            assert heading == pytest.approx(columns["heading"][i], abs=0.05)
+        # Truncated, never rounded up past the original instant
+        original = columns["timestamp"][i]
+        assert timestamp == original.replace(microsecond=original.microsecond // 1000 * 1000)
+
+
+def test_round_trip_is_stable():
+    rows = decode_segment(encode_segment(make_columns(50)))
+    columns = {name: list(values) for name, values in zip(
+        ("id", "latitude", "longitude", "accuracy", "altitude", "speed", "heading", "timestamp"), zip(*rows)
+    )}
+
+    assert decode_segment(encode_segment(columns)) == rows
+
+
+def test_segment_is_smaller_than_raw_columns():
+    columns = make_columns(5000)
+    # 8 doubles/bigints per point before compression
+    assert len(encode_segment(columns)) < 5000 * 8 * 8 / 2
@@ -0,0 +1,83 @@
+"""
+Tests for Douglas-Peucker path simplification
+"""
+import math
+import random
+
+import pytest
+
+from app.services.path_simplify import douglas_peucker, project_to_meters, tolerance_for_zoom
+
+
+def test_straight_line_keeps_endpoints_only():
+    xs = [0.0, 1.0, 2.0, 3.0, 4.0]
+    ys = [0.0, 0.0, 0.0, 0.0, 0.0]
+    assert douglas_peucker(xs, ys, 0.5) == [0, 4]
+
+
+def test_corner_is_kept():
+    xs = [0.0, 50.0, 100.0, 100.0, 100.0]
+    ys = [0.0, 0.0, 0.0, 50.0, 100.0]
+    assert douglas_peucker(xs, ys, 1.0) == [0, 2, 4]
+
+
+def test_deviation_within_tolerance_is_dropped():
+    xs = [0.0, 50.0, 100.0]
+    ys = [0.0, 3.0, 0.0]
+    assert douglas_peucker(xs, ys, 5.0) == [0, 2]
+    assert douglas_peucker(xs, ys, 2.0) == [0, 1, 2]
+
+
+def test_short_lines_are_unchanged():
+    assert douglas_peucker([0.0, 1.0], [0.0, 1.0], 10.0) == [0, 1]
+    assert douglas_peucker([], [], 10.0) == []
+
+
+def test_long_path_does_not_recurse():
+    n = 3000
+    xs = [float(i) for i in range(n)]
+    ys = [float(i % 2) * 10.0 for i in range(n)]
+    assert len(douglas_peucker(xs, ys, 1.0)) == n
+
+
+def test_projection_is_in_meters():
+    xs, ys = project_to_meters([9.0, 9.001], [38.7, 38.7])
+    assert ys[1] - ys[0] == pytest.approx(111.2, rel=1e-3)
+    assert xs[1] == xs[0]
+
+
+def test_tolerance_halves_per_zoom_level():
+    assert tolerance_for_zoom(1, 0.0) == pytest.approx(tolerance_for_zoom(0, 0.0) / 2)
+
+
+def test_detour_past_segment_end_is_kept():
+    # Out-and-back spur along the chord direction: its tip lies on the
+    # infinite line through the endpoints but 100 m beyond the segment
+    xs = [0.0, 200.0, 100.0]
+    ys = [0.0, 0.0, 0.0]
+    assert douglas_peucker(xs, ys, 5.0) == [0, 1, 2]
+
+
+def _max_deviation(xs, ys, kept):
+    """Largest distance of a raw vertex from the simplified line"""
+    worst = 0.0
+    for a, b in zip(kept, kept[1:]):
+        ax, ay, dx, dy = xs[a], ys[a], xs[b] - xs[a], ys[b] - ys[a]
+        seg_len_sq = dx * dx + dy * dy
+        for i in range(a + 1, b):
+            px, py = xs[i] - ax, ys[i] - ay
+            t = 0.0 if seg_len_sq == 0 else min(1.0, max(0.0, (px * dx + py * dy) / seg_len_sq))
+            worst = max(worst, math.hypot(px - t * dx, py - t * dy))
+    return worst
+
+
+def test_levels_stay_within_their_own_tolerance():
+    rng = random.Random(7)
+    xs, ys = [0.0], [0.0]
+    for _ in range(2000):
+        xs.append(xs[-1] + rng.uniform(-15.0, 15.0))
+        ys.append(ys[-1] + rng.uniform(-15.0, 15.0))
+
+    for tolerance in (5.0, 20.0, 80.0, 320.0):
+        kept = douglas_peucker(xs, ys, tolerance)
+        assert _max_deviation(xs, ys, kept) <= tolerance
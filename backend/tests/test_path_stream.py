@@ -0,0 +1,92 @@
+"""
+Tests for buffering and flushing on the path WebSocket ingest channel
+"""
+import uuid
+
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from starlette.websockets import WebSocketDisconnect
+
+from app.api.v1.endpoints import paths
+from app.core.config import settings
+
+PATH_ID = uuid.uuid4()
+USER_ID = uuid.uuid4()
+
+
+def point(second):
+    return {"latitude": 9.03, "longitude": 38.74 + second * 1e-4, "timestamp": f"2026-01-01T08:00:{second:02d}Z"}
+
+
+@pytest.fixture
+def flushed(monkeypatch):
+    batches = []
+
+    def flush(path_id, user_id, points):
+        batches.append(points)
+        return {"received": len(points), "accepted": len(points)}
+
+    monkeypatch.setattr(paths, "_authorize_path_stream", lambda token, path_id: USER_ID if token == "good" else None)
+    monkeypatch.setattr(paths, "_flush_path_stream", flush)
+    monkeypatch.setattr(settings, "PATH_WS_FLUSH_MAX_POINTS", 3)
+    monkeypatch.setattr(settings, "PATH_WS_FLUSH_INTERVAL_SECONDS", 60.0)
+    return batches
+
+
+@pytest.fixture
+def client():
+    app = FastAPI()
+    app.include_router(paths.router, prefix="/paths")
+    return TestClient(app)
+
+
+def test_flushes_when_buffer_is_full(client, flushed):
+    with client.websocket_connect(f"/paths/{PATH_ID}/ws?token=good") as websocket:
+        websocket.send_json(point(0))
+        websocket.send_json([point(1), point(2)])
+        ack = websocket.receive_json()
+
+    assert ack == {"type": "ack", "received": 3, "accepted": 3}
+    assert [len(batch) for batch in flushed] == [3]
+    assert flushed[0][1].longitude == pytest.approx(38.7401)
+
+
+def test_flushes_after_interval(client, flushed, monkeypatch):
+    monkeypatch.setattr(settings, "PATH_WS_FLUSH_INTERVAL_SECONDS", 0.05)
+
+    with client.websocket_connect(f"/paths/{PATH_ID}/ws?token=good") as websocket:
+        websocket.send_json(point(0))
+        ack = websocket.receive_json()
+
+    assert ack["received"] == 1
+
+
+def test_invalid_frames_are_reported_and_skipped(client, flushed):
+    with client.websocket_connect(f"/paths/{PATH_ID}/ws?token=good") as websocket:
+        websocket.send_text("not json")
+        assert websocket.receive_json() == {"type": "error", "detail": "Frame is not valid JSON"}
+
+        websocket.send_json({"latitude": 9.03})
+        error = websocket.receive_json()
+        assert error["type"] == "error"
+        assert {tuple(e["loc"]) for e in error["detail"]} == {("longitude",), ("timestamp",)}
+
+        websocket.send_json([point(0), point(1), point(2)])
+        assert websocket.receive_json()["received"] == 3
+
+
+def test_buffer_is_flushed_on_disconnect(client, flushed):
+    with client.websocket_connect(f"/paths/{PATH_ID}/ws?token=good") as websocket:
+        websocket.send_json(point(0))
+
+    assert [len(batch) for batch in flushed] == [1]
+
+
+@pytest.mark.parametrize("url", [f"/paths/{PATH_ID}/ws?token=bad", "/paths/not-a-uuid/ws?token=good"])
+def test_rejected_handshake(client, flushed, url):
+    with pytest.raises(WebSocketDisconnect) as exc_info:
+        with client.websocket_connect(url) as websocket:
+            websocket.receive_json()
+
+    assert exc_info.value.code == 1008
@@ -0,0 +1,216 @@
+"""
+Tests for inbound SMS triggers and their webhook
+"""
+import uuid
+from unittest.mock import MagicMock
+
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from pydantic import ValidationError
+
+import app.models  # noqa: F401  (configures all mappers)
+from app.api.v1.endpoints import webhooks
+from app.core.config import Settings, settings
+from app.core.database import get_db
+from app.core.security import hash_keyword, keyword_hmac, verify_keyword_hmac
+from app.models.anti_theft import AntiTheftConfig
+from app.schemas.user import UserCreate
+from app.services import sms_trigger
+from app.services.sms_trigger import normalize_phone, parse_inbound_sms, twilio_signature
+
+AUTH_TOKEN = "twilio-auth-token"
+SECRET = "africastalking-callback-secret"
+TWILIO_URL = "http://testserver/webhooks/sms"
+
+
+def test_hmac_key_is_required(monkeypatch):
+    monkeypatch.delenv("TRIGGER_KEYWORD_HMAC_KEY", raising=False)
+    with pytest.raises(ValidationError):
+        Settings(_env_file=None)
+
+    with pytest.raises(ValidationError):
+        Settings(_env_file=None, TRIGGER_KEYWORD_HMAC_KEY="short")
+
+
+def test_keyword_hmac_normalizes_whitespace_and_depends_on_key(monkeypatch):
+    digest = keyword_hmac("help me now")
+
+    assert verify_keyword_hmac("  help   me\tnow ", digest)
+    assert not verify_keyword_hmac("help me", digest)
+
+    monkeypatch.setattr(settings, "TRIGGER_KEYWORD_HMAC_KEY", "another-trigger-keyword-hmac-key-000000")
+    assert not verify_keyword_hmac("help me now", digest)
+
+
+@pytest.mark.parametrize("raw, expected", [
+    ("+251 911 23 45 67", "+251911234567"),
+    (" (0911) 23-45-67 ", "0911234567"),
+    ("+1 (415) 867-5309", "+14158675309"),
+])
+def test_normalize_phone(raw, expected):
+    assert normalize_phone(raw) == expected
+
+
+def test_phone_numbers_are_stored_normalized():
+    user = UserCreate(email="a@example.com", phone_number="+251 911-23-45-67", password="password123")
+
+    assert user.phone_number == "+251911234567"
+    with pytest.raises(ValidationError):
+        UserCreate(email="a@example.com", phone_number="n/a", password="password123")
+
+
+def test_parse_inbound_sms():
+    assert parse_inbound_sms({"MessageSid": "SM1", "From": "+251 911 234567", "Body": "help"}) == (
+        "twilio", "+251911234567", "help", "SM1"
+    )
+    assert parse_inbound_sms({"from": "+251911234567", "text": "help", "id": "at-1"}) == (
+        "africastalking", "+251911234567", "help", "at-1"
+    )
+    assert parse_inbound_sms({"from": "+251911234567"}) is None
+
+
+def test_twilio_signature_reference_value():
+    # Example from Twilio's webhook security documentation
+    form = {
+        "CallSid": "CA1234567890ABCDE",
+        "Caller": "+14158675309",
+        "Digits": "1234",
+        "From": "+14158675309",
+        "To": "+18005551212",
+    }
+
+    assert twilio_signature("https://mycompany.com/myapp.php?foo=1&bar=2", form, "12345") == "RSOYDt4T1cUTdK1PDd93/VVr8B8="
+
+
+def test_sender_throttling(monkeypatch):
+    counts = {}
+    fake_redis = MagicMock()
+    fake_redis.increment.side_effect = lambda key: counts.__setitem__(key, counts.get(key, 0) + 1) or counts[key]
+    monkeypatch.setattr(sms_trigger, "redis_client", fake_redis)
+    monkeypatch.setattr(settings, "SMS_WEBHOOK_SENDER_LIMIT", 3)
+
+    allowed = [sms_trigger.allow_sender("+251911234567") for _ in range(5)]
+
+    assert allowed == [True, True, True, False, False]
+    assert sms_trigger.allow_sender("+251900000000")
+    assert fake_redis.expire.call_count == 2
+
+
+class TestKeywordUpgrade:
+    """Legacy SHA-256 keyword hashes and their HMAC replacement"""
+
+    @pytest.fixture(autouse=True)
+    def no_index(self, monkeypatch):
+        monkeypatch.setattr(sms_trigger, "invalidate_phone_index", lambda *phones: None)
+
+    def updates(self, db):
+        return [call.args[0] for call in db.query.return_value.filter.return_value.update.call_args_list]
+
+    def entry(self, digest=None, legacy=None):
+        return {"config_id": str(uuid.uuid4()), "keyword_hmac": digest, "keyword_hash": legacy}
+
+    def test_legacy_hash_is_kept_when_hmac_is_stored(self):
+        db = MagicMock()
+
+        assert sms_trigger._keyword_matches(db, "+1", self.entry(legacy=hash_keyword("help")), "help")
+
+        assert self.updates(db) == [{AntiTheftConfig.trigger_keyword_hmac: keyword_hmac("help")}]
+
+    def test_legacy_hash_is_dropped_once_hmac_matches(self):
+        db = MagicMock()
+
+        assert sms_trigger._keyword_matches(db, "+1", self.entry(keyword_hmac("help"), hash_keyword("help")), "help")
+
+        assert self.updates(db) == [{AntiTheftConfig.trigger_keyword_hash: None}]
+
+    def test_hmac_under_another_key_falls_back_to_legacy_hash(self):
+        db = MagicMock()
+        stale = "0" * 64
+
+        assert sms_trigger._keyword_matches(db, "+1", self.entry(stale, hash_keyword("help")), "help")
+        assert self.updates(db) == [{AntiTheftConfig.trigger_keyword_hmac: keyword_hmac("help")}]
+
+    def test_wrong_keyword(self):
+        db = MagicMock()
+
+        assert not sms_trigger._keyword_matches(db, "+1", self.entry(keyword_hmac("help"), hash_keyword("help")), "hello")
+        assert not sms_trigger._keyword_matches(db, "+1", self.entry(keyword_hmac("help")), "hello")
+        assert self.updates(db) == []
+
+
+class TestWebhook:
+    """Gateway authentication and throttling of the inbound SMS webhook"""
+
+    @pytest.fixture
+    def triggered(self, monkeypatch):
+        calls = []
+        monkeypatch.setattr(settings, "TWILIO_AUTH_TOKEN", AUTH_TOKEN)
+        monkeypatch.setattr(settings, "SMS_WEBHOOK_SECRET", SECRET)
+        monkeypatch.setattr(settings, "SMS_WEBHOOK_PUBLIC_URL", "")
+        monkeypatch.setattr(webhooks, "allow_sender", lambda phone: True)
+        monkeypatch.setattr(webhooks, "claim_message", lambda provider, message_id: True)
+        monkeypatch.setattr(webhooks, "trigger_from_sms", lambda db, phone, text: calls.append((phone, text)))
+        return calls
+
+    @pytest.fixture
+    def client(self):
+        api = FastAPI()
+        api.include_router(webhooks.router, prefix="/webhooks")
+        api.dependency_overrides[get_db] = lambda: MagicMock()
+        return TestClient(api)
+
+    def twilio_form(self):
+        return {"MessageSid": "SM1", "From": "+251911234567", "Body": "help"}
+
+    def test_signed_twilio_message(self, client, triggered):
+        form = self.twilio_form()
+        signature = twilio_signature(TWILIO_URL, form, AUTH_TOKEN)
+
+        response = client.post("/webhooks/sms", data=form, headers={"X-Twilio-Signature": signature})
+
+        assert response.status_code == 200
+        assert response.headers["content-type"].startswith("application/xml")
+        assert triggered == [("+251911234567", "help")]
+
+    def test_public_url_is_signed_instead_of_request_url(self, client, triggered, monkeypatch):
+        monkeypatch.setattr(settings, "SMS_WEBHOOK_PUBLIC_URL", "https://api.example.com/api/v1/webhooks/sms")
+        form = self.twilio_form()
+        signature = twilio_signature(settings.SMS_WEBHOOK_PUBLIC_URL, form, AUTH_TOKEN)
+
+        assert client.post("/webhooks/sms", data=form, headers={"X-Twilio-Signature": signature}).status_code == 200
+
+    @pytest.mark.parametrize("headers", [{}, {"X-Twilio-Signature": "forged"}])
+    def test_unsigned_twilio_message(self, client, triggered, headers):
+        response = client.post("/webhooks/sms", data=self.twilio_form(), headers=headers)
+
+        assert response.status_code == 403
+        assert triggered == []
+
+    def test_tampered_twilio_message(self, client, triggered):
+        form = self.twilio_form()
+        signature = twilio_signature(TWILIO_URL, form, AUTH_TOKEN)
+
+        response = client.post("/webhooks/sms", data={**form, "Body": "other"}, headers={"X-Twilio-Signature": signature})
+
+        assert response.status_code == 403
+
+    def test_africastalking_secret(self, client, triggered, monkeypatch):
+        form = {"from": "+251911234567", "text": "help", "id": "at-1"}
+
+        assert client.post(f"/webhooks/sms?token={SECRET}", data=form).status_code == 200
+        assert client.post("/webhooks/sms?token=wrong", data=form).status_code == 403
+        assert client.post("/webhooks/sms", data=form).status_code == 403
+
+        monkeypatch.setattr(settings, "SMS_WEBHOOK_SECRET", "")
+        assert client.post("/webhooks/sms?token=", data=form).status_code == 403
+        assert len(triggered) == 1
+
+    def test_throttled_sender_is_acknowledged_but_not_checked(self, client, triggered, monkeypatch):
+        monkeypatch.setattr(webhooks, "allow_sender", lambda phone: False)
+        form = {"from": "+251911234567", "text": "help", "id": "at-1"}
+
+        response = client.post(f"/webhooks/sms?token={SECRET}", data=form)
+
+        assert response.status_code == 200
+        assert triggered == []
@@ -0,0 +1,93 @@
+"""
+Tests for vector tile coordinates and path tile invalidation
+"""
+import uuid
+from unittest.mock import MagicMock
+
+import pytest
+
+from app.core.config import settings
+from app.services import tiles
+
+USER_ID = uuid.uuid4()
+
+
+@pytest.fixture
+def redis_mock(monkeypatch):
+    client = MagicMock()
+    monkeypatch.setattr(tiles.redis_client, "client", client)
+    monkeypatch.setattr(settings, "TILE_CACHE_MAX_ZOOM", 16)
+    monkeypatch.setattr(settings, "TILE_INVALIDATE_MAX_TILES", 4096)
+    return client
+
+
+def deleted_tiles(client):
+    keys = [key for call in client.delete.call_args_list for key in call.args]
+    return {tuple(int(part) for part in key.split(":")[-3:]) for key in keys if key.count(":") == 5}
+
+
+def test_tile_for_matches_known_tiles():
+    assert tiles.tile_for(0.0, 0.0, 1) == (1, 1)
+    assert tiles.tile_for(51.5074, -0.1278, 10) == (511, 340)
+    assert tiles.tile_for(90.0, 180.0, 3) == (7, 0)
+
+
+def test_is_valid_tile():
+    assert tiles.is_valid_tile(0, 0, 0)
+    assert not tiles.is_valid_tile(2, 4, 0)
+    assert not tiles.is_valid_tile(settings.TILE_MAX_ZOOM + 1, 0, 0)
+
+
+def test_segment_crossing_a_tile_it_has_no_vertex_in(redis_mock):
+    # Both ends sit in tiles 0 and 2 of a row at z16; the middle tile is only crossed
+    z = 16
+    size = 1 << z
+    lon = lambda fx: fx / size * 360.0 - 180.0
+    start = (0.0, lon(100.5))
+    end = (0.0, lon(102.5))
+
+    tiles.invalidate_path_tiles(USER_ID, [start, end])
+
+    covered = deleted_tiles(redis_mock)
+    _, y = tiles.tile_for(0.0, lon(100.5), z)
+    assert {(z, 100, y), (z, 101, y), (z, 102, y)} <= covered
+
+
+def test_buffer_margin_covers_neighbouring_tile(redis_mock):
+    # A point just inside the edge of a tile is drawn into the buffer of its neighbour
+    z = 16
+    size = 1 << z
+    fx = 200 + 0.5 * tiles.MVT_BUFFER / tiles.MVT_EXTENT
+    point = (0.0, fx / size * 360.0 - 180.0)
+
+    tiles.invalidate_path_tiles(USER_ID, [point])
+
+    _, y = tiles.tile_for(*point, z)
+    covered = deleted_tiles(redis_mock)
+    assert (z, 200, y) in covered
+    assert (z, 199, y) in covered
+    assert (z, 201, y) not in covered
+
+
+def test_every_cached_zoom_is_covered(redis_mock):
+    tiles.invalidate_path_tiles(USER_ID, [(9.03, 38.74), (9.031, 38.741)])
+
+    zooms = {z for z, _, _ in deleted_tiles(redis_mock)}
+    assert zooms == set(range(settings.TILE_CACHE_MAX_ZOOM + 1))
+
+
+def test_long_jump_drops_all_user_tiles(redis_mock):
+    redis_mock.smembers.return_value = {"tiles:paths:x:1:0:0"}
+
+    tiles.invalidate_path_tiles(USER_ID, [(9.0, 38.0), (12.0, 42.0)])
+
+    redis_mock.smembers.assert_called_once_with(tiles.PATHS_TILE_INDEX_KEY.format(user_id=USER_ID))
+    redis_mock.delete.assert_called_once_with(tiles.PATHS_TILE_INDEX_KEY.format(user_id=USER_ID), "tiles:paths:x:1:0:0")
+
+
+def test_missing_previous_point_is_skipped(redis_mock):
+    tiles.invalidate_path_tiles(USER_ID, [(None, None)])
+    redis_mock.delete.assert_not_called()
+
+    tiles.invalidate_path_tiles(USER_ID, [(None, None), (9.03, 38.74)])
+    assert len(deleted_tiles(redis_mock)) >= settings.TILE_CACHE_MAX_ZOOM + 1
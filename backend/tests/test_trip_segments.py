@@ -0,0 +1,128 @@
+"""
+Tests for incremental stay-point detection and trip segmentation
+"""
+import uuid
+from datetime import datetime, timedelta
+from unittest.mock import MagicMock
+
+import pytest
+
+import app.models  # noqa: F401  (configures all mappers)
+from app.core.config import settings
+from app.models.path import Path, PathTripSegment
+from app.schemas.path import PathPointCreate
+from app.services.path_filters import filter_path_points
+from app.services.path_ingest import update_path_statistics
+from app.services.trip_segments import close_trip_segments, update_trip_segments
+
+START = datetime(2026, 1, 1, 8, 0, 0)
+
+# ~11 m per 1e-4 degree of latitude
+STEP = 1e-4
+
+
+@pytest.fixture(autouse=True)
+def trip_settings(monkeypatch):
+    monkeypatch.setattr(settings, "PATH_STAY_RADIUS_METERS", 100.0)
+    monkeypatch.setattr(settings, "PATH_STAY_MIN_DURATION_SECONDS", 300)
+    monkeypatch.setattr(settings, "PATH_FILTER_ENABLED", True)
+    monkeypatch.setattr(settings, "PATH_FILTER_MAX_ACCURACY_METERS", 100.0)
+    monkeypatch.setattr(settings, "PATH_FILTER_MIN_DISTANCE_METERS", 2.0)
+    monkeypatch.setattr(settings, "PATH_FILTER_MAX_SPEED_MPS", 70.0)
+    monkeypatch.setattr(settings, "PATH_FILTER_KALMAN_ENABLED", False)
+
+
+def make_point(seconds, latitude):
+    return PathPointCreate(latitude=latitude, longitude=38.74, accuracy=5.0, timestamp=START + timedelta(seconds=seconds))
+
+
+def commute():
+    """Walk 20 fixes north, stand still for 15 minutes, walk 20 fixes on"""
+    points = [make_point(i * 10, 9.03 + i * 2 * STEP) for i in range(20)]
+    stop_latitude = points[-1].latitude
+    # Fixes at the stop wander well under the 2 m jitter threshold
+    points += [make_point(200 + i * 10, stop_latitude + (i % 2) * 1e-6) for i in range(90)]
+    points += [make_point(1100 + i * 10, stop_latitude + (i + 1) * 2 * STEP) for i in range(20)]
+    return points
+
+
+def new_path():
+    return Path(id=uuid.uuid4(), start_time=START)
+
+
+def ingest(db, path, batch, hand_over_stationary=True):
+    """The relevant part of store_path_points"""
+    stationary = []
+    kept, _ = filter_path_points(path, batch, stationary if hand_over_stationary else None)
+    update_trip_segments(db, path, kept, stationary)
+    update_path_statistics(path, kept)
+
+
+def stored_segments(db):
+    return [call.args[0] for call in db.add.call_args_list if isinstance(call.args[0], PathTripSegment)]
+
+
+def run(batches, hand_over_stationary=True):
+    db = MagicMock()
+    path = new_path()
+    for batch in batches:
+        ingest(db, path, batch, hand_over_stationary)
+    close_trip_segments(db, path)
+    return path, stored_segments(db)
+
+
+def test_stay_is_detected_while_standing_still():
+    path, segments = run([commute()])
+
+    assert [s.kind for s in segments] == ["move", "stay", "move"]
+    stay = segments[1]
+    # The run is anchored on the last walking fixes within the stay radius of the stop
+    assert START + timedelta(seconds=100) < stay.start_time <= START + timedelta(seconds=190)
+    assert stay.end_time >= START + timedelta(seconds=1000)
+    # Only the approach inside the radius counts, not the jitter at the stop
+    assert stay.distance_meters < settings.PATH_STAY_RADIUS_METERS
+    assert segments[0].end_time == stay.start_time
+    assert segments[2].start_time == stay.end_time
+    assert segments[2].end_time == path.last_point_time
+    assert path.trip_state is None
+
+
+def test_stay_is_lost_without_the_jitter_fixes():
+    _, segments = run([commute()], hand_over_stationary=False)
+
+    assert "stay" not in [s.kind for s in segments]
+
+
+def test_batches_give_the_same_segments_as_one_upload():
+    points = commute()
+    _, whole = run([points])
+    _, batched = run([points[i:i + 7] for i in range(0, len(points), 7)])
+
+    describe = lambda segments: [(s.kind, s.start_time, s.end_time, round(s.distance_meters, 6)) for s in segments]
+    assert describe(batched) == describe(whole)
+
+
+def test_state_stays_constant_size():
+    db = MagicMock()
+    path = new_path()
+    keys = set()
+    sizes = []
+
+    for batch_start in range(0, 2000, 20):
+        ingest(db, path, [make_point((batch_start + i) * 10, 9.03 + (batch_start + i) * 2 * STEP) for i in range(20)])
+        keys |= set(path.trip_state)
+        sizes.append(len(repr(path.trip_state)))
+
+    assert keys == {"anchor", "last", "leg", "latitude_sum", "longitude_sum", "count"}
+    assert max(sizes) < 2 * min(sizes)
+
+
+def test_late_points_are_ignored():
+    db = MagicMock()
+    path = new_path()
+    ingest(db, path, [make_point(i * 10, 9.03 + i * 2 * STEP) for i in range(5)])
+    state = dict(path.trip_state)
+
+    update_trip_segments(db, path, [make_point(5, 9.5)])
+
+    assert path.trip_state == state